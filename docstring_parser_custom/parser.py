@@ -1,19 +1,48 @@
 """The main parsing routine."""
 
+import functools
+import inspect
+import re
+
 from docstring_parser_custom.common import Docstring, ParseError
+from docstring_parser_custom.google import GoogleParser
+from docstring_parser_custom.numpydoc import NumpydocParser
 from docstring_parser_custom.styles import STYLES, Style
 
+_REST_MARKER_RE = re.compile("^:", flags=re.M)
+_STYLE_MARKERS = {
+    Style.rest: _REST_MARKER_RE,
+    Style.google: GoogleParser().titles_re,
+    Style.numpydoc: NumpydocParser().titles_re,
+}
 
-def parse(text: str, style: Style = Style.auto) -> Docstring:
-    """Parse the docstring into its components.
+_MEMO_SIZE = 1024
 
-    :param text: docstring text to parse
-    :param style: docstring style
-    :returns: parsed docstring representation
+
+def _sniff_style(text: str):
+    """Find the only style whose markers are present in the docstring.
+
+    Styles without any of their markers cannot yield any meta information
+    so only the style whose markers are present needs to be parsed.
+
+    :param text: docstring text
+    :returns: the matching style, Style.rest if there are no markers at all
+              or None if markers of multiple styles are present
     """
+    text = inspect.cleandoc(text)
+    matches = [
+        style
+        for style, marker_re in _STYLE_MARKERS.items()
+        if marker_re.search(text)
+    ]
+    if not matches:
+        return Style.rest
+    if len(matches) == 1:
+        return matches[0]
+    return None
 
-    if style != Style.auto:
-        return STYLES[style](text)
+
+def _parse_all(text: str) -> Docstring:
     rets = []
     for parse_ in STYLES.values():
         try:
@@ -23,3 +52,53 @@ def parse(text: str, style: Style = Style.auto) -> Docstring:
     if not rets:
         raise exc
     return sorted(rets, key=lambda d: len(d.meta), reverse=True)[0]
+
+
+@functools.lru_cache(maxsize=_MEMO_SIZE)
+def _parse(text: str, style: Style) -> Docstring:
+    if style != Style.auto:
+        return STYLES[style](text)
+
+    if not text:
+        return _parse_all(text)
+
+    sniffed_style = _sniff_style(text)
+    if sniffed_style is None:
+        return _parse_all(text)
+
+    try:
+        ret = STYLES[sniffed_style](text)
+    except ParseError:
+        return _parse_all(text)
+
+    if not ret.meta and sniffed_style != Style.rest:
+        # ReST wins ties so its result must be used in this case
+        return _parse_all(text)
+
+    return ret
+
+
+def _copy(docstring: Docstring) -> Docstring:
+    ret = Docstring()
+    ret.short_description = docstring.short_description
+    ret.long_description = docstring.long_description
+    ret.blank_after_short_description = (
+        docstring.blank_after_short_description
+    )
+    ret.blank_after_long_description = docstring.blank_after_long_description
+    ret.meta = list(docstring.meta)
+    return ret
+
+
+def parse(text: str, style: Style = Style.auto) -> Docstring:
+    """Parse the docstring into its components.
+
+    With Style.auto, only the style whose markers are found in the text is
+    parsed unless there are markers of multiple styles. Results are memoized
+    per text so docstrings shared across many classes are parsed only once.
+
+    :param text: docstring text to parse
+    :param style: docstring style
+    :returns: parsed docstring representation
+    """
+    return _copy(_parse(text, style))
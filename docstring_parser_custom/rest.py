@@ -18,6 +18,32 @@ from .common import (
 )
 
 
+_META_START_RE = re.compile("^:", flags=re.M)
+_DEFAULT_RE = re.compile(r".*defaults to (.+)", flags=re.DOTALL)
+
+
+def _cleandoc_tail(text: str) -> str:
+    """Equivalent of inspect.cleandoc for the continuation lines of a description.
+
+    Avoids the full margin computation for single lines and when some
+    non-blank line after the first one is not indented since nothing needs
+    to be removed in either case.
+    """
+    if "\t" in text:
+        return inspect.cleandoc(text)
+    if "\n" not in text:
+        return text.lstrip()
+    lines = text.split("\n")
+    if not any(line[:1] and not line[:1].isspace() for line in lines[1:]):
+        return inspect.cleandoc(text)
+    lines[0] = lines[0].lstrip()
+    while lines and not lines[-1]:
+        lines.pop()
+    while lines and not lines[0]:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
 def _build_meta(args: T.List[str], desc: str) -> DocstringMeta:
     key = args[0]
 
@@ -38,7 +64,7 @@ def _build_meta(args: T.List[str], desc: str) -> DocstringMeta:
                 f"Expected one or two arguments for a {key} keyword."
             )
 
-        m = re.match(r".*defaults to (.+)", desc, flags=re.DOTALL)
+        m = _DEFAULT_RE.match(desc) if "defaults to " in desc else None
         default = m.group(1).rstrip(".") if m else None
 
         return DocstringParam(
@@ -93,7 +119,7 @@ def parse(text: str) -> Docstring:
         return ret
 
     text = inspect.cleandoc(text)
-    match = re.search("^:", text, flags=re.M)
+    match = _META_START_RE.search(text)
     if match:
         desc_chunk = text[: match.start()]
         meta_chunk = text[match.start() :]
@@ -109,12 +135,12 @@ def parse(text: str) -> Docstring:
         ret.blank_after_long_description = long_desc_chunk.endswith("\n\n")
         ret.long_description = long_desc_chunk.strip() or None
 
-    for match in re.finditer(
-        r"(^:.*?)(?=^:|\Z)", meta_chunk, flags=re.S | re.M
-    ):
-        chunk = match.group(0)
-        if not chunk:
-            continue
+    # each meta chunk extends from a line starting with ":" to the next one
+    starts = [m.start() for m in _META_START_RE.finditer(meta_chunk)]
+    ends = starts[1:] + [len(meta_chunk)]
+    append = ret.meta.append
+    for start, end in zip(starts, ends):
+        chunk = meta_chunk[start:end]
         try:
             args_chunk, desc_chunk = chunk.lstrip(":").split(":", 1)
         except ValueError:
@@ -123,8 +149,8 @@ def parse(text: str) -> Docstring:
         desc = desc_chunk.strip()
         if "\n" in desc:
             first_line, rest = desc.split("\n", 1)
-            desc = first_line + "\n" + inspect.cleandoc(rest)
+            desc = first_line + "\n" + _cleandoc_tail(rest)
 
-        ret.meta.append(_build_meta(args, desc))
+        append(_build_meta(args, desc))
 
     return ret
@@ -0,0 +1,63 @@
+"""Tests for the meta chunk scanning in the ReST parser."""
+
+import inspect
+import random
+
+import pytest
+from docstring_parser_custom.rest import _cleandoc_tail, parse
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "",
+        "single line",
+        "   leading spaces",
+        "first\n    second\n    third",
+        "first\n    second\n      indented more\n    third",
+        "first\nnot indented\n    indented",
+        "first\n\n    after blank\n\n",
+        "\n\n    leading blank lines\n    next",
+        "first\n\tsecond with tab\n\tthird",
+        "first\n  \n    whitespace only line",
+        "   \n   ",
+    ],
+)
+def test_cleandoc_tail(source: str) -> None:
+    assert _cleandoc_tail(source) == inspect.cleandoc(source)
+
+
+def test_cleandoc_tail_random() -> None:
+    rng = random.Random(0)
+    parts = ["", " ", "  ", "    ", "\t", "a", "b c", ":x", "\n", "\n\n", " \n"]
+    for _ in range(5000):
+        source = "".join(
+            rng.choice(parts) for _ in range(rng.randint(0, 12))
+        )
+        assert _cleandoc_tail(source) == inspect.cleandoc(source)
+
+
+def test_meta_chunks() -> None:
+    docstring = parse(
+        """
+        Short description.
+
+        :param int count: number of things
+            spread over
+              several lines
+        :param name: name, defaults to 'x'.
+        :type name: str
+        :returns: nothing
+        """
+    )
+    assert [meta.args for meta in docstring.meta] == [
+        ["param", "int", "count"],
+        ["param", "name"],
+        ["type", "name"],
+        ["returns"],
+    ]
+    assert docstring.meta[0].description == (
+        "number of things\nspread over\nseveral lines"
+    )
+    assert docstring.params[1].default == "'x'"
+    assert docstring.meta[2].description == "str"
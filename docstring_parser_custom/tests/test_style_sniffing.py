@@ -0,0 +1,92 @@
+"""Tests for the style sniffing and memoization in parse."""
+
+import pytest
+from docstring_parser_custom.common import Docstring
+from docstring_parser_custom.parser import _parse_all, _sniff_style, parse
+from docstring_parser_custom.styles import Style
+
+REST = """Short description.
+
+Long description.
+
+:param int count: number of things
+:param name: name of the thing
+:type name: str
+:returns: nothing
+"""
+
+GOOGLE = """Short description.
+
+Args:
+    count (int): number of things
+    name: name of the thing
+
+Returns:
+    nothing
+"""
+
+NUMPYDOC = """Short description.
+
+Parameters
+----------
+count : int
+    number of things
+name : str
+    name of the thing
+"""
+
+MIXED = """Short description.
+
+Args:
+    count (int): number of things
+
+:param name: name of the thing
+"""
+
+
+def _as_tuple(docstring: Docstring) -> tuple:
+    return (
+        docstring.short_description,
+        docstring.long_description,
+        docstring.blank_after_short_description,
+        docstring.blank_after_long_description,
+        [(meta.args, meta.description) for meta in docstring.meta],
+    )
+
+
+@pytest.mark.parametrize(
+    "source, expected_style",
+    [
+        (REST, Style.rest),
+        (GOOGLE, Style.google),
+        (NUMPYDOC, Style.numpydoc),
+        ("Short description only.", Style.rest),
+        (MIXED, None),
+    ],
+)
+def test_sniff_style(source: str, expected_style: Style) -> None:
+    assert _sniff_style(source) == expected_style
+
+
+@pytest.mark.parametrize(
+    "source", [REST, GOOGLE, NUMPYDOC, MIXED, "", "Short.", ":bad"]
+)
+def test_same_as_all_styles(source: str) -> None:
+    try:
+        expected = _as_tuple(_parse_all(source))
+    except Exception as ex:
+        with pytest.raises(type(ex)):
+            parse(source)
+        return
+    assert _as_tuple(parse(source)) == expected
+
+
+def test_memoized_copies() -> None:
+    docstring = parse(REST)
+    n_meta = len(docstring.meta)
+    docstring.meta.clear()
+    docstring.short_description = "changed"
+
+    docstring = parse(REST)
+    assert len(docstring.meta) == n_meta
+    assert docstring.short_description == "Short description."
@@ -1,14 +1,34 @@
+import builtins
 import copy
+import types
+import typing
+import dataclasses
+import collections.abc
 import sys
 import os
 import re
 import json
 import inspect
+import itertools
 import argparse
+import bisect
+import functools
+import hashlib
+import weakref
+import mmap
+import struct
+import locale
+import io
+import gzip
+import zipfile
+import posixpath
+import contextlib
+from array import array
 from ast import literal_eval
 from pprint import pformat
 from datetime import datetime
 from collections import defaultdict
+from operator import attrgetter
 from pydoc import locate
 import numpy as np
 
@@ -20,6 +40,7 @@ except ImportError:
     import pickle
 
 import docstring_parser_custom
+from docstring_parser_custom.rest import _META_START_RE
 
 
 # try:
@@ -28,15 +49,83 @@ import docstring_parser_custom
 #     docstring_parser_custom = None
 
 class RegexDict(dict):
+    """
+    dict with regular expressions as keys so that indexing it with a string returns the value of the first key
+    that matches the start of that string;
+    all the keys are combined into a single compiled pattern that is only rebuilt when the keys change
+    """
 
-    def __init__(self, _dict):
+    def __init__(self, _dict=()):
         super(RegexDict, self).__init__(_dict)
+        self._matchers = None
+
+    def _get_matchers(self):
+        """
+        :return: combined pattern, its version that matches entire lines and the value of the key corresponding to
+        the outer group of each of its alternatives
+        """
+        if self._matchers is None:
+            group_values = {}
+            alternatives = []
+            group_id = 1
+            for k, v in self.items():
+                group_values[group_id] = v
+                alternatives.append('({})'.format(k))
+                group_id += re.compile(k).groups + 1
+            pattern = '|'.join(alternatives)
+            self._matchers = (re.compile(pattern), re.compile('^(?:{})$'.format(pattern), re.M), group_values)
+        return self._matchers
 
     def __getitem__(self, item):
-        for k, v in self.items():
-            if re.match(k, item):
-                return v
-        raise KeyError
+        if not self:
+            raise KeyError(item)
+        matcher, _, group_values = self._get_matchers()
+        match = matcher.match(item)
+        if match is None:
+            raise KeyError(item)
+        return group_values[match.lastindex]
+
+    def match_all(self, items):
+        """
+        match all the items with a single pass of the combined pattern over them
+
+        :param collections.abc.Iterable[str] items: none of these can contain newlines
+        :return: each item matched in its entirety by any of the keys along with the value of the first such key
+        :rtype: list[tuple]
+        """
+        if not self:
+            return []
+        _, line_matcher, group_values = self._get_matchers()
+        return [(match.group(), group_values[match.lastindex]) for match in line_matcher.finditer('\n'.join(items))
+                if '\n' not in match.group()]
+
+    def __setitem__(self, key, value):
+        self._matchers = None
+        super(RegexDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._matchers = None
+        super(RegexDict, self).__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._matchers = None
+        super(RegexDict, self).update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._matchers = None
+        return super(RegexDict, self).setdefault(key, default)
+
+    def pop(self, *args):
+        self._matchers = None
+        return super(RegexDict, self).pop(*args)
+
+    def popitem(self):
+        self._matchers = None
+        return super(RegexDict, self).popitem()
+
+    def clear(self):
+        self._matchers = None
+        super(RegexDict, self).clear()
 
 
 class CFG:
@@ -162,90 +251,186 @@ class MultiCFG(MultiString):
         return _cfgs_out
 
 
-class Node:
+class SectionTree:
     """
-    :type parent: Node
-    :type full_name: str
-    :type name: str
-    :type orig_text: str
-    :type parent_text: str
+    heading tree of a cfg file stored as parallel arrays indexed by the sequence IDs of the sections;
+    sections are in pre-order so the descendants of each section are the ones between its own ID and its end ID
+
+    :type names: list[str]
+    :type full_names: list[str]
+    :type root_name: str
     """
+    __slots__ = ('names', 'full_names', 'root_name', 'parent_ids', 'end_ids', 'levels', 'line_ids',
+                 'line_end_ids', 'template_ids', 'is_common')
 
-    def __init__(self, heading_text='', parent=None, orig_text=None, parent_text=None,
-                 # marker=None,
-                 line_id=None, end_id=None, seq_id=None, curr_level=None, template_id=None):
+    def __init__(self, _sections, root_name):
         """
+        build the tree iteratively from the headings
 
-        :param str heading_text:
-        :param Node | None parent:
-        :param str orig_text:
-        :param str parent_text:
-        :param str marker:
-        :param int line_id:
-        :param int seq_id:
+        :param list _sections: [name, line_id, end_id, level, template_id] for each heading
+        :param str root_name:
         """
-        self.name = heading_text
-        if not self.name:
-            self.name = '__root__'
+        n_sections = len(_sections)
+
+        self.root_name = root_name
+        self.names = [_sec[0] for _sec in _sections]
+        self.line_ids = array('i', [_sec[1] for _sec in _sections])
+        self.line_end_ids = array('i', [_sec[2] for _sec in _sections])
+        self.levels = array('i', [_sec[3] for _sec in _sections])
+        self.template_ids = array('i', [_sec[4] for _sec in _sections])
+        self.is_common = bytearray(name.startswith('__') and name.endswith('__') for name in self.names)
+        self.parent_ids = array('i', [-1]) * n_sections
+        self.end_ids = array('i', [n_sections]) * n_sections
+        self.full_names = [None] * n_sections
+
+        open_ids = []
+        for _id, name in enumerate(self.names):
+            level = self.levels[_id]
+            while open_ids and self.levels[open_ids[-1]] >= level:
+                self.end_ids[open_ids.pop()] = _id
+            if open_ids:
+                parent_id = open_ids[-1]
+                self.parent_ids[_id] = parent_id
+                self.full_names[_id] = self.names[parent_id] + name
+            else:
+                self.full_names[_id] = root_name + name
+            open_ids.append(_id)
+
+    @classmethod
+    def from_arrays(cls, root_name, names, full_names, parent_ids, end_ids, levels, line_ids, line_end_ids,
+                    template_ids, is_common):
+        """
+        restore a tree from its arrays without rebuilding it
+        """
+        self = cls.__new__(cls)
+        self.root_name = root_name
+        self.names = names
+        self.full_names = full_names
+        self.parent_ids = array('i', parent_ids)
+        self.end_ids = array('i', end_ids)
+        self.levels = array('i', levels)
+        self.line_ids = array('i', line_ids)
+        self.line_end_ids = array('i', line_end_ids)
+        self.template_ids = array('i', template_ids)
+        self.is_common = bytearray(is_common)
+        return self
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, _id):
+        """
+        :param int | None _id: sequence ID of a section or None for the root
+        :rtype: Node
+        """
+        if _id is None:
+            _id = -1
+        elif not 0 <= _id < len(self.names):
+            raise KeyError(_id)
+        return Node(self, _id)
+
+    def children(self, _id):
+        """
+        :param int _id: -1 for the root
+        :rtype: list[int]
+        """
+        child_ids = []
+        child_id = _id + 1
+        end_id = self.end_ids[_id] if _id >= 0 else len(self.names)
+        while child_id < end_id:
+            child_ids.append(child_id)
+            child_id = self.end_ids[child_id]
+        return child_ids
+
+    def is_descendant(self, _id, ancestor_id):
+        return ancestor_id < _id < self.end_ids[ancestor_id]
 
-        if self.name.startswith('__') and self.name.endswith('__'):
-            self.is_common = True
-        else:
-            self.is_common = False
-
-        self.parent = parent
-        self.orig_text = orig_text
-        self.parent_text = parent_text
-        # self.marker = marker
-        self.line_id = line_id
-        self.end_id = end_id
-        self.seq_id = seq_id
-        self.curr_level = curr_level
-        self.template_id = template_id
-        # self.is_included = False
-        self.children = []
-
-        self.added = 0
-
-        if parent is None:
-            self.is_root = True
-            self.full_name = self.name
-        else:
-            self.is_root = False
-            self.full_name = parent.name + self.name
-            parent.children.append(self)
-
-    def copy(self, **kwargs):
-        new_node = Node(
-            heading_text=self.name,
-            parent=self.parent,
-            orig_text=self.orig_text,
-            parent_text=self.parent_text,
-            line_id=self.line_id,
-            end_id=self.end_id,
-            seq_id=self.seq_id,
-            curr_level=self.curr_level,
-            template_id=self.template_id,
-        )
 
-        for _arg, _val in kwargs.items():
-            setattr(new_node, _arg, _val)
+class Node:
+    """
+    lightweight view of a single section in a SectionTree
+
+    :type tree: SectionTree
+    :type id: int
+    """
+    __slots__ = ('tree', 'id')
+
+    def __init__(self, tree, _id):
+        """
+        :param SectionTree tree:
+        :param int _id: sequence ID of the section or -1 for the root
+        """
+        self.tree = tree
+        self.id = _id
+
+    @property
+    def is_root(self):
+        return self.id < 0
+
+    @property
+    def name(self):
+        if self.id < 0:
+            return self.tree.root_name
+        return self.tree.names[self.id]
+
+    @name.setter
+    def name(self, name):
+        assert self.id >= 0, "root section cannot be renamed"
+        self.tree.names[self.id] = name
+
+    @property
+    def full_name(self):
+        if self.id < 0:
+            return self.tree.root_name
+        return self.tree.full_names[self.id]
+
+    @property
+    def seq_id(self):
+        if self.id < 0:
+            return None
+        return self.id
 
-        return new_node
+    @property
+    def is_common(self):
+        if self.id < 0:
+            return False
+        return bool(self.tree.is_common[self.id])
+
+    @property
+    def line_id(self):
+        return self.tree.line_ids[self.id]
+
+    @property
+    def end_id(self):
+        return self.tree.line_end_ids[self.id]
+
+    @property
+    def curr_level(self):
+        return self.tree.levels[self.id]
+
+    @property
+    def template_id(self):
+        return self.tree.template_ids[self.id]
+
+    @property
+    def parent(self):
+        if self.id < 0:
+            return None
+        return Node(self.tree, self.tree.parent_ids[self.id])
+
+    @property
+    def children(self):
+        return [Node(self.tree, _id) for _id in self.tree.children(self.id)]
 
     def get_descendants(self):
-        descendants = []
-        for child in self.children:
-            descendants.append(child)
-            descendants += child.get_descendants()
-        return descendants
+        return [Node(self.tree, _id) for _id in range(self.id + 1, self.tree.end_ids[self.id])]
 
     def get_ancestors(self):
         ancestors = []
-        parent = self.parent
-        while parent is not None and not parent.is_root:
-            ancestors.append(parent)
-            parent = parent.parent
+        parent_id = self.tree.parent_ids[self.id] if self.id >= 0 else -1
+        while parent_id >= 0:
+            ancestors.append(Node(self.tree, parent_id))
+            parent_id = self.tree.parent_ids[parent_id]
         return ancestors
 
     def p(self):
@@ -333,12 +518,172 @@ class Node:
     def ggpra(self):
         return self.name_to_range(self.ggp())
 
+    def r(self):
+        ancestors = self.get_ancestors()
+        return ancestors[-1].name if ancestors else self.name
+
+    def f(self):
+        return self.full_name
+
+    def pf(self):
+        return self.parent.full_name
+
+
+"""
+placeholders that are replaced in the lines of each section by the values returned by the respective functions of 
+the section node;
+each of these is only evaluated if its placeholder actually exists since the substitution might be invalid 
+depending on the name and hierarchical position of the section
+"""
+_section_placeholders = {}
+_placeholder_fns = {}
+
+"""
+%N<i>% / __name<i>__ and %N<i>*% / __name<i>*__ for the components of underscore-separated section names
+"""
+_name_component_re = r'%N(0|[1-9][0-9]*)(\*?)%|__name(0|[1-9][0-9]*)(\*?)__'
+_placeholder_re = re.compile(_name_component_re)
+
+
+def register_placeholder(placeholder, fn, *aliases):
+    """
+    register a placeholder to be replaced in the lines of each cfg section by the value returned by a function of
+    the node for that section, e.g.
+    register_placeholder('%HASH%', lambda node: hashlib.md5(node.name.encode()).hexdigest()[:8], '__hash__')
+
+    existing placeholders with the same text are overridden
+
+    :param str placeholder: must contain either % or __
+    :param fn: function that takes a Node and returns the replacement text
+    :param str aliases: other texts for the same placeholder
+    """
+    global _placeholder_re
+
+    for ph in (placeholder,) + aliases:
+        assert '%' in ph or '__' in ph, f"placeholder must contain either % or __: {ph}"
+
+    new_phs = (placeholder,) + aliases
+    for phs in list(_section_placeholders):
+        if not any(ph in new_phs for ph in phs):
+            continue
+        """the overridden texts are removed from any existing placeholder while its other aliases are kept"""
+        old_fn = _section_placeholders.pop(phs)
+        remaining_phs = tuple(ph for ph in phs if ph not in new_phs)
+        if remaining_phs:
+            _section_placeholders[remaining_phs] = old_fn
+    _section_placeholders[new_phs] = fn
+
+    _placeholder_fns.clear()
+    for phs, ph_fn in _section_placeholders.items():
+        _placeholder_fns.update({ph: ph_fn for ph in phs})
+
+    """all placeholders in a single alternation with longer ones first"""
+    _placeholder_re = re.compile('|'.join(
+        [re.escape(ph) for ph in sorted(_placeholder_fns, key=len, reverse=True)] + [_name_component_re, ]))
+
+
+def get_placeholders():
+    """
+    :return: functions for all the registered placeholders
+    :rtype: dict
+    """
+    return dict(_section_placeholders)
+
+
+register_placeholder('%N%', attrgetter('name'), '__name__')
+register_placeholder('%R%', Node.r, '__root__')
+register_placeholder('%F%', Node.f, '__full__')
+register_placeholder('%PF%', Node.pf, '__parent_full__')
+register_placeholder('%GF%', Node.gf, '__g_full__')
+register_placeholder('%GGF%', Node.ggf, '__gg_full__')
+
+
+def _register_name_placeholders():
+    """
+    names of the section and its ancestors and conversions thereof
+    """
+    relatives = (
+        ('', '', attrgetter('name')),
+        ('P', 'parent', Node.p),
+        ('GP', 'g_parent', Node.gp),
+        ('GGP', 'gg_parent', Node.ggp),
+    )
+    conversions = (
+        ('RI', 'ratio', Node.name_to_ratio),
+        ('L', 'list', Node.name_to_list),
+        ('LRI', 'list_ratio', Node.name_to_list_ratio),
+        ('RA', 'range', Node.name_to_range),
+    )
+    for rel_ph, rel_name, rel_fn in relatives:
+        if rel_ph:
+            register_placeholder(f'%{rel_ph}%', rel_fn, f'__{rel_name}__')
+        for conv_ph, conv_name, conv_fn in conversions:
+            alias = f'__{rel_name}_{conv_name}__' if rel_name else f'__{conv_name}__'
+            register_placeholder(f'%{rel_ph}{conv_ph}%',
+                                 lambda node, _rel_fn=rel_fn, _conv_fn=conv_fn: _conv_fn(_rel_fn(node)), alias)
+
+
+_register_name_placeholders()
+
+
+def _name_component(node, match):
+    """
+    :param Node node:
+    :param match: match of _name_component_re
+    :return: None if the section name does not have the specified component
+    :rtype: str | None
+    """
+    if match.group(1) is not None:
+        sub_name_id, to_end = int(match.group(1)), match.group(2)
+    else:
+        sub_name_id, to_end = int(match.group(3)), match.group(4)
+
+    sub_names = node.name.split('_')
+    if len(sub_names) < 2 or sub_name_id >= len(sub_names):
+        return None
+    if to_end:
+        if sub_name_id == 0:
+            return None
+        return '_'.join(sub_names[sub_name_id:])
+    return sub_names[sub_name_id]
+
+
+def _get_placeholder_sub(node):
+    """
+    replacement function for _placeholder_re.sub that evaluates each placeholder at most once for the given node
+
+    :param Node node:
+    """
+    subs = {}
+
+    def _sub(match):
+        ph = match.group(0)
+        try:
+            return subs[ph]
+        except KeyError:
+            pass
+        try:
+            fn = _placeholder_fns[ph]
+        except KeyError:
+            sub = _name_component(node, match)
+            if sub is None:
+                sub = ph
+        else:
+            sub = fn(node)
+            if not isinstance(sub, str):
+                sub = str(sub)
+        subs[ph] = sub
+        return sub
+
+    return _sub
+
 
 def obj_from_docs(obj, member, verbose=False):
-    doc_dict = getattr(type(obj), '__doc_dict__', None)
+    doc_dict = type(obj).__dict__.get('__doc_dict__', None)
     if doc_dict is None:
-        doc_dict = {}
-        dict_from_docs(type(obj), doc_dict, verbose)
+        all_doc_dict = {}
+        dict_from_docs(type(obj), all_doc_dict, verbose)
+        doc_dict = all_doc_dict[type(obj)]
         setattr(type(obj), '__doc_dict__', doc_dict)
 
     return literal_eval(doc_dict[member]['help'])
@@ -366,53 +711,6 @@ def match_opt(params, opt_name, verbose, print_name=''):
     return matching_val[0]
 
 
-def _find_children(nodes, nodes_by_fullname, _headings, root_level, _start_id, _root_node, n_headings):
-    """
-
-    :param dict nodes:
-    :param defaultdict(list) | None nodes_by_fullname:
-    :param _headings:
-    :param root_level:
-    :param _start_id:
-    :param _root_node:
-    :param n_headings:
-    :return:
-    """
-    _id = _start_id
-
-    while _id < n_headings:
-        _heading, line_id, end_id, curr_level, template_id = _headings[_id]
-        assert _heading, "Invalid empty heading found"
-
-        # curr_level = _heading[0].count('#') + 1
-
-        if curr_level <= root_level:
-            break
-
-        parent_text = ''
-        if _root_node is not None and _root_node.parent is not None:
-            parent_text = _root_node.name
-            if curr_level > 2:
-                # parent_text = str(_root_node)
-                parent_text = '{}/{}'.format(parent_text, _root_node.parent_text)
-        new_node = Node(_heading, parent=_root_node, orig_text=_heading, parent_text=parent_text,
-                        # marker=_heading[0],
-                        line_id=line_id, end_id=end_id, seq_id=_id, curr_level=curr_level, template_id=template_id)
-        nodes[_id] = new_node
-
-        if nodes_by_fullname is not None:
-            # assert new_node.full_name not in nodes_by_fullname, \
-            #     "Duplicate nodes found with full_name {}:\n{}\n{}".format(new_node.full_name, new_node.name,
-            #                                                               nodes_by_fullname[new_node.full_name].name)
-            nodes_by_fullname[new_node.full_name].append(new_node)
-
-        ___id = _find_children(nodes, nodes_by_fullname, _headings, curr_level, _id + 1, new_node, n_headings)
-        # nodes += child_nodes
-        _id = ___id
-
-    return _id
-
-
 def scalar_to_string(val, add_quotes=False):
     if isinstance(val, (int, bool)):
         return '{:d}'.format(int(val))
@@ -474,13 +772,19 @@ def safer_arange(start, stop, step):
     return step * np.arange(start / step, stop / step)
 
 
-def str_to_tuple(val):
+def str_to_range(val):
+    """
+    range object for a range() or irange() specifier without generating its values
+
+    :param str val:
+    :return: None if val is not a range specifier
+    :rtype: range | None
+    """
     if val.startswith('range('):
         """standard (exclusive) range"""
         val_list = val[6:].replace(')', '').split(',')
         val_list = [int(x) for x in val_list]
-        val_list = tuple(range(*val_list))
-        return val_list
+        return range(*val_list)
     elif val.startswith('irange('):
         """inclusive range"""
         val_list = val.replace('irange(', '').replace(')', '').split(',')
@@ -490,8 +794,13 @@ def str_to_tuple(val):
             val_list[0] += 1
         elif len(val_list) >= 2:
             val_list[1] += 1
-        val_list = tuple(range(*val_list))
-        return val_list
+        return range(*val_list)
+    return None
+
+
+def str_to_tuple(val):
+    if val.startswith('range(') or val.startswith('irange('):
+        return tuple(str_to_range(val))
     elif ':' in val:
         """Try to parse the string as a floating point range specification - both inclusive and exclusive
         """
@@ -711,7 +1020,15 @@ def _match_template(start_templ, member_templ, _str, exclude_starts):
     return _match
 
 
-def dict_from_str(string, verbose):
+def _raw_dict_from_str(string):
+    """
+    help strings and unresolved type strings of all the members documented in the docstring
+    along with its description;
+    this is what gets stored in the persistent docstring cache
+
+    :param str string:
+    :rtype: dict
+    """
     # if docstring_parser_custom is None:
     #     if verbose:
     #         print('docstring parser is not available')
@@ -719,594 +1036,3172 @@ def dict_from_str(string, verbose):
 
     docstring = docstring_parser_custom.parse(string)
 
-    type_dict = defaultdict(lambda: None)
-    param_type_dict = {_meta.args[2]: locate(_meta.args[1]) for _meta in docstring.meta if
-                       len(_meta.args) == 3 and _meta.args[0] == 'param'}
-    main_type_dict = {_meta.args[1]: locate(_meta.description) for _meta in docstring.meta if _meta.args[0] == 'type'}
-    type_dict.update(param_type_dict)
-    type_dict.update(main_type_dict)
+    type_str_dict = {_meta.args[2]: _meta.args[1] for _meta in docstring.meta if
+                     len(_meta.args) == 3 and _meta.args[0] == 'param'}
+    main_type_str_dict = {_meta.args[1]: _meta.description for _meta in docstring.meta if _meta.args[0] == 'type'}
+    type_str_dict.update(main_type_str_dict)
 
-    help_dict = defaultdict(lambda: None)
-    param_help_dict = {_meta.args[-1]: _meta.description for _meta in docstring.meta if _meta.args[0] == 'param'}
+    help_dict = {_meta.args[-1]: _meta.description for _meta in docstring.meta if _meta.args[0] == 'param'}
     ivar_help_dict = {_meta.args[1]: _meta.description for _meta in docstring.meta if _meta.args[0] == 'ivar'}
-    help_dict.update(param_help_dict)
     help_dict.update(ivar_help_dict)
 
-    members = set(list(type_dict.keys()) + list(help_dict.keys()))
-
-    combined_dict = {
-        _member: {
-            'help': help_dict[_member],
-            'type': type_dict[_member],
-        }
-        for _member in members
+    return {
+        'type': type_str_dict,
+        'help': help_dict,
+        '__description__': (docstring.short_description, docstring.long_description),
     }
 
-    combined_dict['__description__'] = (docstring.short_description, docstring.long_description)
-
-    return combined_dict
 
+_generic_types = {
+    'tuple': tuple, 'Tuple': tuple,
+    'list': list, 'List': list, 'Sequence': list,
+    'dict': dict, 'Dict': dict, 'Mapping': dict,
+    'MultiPath': MultiPath, 'MultiCFG': MultiCFG,
+}
+_union_types = ('Union', 'Optional')
 
-def dict_from_docs(obj_type, doc_dict, verbose):
-    if obj_type in doc_dict:
-        return
 
-    class_hierarchy = inspect.getmro(obj_type)[:-1][::-1]
-    obj_help_dict = {}
-    for _class in class_hierarchy:
-        if _class in doc_dict:
-            curr_dict = doc_dict[_class]
-        else:
-            doc = inspect.getdoc(_class)
-            if doc is None:
-                continue
-            curr_dict = dict_from_str(doc, verbose)
-            doc_dict[_class] = curr_dict
+def _split_top_level(type_str, sep):
+    """
+    split type_str at the occurrences of sep that are not enclosed in any brackets
 
-        obj_help_dict.update(curr_dict)
+    :param str type_str:
+    :param str sep:
+    :rtype: list[str]
+    """
+    tokens = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(type_str):
+        if c in '([{':
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif c == sep and depth == 0:
+            tokens.append(type_str[start:i])
+            start = i + 1
+    tokens.append(type_str[start:])
+    return tokens
+
+
+def _resolve_union(type_strs):
+    """first member of the union that is not None"""
+    for type_str in type_strs:
+        if type_str.strip() == 'None':
+            continue
+        member_type = resolve_type(type_str)
+        if member_type is not None:
+            return member_type
+    return None
 
-    doc_dict[obj_type] = obj_help_dict
 
+@functools.lru_cache(maxsize=None)
+def resolve_type(type_str):
+    """
+    resolve a type expression from a docstring into a type;
+    replaces pydoc.locate which cannot handle composite expressions and has to go through the import machinery
+    even for builtins
+
+    supported expressions include:
+    builtin names like int or str
+    tuples like (int, ) or tuple(int) or tuple[int] or Tuple[int]
+    lists like [int] or list[int] or List[int]
+    dicts like {str:str} or dict[str, int] or Dict[str, int]
+    unions like int | bool or Optional[int] or Union[int, bool] that resolve to their first member that is not None
+    anything else like a dotted class path is resolved with pydoc.locate
+
+    :param str type_str:
+    :return: resolved type or None if it cannot be resolved
+    """
+    if not type_str:
+        return None
 
-def help_from_docs(obj, member):
-    _help = ''
+    type_str = type_str.strip()
 
-    class_hierarchy = inspect.getmro(type(obj))[:-1][::-1]
-    all_doc = ''
-    for _class in class_hierarchy:
+    if not type_str:
+        return None
 
-        doc = inspect.getdoc(_class)
-        if doc is not None:
-            all_doc += doc + '\n'
+    union_tokens = _split_top_level(type_str, '|')
+    if len(union_tokens) > 1:
+        return _resolve_union(union_tokens)
+
+    first_char = type_str[0]
+    if first_char == '(':
+        return tuple
+    if first_char == '[':
+        return list
+    if first_char == '{':
+        return dict
+
+    generic_start = min([i for i in (type_str.find('('), type_str.find('[')) if i > 0], default=-1)
+    if generic_start > 0:
+        base_name = type_str[:generic_start].strip()
+        if base_name.startswith('typing.'):
+            base_name = base_name[7:]
+        if base_name in _union_types:
+            return _resolve_union(_split_top_level(type_str[generic_start + 1:-1], ','))
+        try:
+            return _generic_types[base_name]
+        except KeyError:
+            return resolve_type(base_name)
 
-    if not all_doc:
-        return _help
+    if type_str in _generic_types:
+        return _generic_types[type_str]
 
-    doc_lines = all_doc.splitlines()
-    if not doc_lines:
-        return _help
+    if '.' not in type_str:
+        try:
+            return getattr(builtins, type_str)
+        except AttributeError:
+            pass
 
-    filtered_lines = [k.strip() for k in doc_lines]
-    filtered_lines = list(filter(lambda k: k and not k.startswith(':type ') and not k.startswith('#'), filtered_lines))
+    return locate(type_str)
 
-    filtered_str = '\n'.join(filtered_lines)
 
-    start_templ = ':param '
-    member_templ = '{} {}: '.format(type(getattr(obj, member)).__name__, member)
+def _dict_from_raw(raw_dict):
+    """
+    resolve the type strings in a dict returned by _raw_dict_from_str
 
-    start_templ2 = ':ivar '
-    member_templ2 = '{}: '.format(member)
+    :param dict raw_dict:
+    :rtype: dict
+    """
+    type_str_dict = raw_dict['type']
+    help_dict = raw_dict['help']
 
-    _help = _match_template(start_templ, member_templ, filtered_str, (start_templ2,))
-    if _help:
-        return _help
+    members = set(list(type_str_dict.keys()) + list(help_dict.keys()))
 
-    _help = _match_template(start_templ2, member_templ2, filtered_str, (start_templ,))
-    return _help
+    combined_dict = {
+        _member: {
+            'help': help_dict.get(_member, None),
+            'type': resolve_type(type_str_dict[_member]) if _member in type_str_dict else None,
+        }
+        for _member in members
+    }
 
+    combined_dict['__description__'] = raw_dict['__description__']
 
-_supported_types = (int, bool, float, str, tuple, list, dict, tuple, list, dict, MultiPath, MultiCFG)
+    return combined_dict
 
 
-def type_from_docs(obj, member):
-    doc = inspect.getdoc(obj)
-    if doc is None:
-        return None
+def dict_from_str(string, verbose):
+    return _dict_from_raw(_raw_dict_from_str(string))
+
+
+"""parsed docstrings persisted across processes"""
+DOC_CACHE_VERSION = 1
+ARGS_CACHE_VERSION = 1
+CFG_CACHE_VERSION = 3
+LINES_CACHE_VERSION = 2
+CFG_PACK_VERSION = 1
+doc_cache_enabled = os.environ.get('PARAMPARSE_DOC_CACHE', '1') != '0'
+"""docstring caches loaded in this process keyed by the path of their file"""
+_doc_caches = {}
+"""names of the classes whose entries in each docstring cache were added or updated in this process"""
+_doc_cache_updates = {}
+
+"""size limit of the cache folder in MB beyond which the least recently used cache files are removed"""
+cache_size_limit = float(os.environ.get('PARAMPARSE_CACHE_SIZE', '1024'))
+
+"""cache hits and misses in the current process"""
+_cache_stats = {
+    'docs': {'hits': 0, 'misses': 0},
+    'cfg': {'hits': 0, 'misses': 0},
+    'lines': {'hits': 0, 'misses': 0},
+    'args': {'hits': 0, 'misses': 0},
+}
+
+
+def get_cache_stats():
+    """
+    numbers of hits and misses of each type of cache in the current process
 
-    doc_lines = doc.splitlines()
-    if not doc_lines:
-        return None
+    :rtype: dict
+    """
+    return {cache_type: dict(stats) for cache_type, stats in _cache_stats.items()}
 
-    templs = [(':param {} {}: '.format(k.__name__, member), k) for k in _supported_types]
-    relevant_lines = [k for k in doc_lines if any(k.startswith(templ[0]) for templ in templs)]
 
-    if not relevant_lines:
-        templs2 = [(':type {}: {}'.format(member, k.__name__), k) for k in _supported_types]
-        relevant_lines = [k for k in doc_lines if any(k.startswith(templ[0]) for templ in templs)]
+def reset_cache_stats():
+    for stats in _cache_stats.values():
+        stats['hits'] = stats['misses'] = 0
 
-        if not relevant_lines:
-            return None
 
-    if len(relevant_lines) > 1:
-        print('Multiple matching docstring lines for {}:\n{}'.format(member, pformat(relevant_lines)))
-        return None
+def _count_cache(cache_type, hit):
+    _cache_stats[cache_type]['hits' if hit else 'misses'] += 1
 
-    relevant_line = relevant_lines[0]
-    if relevant_line:
-        relevant_templs = [templ for templ in templs if relevant_line.startswith(templ[0])]
-        if len(relevant_lines) > 1:
-            print('Multiple matching templates for {} with docstring line {}:\n{}'.format(
-                member, relevant_line, pformat(relevant_templs)))
-            return None
-        return relevant_templs[0][1]
 
-    return None
+def get_cache_dir(cache_dir=''):
+    """
+    folder for the persistent caches;
+    it is specified by the PARAMPARSE_CACHE_DIR environment variable unless provided explicitly
+    and defaults to paramparse within the user cache folder (~/.cache or XDG_CACHE_HOME)
 
+    :param str cache_dir:
+    :rtype: str
+    """
+    if not cache_dir:
+        cache_dir = os.environ.get('PARAMPARSE_CACHE_DIR', '')
+    if not cache_dir:
+        user_cache_dir = os.environ.get('XDG_CACHE_HOME', '')
+        if not user_cache_dir:
+            user_cache_dir = linux_path(os.path.expanduser('~'), '.cache')
+        cache_dir = linux_path(user_cache_dir, 'paramparse')
+    return cache_dir
 
-def get_valid_members(obj, include_protected=0):
-    obj_t = type(obj)
-    prop_attr = [attr for attr in dir(obj_t) if isinstance(getattr(obj_t, attr), property)]
-    valid_members = tuple([attr for attr in dir(obj) if
-                           attr not in prop_attr and
-                           not callable(getattr(obj, attr))
-                           and not attr.startswith("__")
-                           and (include_protected or not attr.startswith("_"))
-                           ])
 
-    return valid_members
+def _get_cache_files(cache_dir=''):
+    """
+    :param str cache_dir:
+    :return: (last use time, size, path) for all the cache files
+    :rtype: list[tuple]
+    """
+    cache_files = []
+    for root, _, files in os.walk(get_cache_dir(cache_dir)):
+        for file in files:
+            if not file.endswith('.cache'):
+                continue
+            path = linux_path(root, file)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            cache_files.append((stat.st_mtime, stat.st_size, path))
+    return cache_files
 
 
-def _add_params_to_parser(parser, obj, member_to_type, doc_dict, root_name='', obj_name='', verbose=0):
+def get_cache_info(cache_dir=''):
     """
+    number and total size in bytes of the cache files of each type on disk
 
-    :param argparse.ArgumentParser parser:
-    :param obj:
-    :param dict member_to_type:
-    :param dict doc_dict:
-    :param str root_name:
-    :param str obj_name:
-    :return:
+    :param str cache_dir:
+    :rtype: dict
     """
-    members = get_valid_members(obj)
+    cache_root = get_cache_dir(cache_dir)
+    cache_info = {}
+    for _, size, path in _get_cache_files(cache_dir):
+        cache_type = os.path.relpath(os.path.dirname(path), cache_root).replace(os.sep, '/')
+        if cache_type == '.':
+            cache_type = os.path.splitext(os.path.basename(path))[0]
+        n_files, total_size = cache_info.get(cache_type, (0, 0))
+        cache_info[cache_type] = (n_files + 1, total_size + size)
+    return cache_info
+
+
+def prune_cache(max_size=None, cache_dir=''):
+    """
+    remove the least recently used cache files until the total size of the cache folder is within max_size
 
-    obj_type = type(obj)
+    :param float | None max_size: size limit in MB, defaults to cache_size_limit
+    :param str cache_dir:
+    :return: number of removed files and total size in bytes of the remaining ones
+    :rtype: (int, int)
+    """
+    if max_size is None:
+        max_size = cache_size_limit
+    max_size = max_size * 1024 * 1024
+
+    cache_files = _get_cache_files(cache_dir)
+    total_size = sum(size for _, size, _ in cache_files)
+    n_removed = 0
+    for _, size, path in sorted(cache_files):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
+        n_removed += 1
+    _cache_sizes[get_cache_dir(cache_dir)] = total_size
+    return n_removed, total_size
 
-    assert members, "Invalid composite object with no component members found: {} (type: {})".format(
-        obj, obj_type)
 
-    dict_from_docs(obj_type, doc_dict, verbose)
+def clear_cache(cache_dir=''):
+    """
+    remove all the cache files
 
-    obj_doc_dict = doc_dict[obj_type]
-    setattr(type(obj), '__doc_dict__', obj_doc_dict)
+    :param str cache_dir:
+    :return: number of removed files
+    :rtype: int
+    """
+    n_removed, _ = prune_cache(max_size=0, cache_dir=cache_dir)
+    return n_removed
 
-    if obj_name:
-        if root_name:
-            root_name = '{:s}.{:s}'.format(root_name, obj_name)
-        else:
-            root_name = '{:s}'.format(obj_name)
-    for member in members:
-        if member == 'help':
-            continue
 
-        default_val = getattr(obj, member)
+def _touch_cache(path):
+    """
+    modification times of the cache files are their last use times for the LRU eviction
+    """
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+"""
+approximate total size in bytes of each cache folder in this process;
+the folder is only walked the first time it is written to and the sizes of the files written after that are
+simply added on so that the total can only be overestimated, e.g. when a file is overwritten
+"""
+_cache_sizes = {}
+
+
+def _write_cache(path, *objs, cache_dir='', pickled=1):
+    """
+    write a cache file and remove the least recently used ones if this makes the cache folder exceed its size limit;
+    the size of the folder is tracked approximately so that it is only walked again when the limit seems exceeded
+
+    :param str path:
+    :param str cache_dir:
+    :param int pickled: pickle objs rather than writing them as they are, in which case they must all be bytes
+    """
+    if pickled:
+        _atomic_dump(path, *objs)
+    else:
+        _atomic_write(path, objs)
+
+    cache_root = get_cache_dir(cache_dir)
+    try:
+        total_size = _cache_sizes[cache_root]
+    except KeyError:
+        total_size = sum(size for _, size, _ in _get_cache_files(cache_dir))
+    else:
+        try:
+            total_size += os.path.getsize(path)
+        except OSError:
+            pass
+    _cache_sizes[cache_root] = total_size
+
+    if total_size > cache_size_limit * 1024 * 1024:
+        """leave some room so that the next few writes do not walk the folder again"""
+        prune_cache(max_size=cache_size_limit * 0.9, cache_dir=cache_dir)
+
+
+_cache_dirs = set()
+
+
+def _makedirs_once(dir_name):
+    """
+    only check for the existence of each cache folder the first time it is needed in each process
+    """
+    if not dir_name or dir_name in _cache_dirs:
+        return
+    os.makedirs(dir_name, exist_ok=True)
+    _cache_dirs.add(dir_name)
+
+
+def _atomic_dump(path, *objs):
+    """
+    pickle one or more objects into a temporary file that is then renamed so that concurrent processes never see a
+    partially written file
+
+    :param str path:
+    """
+    _atomic_write(path, [pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL) for obj in objs])
+
+
+def _atomic_write(path, chunks):
+    """
+    :param str path:
+    :param list[bytes] chunks:
+    """
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        _makedirs_once(os.path.dirname(path))
+        with open(temp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _split_zip_path(path):
+    """
+    cfg files can be read from within zip archives by treating each archive as a folder in their paths,
+    e.g. sweeps.zip/exp/params.cfg
+
+    :param str path:
+    :return: path of the zip archive containing the file and the name of the file within it or None if the file
+    is not in a zip archive
+    :rtype: (str, str) | None
+    """
+    if '.zip' not in path.lower():
+        return None
+    parts = path.replace(os.sep, '/').split('/')
+    for i in range(1, len(parts)):
+        if parts[i - 1].lower().endswith('.zip'):
+            archive = '/'.join(parts[:i])
+            if os.path.isfile(archive):
+                return archive, posixpath.normpath('/'.join(parts[i:]))
+    return None
+
+
+@contextlib.contextmanager
+def _open_cfg(cfg):
+    """
+    binary stream of the contents of a cfg file that is decompressed while being read if the file is gzip-compressed
+    or inside a zip archive
+
+    :param str cfg:
+    """
+    with contextlib.ExitStack() as stack:
+        zip_path = _split_zip_path(cfg)
+        if zip_path is None:
+            f = stack.enter_context(open(cfg, 'rb'))
+        else:
+            archive, name = zip_path
+            zip_file = stack.enter_context(zipfile.ZipFile(archive))
+            f = stack.enter_context(zip_file.open(name))
+        if cfg.endswith('.gz'):
+            f = stack.enter_context(gzip.GzipFile(fileobj=f))
+        yield f
+
+
+def _cfg_exists(cfg):
+    if os.path.isfile(cfg):
+        return True
+    zip_path = _split_zip_path(cfg)
+    if zip_path is None:
+        return False
+    archive, name = zip_path
+    try:
+        with zipfile.ZipFile(archive) as zip_file:
+            zip_file.getinfo(name)
+    except (KeyError, zipfile.BadZipFile):
+        return False
+    return True
+
+
+def _find_cfg(cfg):
+    """
+    :param str cfg:
+    :return: cfg itself or its gzip-compressed version with .gz appended to its name if only that exists
+    or None if neither exists
+    :rtype: str | None
+    """
+    for _cfg in (cfg, cfg + '.gz'):
+        if _cfg_exists(_cfg):
+            return _cfg
+    return None
+
+
+def _file_signature(path, with_hash=1):
+    """
+    modification time of a file inside a zip archive is that of the archive
+
+    :param str path:
+    :param int with_hash:
+    :return: modification time, size and optionally the SHA1 hash of the contents of the file
+    :rtype: tuple
+    """
+    zip_path = _split_zip_path(path)
+    if zip_path is None:
+        stat = os.stat(path)
+        if not with_hash:
+            return stat.st_mtime_ns, stat.st_size
+        with open(path, 'rb') as f:
+            content_hash = hashlib.sha1(f.read()).hexdigest()
+        return stat.st_mtime_ns, stat.st_size, content_hash
+
+    archive, name = zip_path
+    stat = os.stat(archive)
+    with zipfile.ZipFile(archive) as zip_file:
+        size = zip_file.getinfo(name).file_size
+        if not with_hash:
+            return stat.st_mtime_ns, size
+        content_hash = hashlib.sha1(zip_file.read(name)).hexdigest()
+    return stat.st_mtime_ns, size, content_hash
+
+
+def _current_signature(path, signature):
+    """
+    compare the modification time and size with those in the signature and only compare the content hash
+    if these do not match since modification times are unreliable on network file systems and after git checkouts;
+    the new signature returned when only the content hash matches should replace the stored one so that the file
+    is not hashed again the next time
+
+    :param str path:
+    :param tuple signature: as returned by _file_signature
+    :return: signature itself if the modification time and size match, new signature of the file if only the
+    content hash matches or None if the file has changed
+    :rtype: tuple | None
+    """
+    try:
+        if _file_signature(path, with_hash=0) == signature[:2]:
+            return signature
+        new_signature = _file_signature(path)
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+    if new_signature[2] != signature[2]:
+        return None
+    return new_signature
+
+
+def get_doc_cache_path(cache_dir=''):
+    """
+    path of the persistent docstring cache file
+
+    :param str cache_dir: cache folder to use instead of the default one
+    :rtype: str
+    """
+    return linux_path(get_cache_dir(cache_dir), 'docs.cache')
+
+
+def _read_doc_cache(doc_cache_path):
+    """
+    :param str doc_cache_path:
+    :return: docstring cache on disk or None if it is missing or unreadable
+    :rtype: dict | None
+    """
+    if not os.path.isfile(doc_cache_path):
+        return None
+    try:
+        with open(doc_cache_path, 'rb') as f:
+            version, cache_data = pickle.load(f)
+    except BaseException as e:
+        print(f'failed to load docstring cache from {doc_cache_path}: {e}')
+        return None
+    if version != DOC_CACHE_VERSION:
+        return None
+    return cache_data
+
+
+def _load_doc_cache(cache_dir=''):
+    """
+    :param str cache_dir:
+    :return: docstring cache for cache_dir along with the path of its file
+    :rtype: (dict, str)
+    """
+    doc_cache_path = get_doc_cache_path(cache_dir)
+    try:
+        return _doc_caches[doc_cache_path], doc_cache_path
+    except KeyError:
+        pass
+
+    doc_cache = _read_doc_cache(doc_cache_path)
+    if doc_cache is None:
+        doc_cache = {}
+    else:
+        _touch_cache(doc_cache_path)
+    _doc_caches[doc_cache_path] = doc_cache
+    return doc_cache, doc_cache_path
+
+
+def _save_doc_cache(cache_dir=''):
+    """
+    the cache on disk is read again just before writing it so that the entries written by concurrent processes
+    since it was loaded are kept along with the ones updated in this process
+
+    :param str cache_dir:
+    """
+    doc_cache_path = get_doc_cache_path(cache_dir)
+    class_names = _doc_cache_updates.pop(doc_cache_path, None)
+    if not class_names:
+        return
+
+    doc_cache = _doc_caches[doc_cache_path]
+    cache_data = _read_doc_cache(doc_cache_path)
+    if cache_data is None:
+        cache_data = {}
+    for class_name in class_names:
+        doc_hash, raw_dict = doc_cache[class_name]
+        try:
+            disk_hash, disk_raw_dict = cache_data[class_name]
+        except KeyError:
+            pass
+        else:
+            if disk_hash == doc_hash and 'help' in disk_raw_dict and 'help' not in raw_dict:
+                """keep the full parse of the same docstring rather than replacing it with only the types"""
+                continue
+        cache_data[class_name] = (doc_hash, raw_dict)
+
+    try:
+        _write_cache(doc_cache_path, (DOC_CACHE_VERSION, cache_data))
+    except BaseException as e:
+        print(f'failed to write docstring cache to {doc_cache_path}: {e}')
+
+
+def _cached_dict_from_doc(_class, doc, verbose, cache_dir=''):
+    """
+    dict_from_str for the docstring of _class that is looked up in the persistent docstring cache
+    using the qualified name of the class and a hash of the docstring
+
+    :param type _class:
+    :param str doc:
+    :param int verbose:
+    :param str cache_dir:
+    :rtype: dict
+    """
+    if not doc_cache_enabled:
+        return dict_from_str(doc, verbose)
+
+    doc_cache, doc_cache_path = _load_doc_cache(cache_dir)
+    class_name = '{}.{}'.format(_class.__module__, _class.__qualname__)
+    doc_hash = hashlib.sha1(doc.encode('utf-8')).hexdigest()
+
+    try:
+        cached_hash, raw_dict = doc_cache[class_name]
+    except KeyError:
+        cached_hash = raw_dict = None
+
+    if raw_dict is not None and 'help' not in raw_dict:
+        """only the types were recorded by types_from_docs"""
+        cached_hash = None
+
+    _count_cache('docs', cached_hash == doc_hash)
+    if cached_hash != doc_hash:
+        raw_dict = _raw_dict_from_str(doc)
+        doc_cache[class_name] = (doc_hash, raw_dict)
+        _doc_cache_updates.setdefault(doc_cache_path, set()).add(class_name)
+
+    return _dict_from_raw(raw_dict)
+
+
+def dict_from_docs(obj_type, doc_dict, verbose, cache_dir=''):
+    if obj_type in doc_dict:
+        return
+
+    class_hierarchy = inspect.getmro(obj_type)[:-1][::-1]
+    obj_help_dict = {}
+    for _class in class_hierarchy:
+        if _class in doc_dict:
+            curr_dict = doc_dict[_class]
+        else:
+            doc = inspect.getdoc(_class)
+            if doc is None:
+                continue
+            curr_dict = _cached_dict_from_doc(_class, doc, verbose, cache_dir)
+            doc_dict[_class] = curr_dict
+
+        obj_help_dict.update(curr_dict)
+
+    doc_dict[obj_type] = obj_help_dict
+
+
+def _type_strs_from_str(string):
+    """
+    unresolved type strings of all the members documented in a ReST docstring;
+    much cheaper than _raw_dict_from_str since only the :type: and :param type name: entries are processed;
+    the docstring is split into meta chunks exactly like docstring_parser_custom.rest does
+    but malformed chunks are skipped instead of failing the whole docstring
+
+    :param str string:
+    :rtype: dict
+    """
+    param_type_strs = {}
+    main_type_strs = {}
+    starts = [m.start() for m in _META_START_RE.finditer(string)]
+    ends = starts[1:] + [len(string)]
+    for start, end in zip(starts, ends):
+        chunk = string[start:end]
+        try:
+            args_chunk, desc_chunk = chunk.lstrip(':').split(':', 1)
+        except ValueError:
+            continue
+        args = args_chunk.split()
+        if not args:
+            continue
+        if args[0] == 'param' and len(args) == 3:
+            param_type_strs[args[2]] = args[1]
+        elif args[0] == 'type' and len(args) > 1:
+            main_type_strs[args[1]] = desc_chunk.strip()
+    param_type_strs.update(main_type_strs)
+    return param_type_strs
+
+
+_class_type_dicts = weakref.WeakKeyDictionary()
+
+
+def types_from_docs(obj_type, doc_dict, cache_dir=''):
+    """
+    cheaper alternative to dict_from_docs that only extracts the member types without any help strings;
+    the types are taken from the persistent docstring cache if available or from a lightweight scan of the
+    docstring otherwise
+
+    :param type obj_type:
+    :param dict doc_dict:
+    :param str cache_dir:
+    :return:
+    """
+    if obj_type in doc_dict:
+        return
+
+    class_hierarchy = inspect.getmro(obj_type)[:-1][::-1]
+    obj_type_dict = {}
+    for _class in class_hierarchy:
+        try:
+            curr_dict = _class_type_dicts[_class]
+        except KeyError:
+            doc = inspect.getdoc(_class)
+            if doc is None:
+                curr_dict = {}
+            else:
+                type_strs = None
+                if doc_cache_enabled:
+                    doc_cache, doc_cache_path = _load_doc_cache(cache_dir)
+                    class_name = '{}.{}'.format(_class.__module__, _class.__qualname__)
+                    doc_hash = hashlib.sha1(doc.encode('utf-8')).hexdigest()
+                    try:
+                        cached_hash, raw_dict = doc_cache[class_name]
+                    except KeyError:
+                        pass
+                    else:
+                        if cached_hash == doc_hash:
+                            type_strs = raw_dict['type']
+                    _count_cache('docs', type_strs is not None)
+                if type_strs is None:
+                    type_strs = _type_strs_from_str(doc)
+                    if doc_cache_enabled:
+                        """
+                        record only the types so that the next process can skip the scan;
+                        _cached_dict_from_doc replaces this with the full parse when help is needed
+                        """
+                        doc_cache[class_name] = (doc_hash, {'type': type_strs})
+                        _doc_cache_updates.setdefault(doc_cache_path, set()).add(class_name)
+                curr_dict = {_member: {'type': resolve_type(type_str)} for _member, type_str in type_strs.items()}
+            _class_type_dicts[_class] = curr_dict
+
+        obj_type_dict.update(curr_dict)
+
+    doc_dict[obj_type] = obj_type_dict
+
+
+def _type_from_annotation(annotation):
+    """
+    convert a type annotation into one of the types handled by the parser;
+    generics resolve to their origin and unions to their first member that is not None
+
+    :param annotation:
+    :return: type or None if it cannot be converted
+    """
+    if isinstance(annotation, str):
+        return resolve_type(annotation)
+
+    origin = typing.get_origin(annotation)
+    if origin is not None:
+        args = typing.get_args(annotation)
+        if origin is typing.Union or origin is getattr(types, 'UnionType', None):
+            for arg in args:
+                if arg is type(None):
+                    continue
+                arg_type = _type_from_annotation(arg)
+                if arg_type is not None:
+                    return arg_type
+            return None
+        if origin is typing.ClassVar:
+            return _type_from_annotation(args[0]) if args else None
+        if origin is typing.Literal:
+            return type(args[0]) if args else None
+        if origin in (collections.abc.Sequence, collections.abc.MutableSequence):
+            return list
+        if origin in (collections.abc.Mapping, collections.abc.MutableMapping):
+            return dict
+        annotation = origin
+
+    if isinstance(annotation, type):
+        return annotation
+    return None
+
+
+_class_annotation_types = weakref.WeakKeyDictionary()
+
+
+def get_annotation_types(obj_type):
+    """
+    types of all the annotated members of a class including dataclass fields;
+    this is much cheaper than parsing docstrings and takes precedence over any types specified therein
+
+    :param type obj_type:
+    :rtype: dict
+    """
+    try:
+        return _class_annotation_types[obj_type]
+    except KeyError:
+        pass
+
+    if dataclasses.is_dataclass(obj_type):
+        annotations = {field.name: field.type for field in dataclasses.fields(obj_type)}
+    else:
+        try:
+            annotations = typing.get_type_hints(obj_type)
+        except Exception:
+            """unresolvable forward references so fall back to the raw annotations"""
+            annotations = {}
+            for _class in inspect.getmro(obj_type)[::-1]:
+                annotations.update(_class.__dict__.get('__annotations__', {}))
+
+    annotation_types = {}
+    for member, annotation in annotations.items():
+        member_type = _type_from_annotation(annotation)
+        if member_type is not None:
+            annotation_types[member] = member_type
+
+    _class_annotation_types[obj_type] = annotation_types
+    return annotation_types
+
+
+def _is_help_arg(_arg):
+    """
+    check if _arg would make argparse print the help, including its abbreviations of --help
+
+    :param str _arg:
+    :rtype: bool
+    """
+    return _arg == '-h' or (len(_arg) > 2 and '--help'.startswith(_arg))
+
+
+def help_from_docs(obj, member):
+    _help = ''
+
+    class_hierarchy = inspect.getmro(type(obj))[:-1][::-1]
+    all_doc = ''
+    for _class in class_hierarchy:
+
+        doc = inspect.getdoc(_class)
+        if doc is not None:
+            all_doc += doc + '\n'
+
+    if not all_doc:
+        return _help
+
+    doc_lines = all_doc.splitlines()
+    if not doc_lines:
+        return _help
+
+    filtered_lines = [k.strip() for k in doc_lines]
+    filtered_lines = list(filter(lambda k: k and not k.startswith(':type ') and not k.startswith('#'), filtered_lines))
+
+    filtered_str = '\n'.join(filtered_lines)
+
+    start_templ = ':param '
+    member_templ = '{} {}: '.format(type(getattr(obj, member)).__name__, member)
+
+    start_templ2 = ':ivar '
+    member_templ2 = '{}: '.format(member)
+
+    _help = _match_template(start_templ, member_templ, filtered_str, (start_templ2,))
+    if _help:
+        return _help
+
+    _help = _match_template(start_templ2, member_templ2, filtered_str, (start_templ,))
+    return _help
+
+
+_supported_types = (int, bool, float, str, tuple, list, dict, tuple, list, dict, MultiPath, MultiCFG)
+
+
+def type_from_docs(obj, member):
+    doc = inspect.getdoc(obj)
+    if doc is None:
+        return None
+
+    doc_lines = doc.splitlines()
+    if not doc_lines:
+        return None
+
+    templs = [(':param {} {}: '.format(k.__name__, member), k) for k in _supported_types]
+    relevant_lines = [k for k in doc_lines if any(k.startswith(templ[0]) for templ in templs)]
+
+    if not relevant_lines:
+        templs2 = [(':type {}: {}'.format(member, k.__name__), k) for k in _supported_types]
+        relevant_lines = [k for k in doc_lines if any(k.startswith(templ[0]) for templ in templs)]
+
+        if not relevant_lines:
+            return None
+
+    if len(relevant_lines) > 1:
+        print('Multiple matching docstring lines for {}:\n{}'.format(member, pformat(relevant_lines)))
+        return None
+
+    relevant_line = relevant_lines[0]
+    if relevant_line:
+        relevant_templs = [templ for templ in templs if relevant_line.startswith(templ[0])]
+        if len(relevant_lines) > 1:
+            print('Multiple matching templates for {} with docstring line {}:\n{}'.format(
+                member, relevant_line, pformat(relevant_templs)))
+            return None
+        return relevant_templs[0][1]
+
+    return None
+
+
+class MemberSchema:
+    """
+    members of a parameter class found by introspecting the class only once;
+    shared by get_valid_members and thus by all the functions that traverse parameter objects
+
+    attributes added to the instances are always picked up while the class attributes are only checked by their
+    number in each class so that replacing the value of an existing class attribute, e.g. a constant by a method,
+    or adding one while removing another is not noticed
+
+    :ivar properties: names of properties which are never treated as members
+    :ivar class_members: names of non-callable class attributes
+    :ivar instance_level: names of class level descriptors like slots whose values can only be checked
+    in the instance
+    :ivar class_attr_counts: number of attributes defined in each class in the MRO when the schema was created
+    """
+
+    """maximum number of distinct sets of instance attributes whose candidate members are stored"""
+    max_candidates = 64
+
+    def __init__(self, obj_t):
+        """
+
+        :param type obj_t:
+        """
+        self.class_attr_counts = _class_attr_counts(obj_t)
+        self.properties = set()
+        self.class_members = set()
+        self.instance_level = set()
+
+        for attr in dir(obj_t):
+            if attr.startswith('__'):
+                continue
+            try:
+                val = getattr(obj_t, attr)
+            except AttributeError:
+                continue
+            if isinstance(val, property):
+                self.properties.add(attr)
+            elif inspect.isdatadescriptor(val):
+                self.instance_level.add(attr)
+            elif not callable(val):
+                self.class_members.add(attr)
+
+        """sorted candidate members indexed by instance attribute names and include_protected"""
+        self._candidates = {}
+
+    def get_members(self, obj, include_protected=0):
+        """
+        names of valid members of obj in the same order as dir(obj)
+
+        :param obj: instance of the class this schema was created for
+        :param int include_protected:
+        :rtype: tuple
+        """
+        inst_dict = getattr(obj, '__dict__', None)
+        if inst_dict is None:
+            inst_dict = {}
+
+        key = (tuple(inst_dict), include_protected)
+        try:
+            candidates = self._candidates[key]
+        except KeyError:
+            if len(self._candidates) >= self.max_candidates:
+                self._candidates.clear()
+            names = set(inst_dict) | self.class_members | self.instance_level
+            candidates = self._candidates[key] = tuple(sorted(
+                attr for attr in names if
+                attr not in self.properties
+                and not attr.startswith("__")
+                and (include_protected or not attr.startswith("_"))
+            ))
+
+        valid_members = []
+        for attr in candidates:
+            if attr in inst_dict:
+                if callable(inst_dict[attr]):
+                    continue
+            elif attr in self.instance_level:
+                if callable(getattr(obj, attr)):
+                    continue
+            valid_members.append(attr)
+
+        return tuple(valid_members)
+
+
+def _class_attr_counts(obj_t):
+    """
+    :param type obj_t:
+    :return: number of attributes defined in each class in the MRO of obj_t except object
+    :rtype: tuple
+    """
+    return tuple(map(len, map(vars, obj_t.__mro__[:-1])))
+
+
+_member_schemas = weakref.WeakKeyDictionary()
+
+
+def get_member_schema(obj_t):
+    """
+    cached MemberSchema for the given class;
+    a new one is created whenever the class object itself changes, e.g. when its module is reloaded,
+    or attributes are added to or removed from any class in its MRO
+
+    :param type obj_t:
+    :rtype: MemberSchema
+    """
+    try:
+        schema = _member_schemas[obj_t]
+    except KeyError:
+        pass
+    else:
+        if schema.class_attr_counts == _class_attr_counts(obj_t):
+            return schema
+    schema = _member_schemas[obj_t] = MemberSchema(obj_t)
+    return schema
+
+
+def get_valid_members(obj, include_protected=0):
+    return get_member_schema(type(obj)).get_members(obj, include_protected)
+
+
+def _add_params_to_parser(parser, obj, member_to_type, doc_dict, root_name='', obj_name='', verbose=0,
+                          with_help=1, cache_dir=''):
+    """
+
+    :param argparse.ArgumentParser parser:
+    :param obj:
+    :param dict member_to_type:
+    :param dict doc_dict:
+    :param str root_name:
+    :param str obj_name:
+    :param int with_help: parse docstrings fully to add help strings; only the types are extracted otherwise
+    :param str cache_dir: folder of the persistent docstring cache
+    :return:
+    """
+    members = get_valid_members(obj)
+
+    obj_type = type(obj)
+
+    assert members, "Invalid composite object with no component members found: {} (type: {})".format(
+        obj, obj_type)
+
+    annotation_types = get_annotation_types(obj_type)
+
+    if with_help:
+        dict_from_docs(obj_type, doc_dict, verbose, cache_dir)
+        obj_doc_dict = doc_dict[obj_type]
+        setattr(type(obj), '__doc_dict__', obj_doc_dict)
+    elif all(member in annotation_types for member in members if member != 'help'):
+        """all types are available from annotations so docstrings are not needed at all"""
+        obj_doc_dict = {}
+    else:
+        types_from_docs(obj_type, doc_dict, cache_dir)
+        obj_doc_dict = doc_dict[obj_type]
+
+    if obj_name:
+        if root_name:
+            root_name = '{:s}.{:s}'.format(root_name, obj_name)
+        else:
+            root_name = '{:s}'.format(obj_name)
+    for member in members:
+        if member == 'help':
+            continue
+
+        default_val = getattr(obj, member)
         # member_type = type_from_docs(obj, member)
 
-        try:
-            member_type = obj_doc_dict[member]['type']
-        except KeyError:
-            member_type = None
+        try:
+            member_type = annotation_types[member]
+        except KeyError:
+            try:
+                member_type = obj_doc_dict[member]['type']
+            except KeyError:
+                member_type = None
+
+        if member_type is None:
+            if default_val is None:
+                if verbose:
+                    print('No type found in docstring for param {} with default as None'.format(member))
+                continue
+            # print('Deduced type {} from docstring for param {} with default as None'.format(member_type, member))
+            else:
+                member_type = type(default_val)
+
+        if member_type in (int, bool, float, str, tuple, list, dict, MultiCFG, MultiPath):
+
+            if root_name:
+                member_param_name = '{:s}.{:s}'.format(root_name, member)
+            else:
+                member_param_name = '{:s}'.format(member)
+
+            member_to_type[member_param_name] = member_type
+
+            # if member_type in (MultiCFG, MultiPath):
+            #     print()
+
+            if not with_help:
+                _help = ''
+            elif hasattr(obj, 'help') and member in obj.help:
+                _help = obj.help[member]
+                if not isinstance(_help, str):
+                    _help = pformat(_help)
+            else:
+                try:
+                    _help = obj_doc_dict[member]['help']
+                except KeyError:
+                    _help = ''
+
+                # _help = help_from_docs(obj, member)
+
+            if member_type in (tuple, list):
+                parser.add_argument('--{:s}'.format(member_param_name), type=str_to_tuple,
+                                    default=default_val, help=_help, metavar='')
+            elif member_type is dict:
+                parser.add_argument('--{:s}'.format(member_param_name), type=json.loads, default=default_val,
+                                    help=_help, metavar='')
+            elif member_type in (MultiCFG, MultiPath):
+                parser.add_argument('--{:s}'.format(member_param_name), type=member_type.process, default=default_val,
+                                    help=_help, metavar='')
+            elif member_type is str:
+                parser.add_argument('--{:s}'.format(member_param_name), type=strip_quotes, default=default_val,
+                                    help=_help, metavar='')
+            elif member_type in (int, bool, float, str):
+                parser.add_argument('--{:s}'.format(member_param_name), type=str_to_basic_type, default=default_val,
+                                    help=_help, metavar='')
+            else:
+                raise AssertionError('Something weird going on with member_type: {}'.format(member_type))
+        elif default_val is None:
+            if verbose:
+                print('Skipping composite param {} of type {} with default as None'.format(member, member_type))
+        else:
+            # parameter is itself an instance of some other parameter class so its members must
+            # be processed recursively
+            _add_params_to_parser(parser, getattr(obj, member), member_to_type, doc_dict, root_name, member,
+                                  verbose=verbose, with_help=with_help, cache_dir=cache_dir)
+
+
+def _assign_arg(obj, arg, _id, val, member_to_type, parent_name):
+    """
+
+    :param obj:
+    :param list arg:
+    :param int _id:
+    :param val:
+    :param dict member_to_type:
+    :param str parent_name:
+    :return:
+    """
+    if _id >= len(arg):
+        print('Invalid arg: {} with _id: {}'.format(arg, _id))
+        return
+
+    _arg = arg[_id]
+    obj_attr = getattr(obj, _arg)
+    obj_attr_name = '{}.{}'.format(parent_name, _arg) if parent_name else _arg
+    if obj_attr is None:
+        # _key = '--{}'.format(obj_attr_name)
+        obj_attr_type = member_to_type[obj_attr_name]
+    else:
+        obj_attr_type = type(obj_attr)
+
+    if obj_attr_type in _supported_types:
+        if val == '#' or val == '__n__':
+            val = _empty_val(obj_attr, val)
+        setattr(obj, _arg, val)
+    else:
+        # parameter is itself an instance of some other parameter class so its members must
+        # be processed recursively
+        _assign_arg(obj_attr, arg, _id + 1, val, member_to_type, obj_attr_name)
+
+
+def _empty_val(obj_attr, val):
+    """
+    empty value of the same type as the existing attribute for the special values # and __n__
+
+    :param obj_attr: existing value of the attribute
+    :param val:
+    :return:
+    """
+    if isinstance(obj_attr, str):
+        # empty string
+        val = ''
+    elif isinstance(obj_attr, tuple):
+        # empty tuple
+        val = ()
+    elif isinstance(obj_attr, list):
+        # empty list
+        val = []
+    elif isinstance(obj_attr, dict):
+        # empty dict
+        val = {}
+    return val
+
+
+@functools.lru_cache(maxsize=None)
+def _get_setter(name):
+    """
+    setter for the parameter with the given dotted name that fetches its owner object with a single precompiled
+    attrgetter instead of resolving each component recursively like _assign_arg
+
+    :param str name: full dotted name of the parameter, e.g. trainer.target.templates.count
+    :return: function that takes the root object and the value to be assigned
+    """
+    owner_path, _, attr = name.rpartition('.')
+    get_owner = attrgetter(owner_path) if owner_path else None
+
+    def _setter(obj, val):
+        owner = obj if get_owner is None else get_owner(obj)
+        if isinstance(val, str) and (val == '#' or val == '__n__'):
+            val = _empty_val(getattr(owner, attr), val)
+        setattr(owner, attr, val)
+
+    return _setter
+
+
+def _process_args_from_parser(obj, args, member_to_type, defaults=None, setters=None):
+    """
+
+    :param obj:
+    :param Namespace args:
+    :param dict member_to_type:
+    :param dict | None defaults: default values of a compiled parser; arguments that still have these exact
+    values are skipped since obj is a fresh instance that already has its own copies of the defaults
+    :param dict | None setters: precompiled setters of a compiled parser
+    :return:
+    """
+    # arg_prefix = ''
+    # if hasattr(obj, 'arg_prefix'):
+    #     arg_prefix = obj.arg_prefix
+
+    # optionals = parser._optionals._option_string_actions
+    # positionals = parser._positionals._option_string_actions
+
+    # all_params = optionals.copy()
+    # all_params.update(positionals)
+
+    members = vars(args)
+    for key in members.keys():
+        val = members[key]
+        if defaults is not None and key in defaults and val is defaults[key]:
+            continue
+        setter = setters[key] if setters is not None else _get_setter(key)
+        setter(obj, val)
+
+
+def _get_direct_schema(parser):
+    """
+    converter of each parameter along with the converted values of any string defaults that would be changed
+    by their converter, since argparse applies the converter to such defaults even if the parameter is not supplied
+
+    :param argparse.ArgumentParser parser:
+    :rtype: (dict, dict)
+    """
+    converters = {}
+    default_fixups = {}
+    for action in parser._actions:
+        if action.type is None:
+            continue
+        converters[action.dest] = action.type
+        default_val = action.default
+        if isinstance(default_val, str):
+            converted_val = action.type(default_val)
+            if converted_val != default_val or type(converted_val) is not type(default_val):
+                default_fixups[action.dest] = converted_val
+    return converters, default_fixups
+
+
+def _parse_direct(args_in, converters):
+    """
+    convert the supplied arguments using the converter of each parameter
+
+    :param list args_in: normalized arguments of the form --name=val
+    :param dict converters:
+    :return: converted values indexed by parameter name or None if any argument needs to be handled by argparse
+    :rtype: dict | None
+    """
+    vals = {}
+    for _arg in args_in:
+        if not _arg.startswith('--') or '=' not in _arg:
+            return None
+        _name, _val = _arg[2:].split('=', 1)
+        try:
+            converter = converters[_name]
+        except KeyError:
+            return None
+        try:
+            vals[_name] = converter(_val)
+        except Exception:
+            """let argparse report the error"""
+            return None
+    return vals
+
+
+def _process_args_direct(obj, vals, default_fixups, setters=None):
+    """
+
+    :param obj:
+    :param dict vals:
+    :param dict default_fixups:
+    :param dict | None setters: precompiled setters of a compiled parser
+    :return:
+    """
+    for key, val in default_fixups.items():
+        if key not in vals:
+            setter = setters[key] if setters is not None else _get_setter(key)
+            setter(obj, val)
+
+    for key, val in vals.items():
+        setter = setters[key] if setters is not None else _get_setter(key)
+        setter(obj, val)
+
+
+def _get_file_cache_path(path, cache_type, cache_dir=''):
+    """
+    caches of each type are stored in the corresponding subfolder of the cache folder with the name of each cache
+    made unique by the hash of the absolute path of its file
+
+    :param str path:
+    :param str cache_type:
+    :param str cache_dir:
+    :rtype: str
+    """
+    file_name = os.path.basename(path)
+    path_hash = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+
+    return linux_path(get_cache_dir(cache_dir), cache_type, '{}.{}.cache'.format(file_name, path_hash))
+
+
+def get_cfg_cache_path(_cfg, cache_dir=''):
+    """
+    :param str _cfg:
+    :param str cache_dir:
+    :rtype: str
+    """
+    return _get_file_cache_path(_cfg, 'cfg', cache_dir)
+
+
+"""cfg files at least this large in bytes are indexed rather than read so that only the lines of the sections 
+that are actually included are ever read from them"""
+lazy_read_size = int(os.environ.get('PARAMPARSE_LAZY_READ_SIZE', str(1024 * 1024)))
+
+"""candidates for section headings and imports, which are confirmed after stripping the matched lines"""
+_cfg_marker_re = re.compile(rb'^[^\S\n]*(?:##|%import%)', re.M)
+
+
+class _CfgLines(collections.abc.Sequence):
+    """
+    stripped lines of one or more cfg files stored as a sequence of segments, each of which is either a list of lines
+    in memory or a byte range of a file that is only read when one of its lines is accessed
+
+    :type paths: list[str]
+    :type file_ids: array
+    :type starts: array
+    :type ends: array
+    :type line_starts: array
+    :type literals: list[str]
+    """
+
+    def __init__(self, paths=(), file_ids=(), starts=(), ends=(), line_starts=(0,), literals=()):
+        """
+        :param list[str] paths: absolute paths of the files
+        :param file_ids: file of each segment or -1 for the ones in memory
+        :param starts: start byte offset of each segment or the ID of its first line in literals
+        :param ends: end byte offset of each segment or the ID after its last line in literals
+        :param line_starts: ID of the first line of each segment followed by the total number of lines
+        :param list[str] literals: lines of all the segments in memory
+        """
+        self.paths = list(paths)
+        self.file_ids = array('i', file_ids)
+        self.starts = array('q', starts)
+        self.ends = array('q', ends)
+        self.line_starts = array('q', line_starts)
+        self.literals = literals if isinstance(literals, list) else list(literals)
+        self._segment_lines = {}
+
+    def __reduce__(self):
+        return _CfgLines, (self.paths, self.file_ids, self.starts, self.ends, self.line_starts, self.literals)
+
+    def __len__(self):
+        return self.line_starts[-1]
+
+    def __getitem__(self, _id):
+        if isinstance(_id, slice):
+            start, stop, step = _id.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            lines = []
+            while start < stop:
+                seg_id = bisect.bisect_right(self.line_starts, start) - 1
+                seg_line_start = self.line_starts[seg_id]
+                seg_lines = self._get_segment_lines(seg_id)
+                lines += seg_lines[start - seg_line_start:stop - seg_line_start]
+                start = self.line_starts[seg_id + 1]
+            return lines
+        if _id < 0:
+            _id += len(self)
+        if not 0 <= _id < len(self):
+            raise IndexError(_id)
+        seg_id = bisect.bisect_right(self.line_starts, _id) - 1
+        return self._get_segment_lines(seg_id)[_id - self.line_starts[seg_id]]
+
+    def _get_segment_lines(self, seg_id):
+        try:
+            return self._segment_lines[seg_id]
+        except KeyError:
+            pass
+        start, end = self.starts[seg_id], self.ends[seg_id]
+        file_id = self.file_ids[seg_id]
+        if file_id < 0:
+            lines = self.literals[start:end]
+        else:
+            with open(self.paths[file_id], 'rb') as f:
+                f.seek(start)
+                text = str(f.read(end - start), locale.getpreferredencoding(False))
+            n_lines = self.line_starts[seg_id + 1] - self.line_starts[seg_id]
+            lines = [k.strip() for k in text.split('\n')[:n_lines]]
+        self._segment_lines[seg_id] = lines
+        return lines
+
+    def _add_segment(self, file_id, start, end, n_lines):
+        if not n_lines:
+            return
+        self.file_ids.append(file_id)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.line_starts.append(self.line_starts[-1] + n_lines)
+
+    def _add_literals(self, lines):
+        n_literals = len(self.literals)
+        self.literals += lines
+        self._add_segment(-1, n_literals, len(self.literals), len(lines))
+
+    def _add_file_range(self, path, start, end, n_lines):
+        try:
+            file_id = self.paths.index(path)
+        except ValueError:
+            file_id = len(self.paths)
+            self.paths.append(path)
+        self._add_segment(file_id, start, end, n_lines)
+
+    def extend(self, lines):
+        """
+        :param list[str] | _CfgLines lines:
+        """
+        if not isinstance(lines, _CfgLines):
+            self._add_literals(list(lines))
+            return
+        for seg_id, file_id in enumerate(lines.file_ids):
+            start, end = lines.starts[seg_id], lines.ends[seg_id]
+            if file_id < 0:
+                self._add_literals(lines.literals[start:end])
+            else:
+                self._add_file_range(lines.paths[file_id], start, end,
+                                     lines.line_starts[seg_id + 1] - lines.line_starts[seg_id])
+
+    def insert(self, _id, line):
+        """
+        only insertion at the start is supported since that is the only one needed for adding the root heading
+        """
+        assert _id == 0, "lines can only be inserted at the start"
+        lines = _CfgLines()
+        lines.extend([line, ])
+        lines.extend(self)
+        self.__init__(lines.paths, lines.file_ids, lines.starts, lines.ends, lines.line_starts, lines.literals)
+
+    def sub(self, start, stop):
+        """
+        lines from start to stop, both of which must be segment boundaries
+
+        :rtype: _CfgLines
+        """
+        lines = _CfgLines()
+        if start >= stop:
+            return lines
+        start_seg_id = bisect.bisect_left(self.line_starts, start)
+        stop_seg_id = bisect.bisect_left(self.line_starts, stop)
+        assert self.line_starts[start_seg_id] == start and self.line_starts[stop_seg_id] == stop, \
+            "cfg lines can only be split at segment boundaries"
+        for seg_id in range(start_seg_id, stop_seg_id):
+            seg_start, seg_end = self.starts[seg_id], self.ends[seg_id]
+            file_id = self.file_ids[seg_id]
+            n_lines = self.line_starts[seg_id + 1] - self.line_starts[seg_id]
+            if file_id < 0:
+                lines._add_literals(self.literals[seg_start:seg_end])
+            else:
+                lines._add_file_range(self.paths[file_id], seg_start, seg_end, n_lines)
+        return lines
+
+
+def _index_cfg_lines(cfg):
+    """
+    index a large cfg file in a single scan of its memory map, keeping only its section headings and imports
+    in memory while the lines between them are retained as byte ranges to be read only if needed
+
+    :param str cfg:
+    :return: lines of the cfg file along with the IDs of its section headings and imports or None if the file
+    cannot be indexed because of old Mac line endings
+    :rtype: (_CfgLines, list[int], list[int]) | None
+    """
+    path = os.path.abspath(cfg)
+    encoding = locale.getpreferredencoding(False)
+
+    lines = _CfgLines()
+    heading_ids = []
+    import_ids = []
+
+    with open(cfg, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        if re.search(rb'\r(?!\n)', buf):
+            return None
+
+        line_id = 0
+        line_pos = 0
+        seg_pos = 0
+        seg_line_id = 0
+        for match in _cfg_marker_re.finditer(buf):
+            start = match.start()
+            line_id += buf[line_pos:start].count(b'\n')
+            end = buf.find(b'\n', start)
+            end = len(buf) if end < 0 else end + 1
+            line_pos = start
+
+            line = str(buf[start:end], encoding).strip()
+            if line.startswith('##'):
+                heading_ids.append(line_id)
+            elif line.startswith('%import% '):
+                import_ids.append(line_id)
+            else:
+                continue
+
+            lines._add_file_range(path, seg_pos, start, line_id - seg_line_id)
+            lines._add_literals([line, ])
+
+            line_id += 1
+            line_pos = seg_pos = end
+            seg_line_id = line_id
+
+        tail = buf[seg_pos:]
+        n_tail_lines = tail.count(b'\n') + (1 if tail and not tail.endswith(b'\n') else 0)
+        lines._add_file_range(path, seg_pos, len(buf), n_tail_lines)
+
+    return lines, heading_ids, import_ids
+
+
+def _extend_cfg_lines(lines, new_lines):
+    """
+    :param list[str] | _CfgLines lines:
+    :param list[str] | _CfgLines new_lines:
+    :return: lines, which remain a list unless new_lines are not in memory
+    :rtype: list[str] | _CfgLines
+    """
+    if isinstance(lines, list) and isinstance(new_lines, list):
+        lines += new_lines
+        return lines
+    if isinstance(lines, list):
+        lines, literals = _CfgLines(), lines
+        lines.extend(literals)
+    lines.extend(new_lines)
+    return lines
+
+
+def _read_cfg_lines(cfg):
+    """
+    :param str cfg:
+    :return: stripped lines of a single cfg file along with the IDs of its section headings and imports;
+    lines of large files are only read when accessed unless they are compressed
+    :rtype: (list[str] | _CfgLines, list[int], list[int])
+    """
+    is_compressed = cfg.endswith('.gz') or _split_zip_path(cfg) is not None
+
+    if lazy_read_size and not is_compressed and os.path.getsize(cfg) >= lazy_read_size:
+        cfg_lines = _index_cfg_lines(cfg)
+        if cfg_lines is not None:
+            return cfg_lines
+
+    if is_compressed:
+        with _open_cfg(cfg) as f:
+            lines = [k.strip() for k in io.TextIOWrapper(f, encoding=locale.getpreferredencoding(False))]
+    else:
+        with open(cfg, 'r') as f:
+            lines = [k.strip() for k in f.readlines()]
+    heading_ids = [i for i, k in enumerate(lines) if k.startswith('##')]
+    import_ids = [i for i, k in enumerate(lines) if k.startswith('%import% ')]
+    return lines, heading_ids, import_ids
+
+
+def _load_cfg_lines(cfg, enable_cache=1, cache_dir=''):
+    """
+    lines of each cfg file are cached independently of the cfgs that import it so that changing a cfg file only
+    requires that file to be read again while the lines of all the unchanged files it imports or is imported by
+    are loaded from their caches
+
+    :param str cfg:
+    :param int enable_cache:
+    :param str cache_dir:
+    :rtype: (list[str], list[int], list[int])
+    """
+    if not enable_cache:
+        return _read_cfg_lines(cfg)
+
+    lines_cache_path = _get_file_cache_path(cfg, 'lines', cache_dir)
+    cfg_lines = None
+    if os.path.isfile(lines_cache_path):
+        try:
+            with open(lines_cache_path, 'rb') as f:
+                version, signature = pickle.load(f)
+                if version == LINES_CACHE_VERSION:
+                    new_signature = _current_signature(cfg, signature)
+                    if new_signature is not None:
+                        cfg_lines = pickle.load(f)
+        except BaseException as e:
+            print(f'failed to load cfg lines from cache: {e}')
+
+    if cfg_lines is not None:
+        _count_cache('lines', 1)
+        if new_signature == signature:
+            _touch_cache(lines_cache_path)
+        else:
+            try:
+                _write_cache(lines_cache_path, (LINES_CACHE_VERSION, new_signature), cfg_lines, cache_dir=cache_dir)
+            except BaseException as e:
+                print(f'failed to write cfg lines to cache {lines_cache_path}: {e}')
+        return cfg_lines
+
+    _count_cache('lines', 0)
+    signature = _file_signature(cfg)
+    cfg_lines = _read_cfg_lines(cfg)
+    try:
+        _write_cache(lines_cache_path, (LINES_CACHE_VERSION, signature), cfg_lines, cache_dir=cache_dir)
+    except BaseException as e:
+        print(f'failed to write cfg lines to cache {lines_cache_path}: {e}')
+    return cfg_lines
+
+
+def _recursive_read(cfg, imported_cfgs=(), level=0, enable_cache=0, cache_dir=''):
+    """
+    assemble the lines of a cfg file and all the files imported by it
+
+    :param str cfg:
+    :param tuple imported_cfgs:
+    :param int level:
+    :param int enable_cache:
+    :param str cache_dir:
+    :return: lines, IDs of the section headings among these and all the cfg files read
+    :rtype: (list[str] | _CfgLines, list[int], tuple)
+    """
+    indent = '\t' * level
+    print(f'{indent}Reading parameters from {cfg:s}')
+    file_args, heading_ids, import_ids = _load_cfg_lines(cfg, enable_cache, cache_dir)
+
+    cfg_dir = os.path.dirname(cfg)
+
+    out_file_args = []
+    out_heading_ids = []
+    out_imported_cfgs = [cfg, ]
+
+    heading_pos = 0
+    start_id = 0
+    for file_arg_id in import_ids + [len(file_args), ]:
+        """lines and headings between the previous import and this one"""
+        end_pos = bisect.bisect_left(heading_ids, file_arg_id, heading_pos)
+        offset = len(out_file_args) - start_id
+        out_heading_ids += [k + offset for k in heading_ids[heading_pos:end_pos]]
+        if isinstance(file_args, _CfgLines):
+            out_file_args = _extend_cfg_lines(out_file_args, file_args.sub(start_id, file_arg_id))
+        else:
+            out_file_args = _extend_cfg_lines(out_file_args, file_args[start_id:file_arg_id])
+        heading_pos = end_pos
+        start_id = file_arg_id + 1
+
+        if file_arg_id == len(file_args):
+            break
+
+        _, imported_cfg_name = file_args[file_arg_id].split(' ')
+        imported_cfg = linux_path(cfg_dir, imported_cfg_name)
+        imported_cfg = _find_cfg(imported_cfg) or imported_cfg
+        prev_imported_cfgs = tuple(set(imported_cfgs + tuple(out_imported_cfgs)))
+
+        assert imported_cfg not in prev_imported_cfgs, f"circular CFG import found in {cfg}: {imported_cfg}"
+
+        out_imported_cfgs.append(imported_cfg)
+        imported_file_args, imported_heading_ids, imported_cfgs = _recursive_read(
+            imported_cfg, imported_cfgs=tuple(out_imported_cfgs), level=level + 1,
+            enable_cache=enable_cache, cache_dir=cache_dir)
+        out_heading_ids += [k + len(out_file_args) for k in imported_heading_ids]
+        out_file_args = _extend_cfg_lines(out_file_args, imported_file_args)
+        out_imported_cfgs += imported_cfgs
+
+    out_imported_cfgs = tuple(set(out_imported_cfgs))
+
+    return out_file_args, out_heading_ids, out_imported_cfgs
+
+
+def recursive_read(cfg, imported_cfgs=(), level=0):
+    out_file_args, _, out_imported_cfgs = _recursive_read(cfg, imported_cfgs, level)
+    return out_file_args, out_imported_cfgs
+
+
+class _LazyStrs(collections.abc.Sequence):
+    """
+    strings stored in a single UTF-8 blob that are only decoded when accessed
+
+    :type blob: memoryview
+    :type offsets: memoryview
+    """
+    __slots__ = ('blob', 'offsets')
+
+    def __init__(self, blob, offsets):
+        """
+        :param memoryview blob:
+        :param memoryview offsets: start of each string in the blob followed by the size of the blob
+        """
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, _id):
+        if isinstance(_id, slice):
+            return [self[i] for i in range(*_id.indices(len(self)))]
+        if _id < 0:
+            _id += len(self)
+        if not 0 <= _id < len(self):
+            raise IndexError(_id)
+        return str(self.blob[self.offsets[_id]:self.offsets[_id + 1]], 'utf-8', 'surrogatepass')
+
+
+"""
+binary cfg cache:
+magic, version and header size followed by a JSON header and then the blocks in _CFG_CACHE_SCHEMA, each aligned 
+to 8 bytes;
+the header contains the signatures of the cfg files so that the cache can be validated before reading any blocks;
+cfg packs have the same format with their own magic and version and without any signatures
+"""
+_CFG_CACHE_MAGIC = b'PPCFG'
+_CFG_PACK_MAGIC = b'PPPAK'
+_CFG_CACHE_PREFIX = struct.Struct('<5sII')
+
+"""name and array type code of each block;
+the section tree and the template sections are stored as one array per column with their names in a single 
+newline-separated string since names are cfg lines and cannot contain newlines;
+lines of the cfg file are stored in a single string with their offsets so they can be decoded individually;
+for large cfg files, only the lines in memory are stored in this string along with the segments of _CfgLines"""
+_CFG_CACHE_SCHEMA = (
+    ('sections.names', 'B'),
+    ('sections.full_names', 'B'),
+    ('sections.parent_ids', 'i'),
+    ('sections.end_ids', 'i'),
+    ('sections.levels', 'i'),
+    ('sections.line_ids', 'i'),
+    ('sections.line_end_ids', 'i'),
+    ('sections.template_ids', 'i'),
+    ('sections.is_common', 'B'),
+    ('templates.names', 'B'),
+    ('templates.line_ids', 'i'),
+    ('templates.end_ids', 'i'),
+    ('templates.levels', 'i'),
+    ('templates.template_ids', 'i'),
+    ('file_args', 'B'),
+    ('file_args.offsets', 'q'),
+    ('segments.file_ids', 'i'),
+    ('segments.starts', 'q'),
+    ('segments.ends', 'q'),
+    ('segments.line_starts', 'q'),
+)
+
+
+def _pack_strs(strs):
+    """
+    :param list[str] strs:
+    :return: UTF-8 blob and offsets of the strings in it
+    :rtype: (bytes, array)
+    """
+    encoded = [_str.encode('utf-8', 'surrogatepass') for _str in strs]
+    offsets = array('q', [0])
+    offsets.extend(itertools.accumulate(len(_str) for _str in encoded))
+    return b''.join(encoded), offsets
+
+
+def _pack_names(names):
+    return '\n'.join(names).encode('utf-8', 'surrogatepass')
+
+
+def _unpack_names(blob, n_names):
+    if not n_names:
+        return []
+    return str(blob, 'utf-8', 'surrogatepass').split('\n')
+
+
+def _cfg_cache_chunks(cfg_signatures, nodes, file_args, file_args_offset, template_sections, imported_cfgs,
+                      magic=_CFG_CACHE_MAGIC, version=CFG_CACHE_VERSION):
+    """
+    :param dict cfg_signatures:
+    :param SectionTree nodes:
+    :param list[str] | _CfgLines file_args:
+    :param int file_args_offset:
+    :param list | None template_sections:
+    :param tuple imported_cfgs:
+    :param bytes magic:
+    :param int version:
+    :rtype: list[bytes]
+    """
+    if template_sections is None:
+        template_columns = [[]] * 5
+    else:
+        template_columns = list(zip(*template_sections)) or [[]] * 5
+    if isinstance(file_args, _CfgLines):
+        segment_paths = file_args.paths
+        segment_blocks = [file_args.file_ids, file_args.starts, file_args.ends, file_args.line_starts]
+        file_args = file_args.literals
+    else:
+        segment_paths = None
+        segment_blocks = [b''] * 4
+    file_args_blob, file_args_offsets = _pack_strs(file_args)
+    blocks = [
+        _pack_names(nodes.names),
+        _pack_names(nodes.full_names),
+        nodes.parent_ids,
+        nodes.end_ids,
+        nodes.levels,
+        nodes.line_ids,
+        nodes.line_end_ids,
+        nodes.template_ids,
+        nodes.is_common,
+        _pack_names(template_columns[0]),
+    ] + [array('i', column) for column in template_columns[1:]] + [
+        file_args_blob,
+        file_args_offsets,
+    ] + segment_blocks
+    blocks = [bytes(block) for block in blocks]
+
+    block_info = []
+    offset = 0
+    for (name, typecode), block in zip(_CFG_CACHE_SCHEMA, blocks):
+        block_info.append((name, typecode, array(typecode).itemsize, offset, len(block)))
+        offset += len(block) + (-len(block) % 8)
+
+    header = dict(
+        signatures=cfg_signatures,
+        byteorder=sys.byteorder,
+        blocks=block_info,
+        n_sections=len(nodes),
+        n_template_sections=-1 if template_sections is None else len(template_sections),
+        file_args_offset=file_args_offset,
+        root_sec_name=nodes.root_name,
+        imported_cfgs=list(imported_cfgs),
+        segment_paths=segment_paths,
+    )
+
+    chunks = _pack_cfg_header(header, magic, version)
+    for block in blocks:
+        chunks += [block, b'\0' * (-len(block) % 8)]
+    return chunks
+
+
+def _pack_cfg_header(header, magic=_CFG_CACHE_MAGIC, version=CFG_CACHE_VERSION):
+    """
+    :param dict header:
+    :param bytes magic:
+    :param int version:
+    :return: prefix and JSON header padded so that the blocks following it are aligned to 8 bytes
+    :rtype: list[bytes]
+    """
+    header = json.dumps(header).encode('utf-8')
+    header += b' ' * (-(_CFG_CACHE_PREFIX.size + len(header)) % 8)
+    return [_CFG_CACHE_PREFIX.pack(magic, version, len(header)), header]
+
+
+def _unpack_cfg_header(buf, magic=_CFG_CACHE_MAGIC, version=CFG_CACHE_VERSION):
+    """
+    :param buf: cfg data in the format written by _cfg_cache_chunks
+    :param bytes magic:
+    :param int version:
+    :return: header and the offset of the first block in buf or None if buf has a different magic, version or
+    schema
+    :rtype: (dict, int) | None
+    """
+    buf_magic, buf_version, header_size = _CFG_CACHE_PREFIX.unpack_from(buf)
+    if buf_magic != magic or buf_version != version:
+        return None
+
+    data_start = _CFG_CACHE_PREFIX.size + header_size
+    header = json.loads(str(buf[_CFG_CACHE_PREFIX.size:data_start], 'utf-8'))
+
+    schema = tuple((name, typecode, array(typecode).itemsize) for name, typecode in _CFG_CACHE_SCHEMA)
+    if header['byteorder'] != sys.byteorder or \
+            tuple(tuple(info[:3]) for info in header['blocks']) != schema:
+        return None
+
+    return header, data_start
+
+
+def _unpack_cfg_data(buf, header):
+    """
+    :param memoryview buf: blocks of the cfg data following its header
+    :param dict header: header returned by _unpack_cfg_header
+    :return: cfg data in the same format as returned by read_cfg
+    """
+    blocks = {}
+    for name, typecode, _, offset, size in header['blocks']:
+        block = buf[offset:offset + size]
+        if typecode != 'B':
+            block = block.cast(typecode)
+        blocks[name] = block
+
+    n_sections = header['n_sections']
+    root_sec_name = header['root_sec_name']
+    nodes = SectionTree.from_arrays(
+        root_sec_name,
+        _unpack_names(blocks['sections.names'], n_sections),
+        _unpack_names(blocks['sections.full_names'], n_sections),
+        *(blocks['sections.' + name] for name in (
+            'parent_ids', 'end_ids', 'levels', 'line_ids', 'line_end_ids', 'template_ids', 'is_common')))
+    nodes_by_fullname, sections_by_name = _index_section_tree(nodes)
+    _sections = [list(_sec) for _sec in zip(
+        nodes.names, nodes.line_ids, nodes.line_end_ids, nodes.levels, nodes.template_ids)]
+
+    template_sections = None
+    n_template_sections = header['n_template_sections']
+    if n_template_sections >= 0:
+        template_sections = [list(_sec) for _sec in zip(
+            _unpack_names(blocks['templates.names'], n_template_sections),
+            *(blocks['templates.' + name].tolist() for name in (
+                'line_ids', 'end_ids', 'levels', 'template_ids')))]
+
+    file_args = _LazyStrs(blocks['file_args'], blocks['file_args.offsets'])
+    if header['segment_paths'] is not None:
+        file_args = _CfgLines(header['segment_paths'], *(blocks['segments.' + name] for name in (
+            'file_ids', 'starts', 'ends', 'line_starts')), literals=file_args)
+    file_args_offset = header['file_args_offset']
+    imported_cfgs = tuple(header['imported_cfgs'])
+
+    return (nodes, nodes_by_fullname, sections_by_name, _sections, file_args, file_args_offset, root_sec_name,
+            template_sections, imported_cfgs)
+
+
+def load_cfg_cache(_cfg, cache_dir=''):
+    """
+    the cache is memory mapped and its header containing the signatures of all the cfg files it was created from
+    is validated before reading any of the rest;
+    lines of the cfg file are decoded only when accessed
+
+    :param str _cfg:
+    :param str cache_dir:
+    :return: None if the cache is missing, invalid or has a different version or schema
+    """
+    cfg_cache_path = get_cfg_cache_path(_cfg, cache_dir)
+
+    if not os.path.isfile(cfg_cache_path):
+        return None
+
+    try:
+        with open(cfg_cache_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_info = _unpack_cfg_header(mm)
+            if header_info is None:
+                return None
+            header, data_start = header_info
+            new_signatures = {}
+            for imported_cfg, signature in header['signatures'].items():
+                new_signatures[imported_cfg] = _current_signature(imported_cfg, tuple(signature))
+                if new_signatures[imported_cfg] is None:
+                    return None
+            """
+            the blocks are copied out of the mapping so that it can be closed here and the cache file replaced or
+            removed while the cfg data is still in use
+            """
+            buf = memoryview(mm[data_start:])
+        cfg_data = _unpack_cfg_data(buf, header)
+    except Exception as e:
+        print(f'failed to load cfg data from cache: {e}')
+        return None
+
+    print('Loading cfg data from {:s}'.format(cfg_cache_path))
+    if all(new_signatures[imported_cfg] == tuple(signature)
+           for imported_cfg, signature in header['signatures'].items()):
+        _touch_cache(cfg_cache_path)
+    else:
+        """only the header changes so the blocks are written back as they are"""
+        header['signatures'] = new_signatures
+        try:
+            _write_cache(cfg_cache_path, *_pack_cfg_header(header), buf, cache_dir=cache_dir, pickled=0)
+        except BaseException as e:
+            print(f'failed to write cfg data to cache {cfg_cache_path}: {e}')
+
+    return cfg_data
+
+
+def save_cfg_pack(cfg, pack_path=''):
+    """
+    resolve a cfg file along with all its imports and its sections into a single self-contained pack file
+    that can be used as <pack_path>:<sections> in place of the cfg file;
+    packs are recognized by their extension so .ppk is added to pack_path if it has a different one
+
+    :param str cfg:
+    :param str pack_path: defaults to the name of the cfg file with the extension .ppk in the current folder
+    :return: pack_path
+    :rtype: str
+    """
+    _cfg = _find_cfg(cfg)
+    if _cfg is None:
+        raise IOError('cfg file does not exist: {:s}'.format(linux_path(os.path.abspath(cfg))))
+
+    (nodes, nodes_by_fullname, sections_by_name, _sections, file_args, file_args_offset, root_sec_name,
+     template_sections, imported_cfgs) = read_cfg(_cfg, enable_cache=0)
+
+    if not pack_path:
+        pack_name = os.path.basename(_cfg)
+        if pack_name.endswith('.gz'):
+            pack_name = pack_name[:-3]
+        pack_path = os.path.splitext(pack_name)[0] + '.ppk'
+    elif not pack_path.endswith('.ppk'):
+        pack_path += '.ppk'
+
+    """lines are copied into the pack instead of being read from the cfg files"""
+    chunks = _cfg_cache_chunks({}, nodes, file_args[:], file_args_offset, template_sections,
+                               [linux_path(os.path.abspath(imported_cfg)) for imported_cfg in imported_cfgs],
+                               magic=_CFG_PACK_MAGIC, version=CFG_PACK_VERSION)
+    _atomic_write(pack_path, chunks)
+
+    return pack_path
+
+
+def load_cfg_pack(pack_path):
+    """
+    read the entire pack in a single sequential read without accessing any of the cfg files it was created from
+
+    :param str pack_path:
+    :return: cfg data in the same format as returned by read_cfg with the pack file as the only cfg file read
+    """
+    print('Reading parameters from pack {:s}'.format(pack_path))
+    with open(pack_path, 'rb') as f:
+        buf = memoryview(f.read())
+
+    header_info = _unpack_cfg_header(buf, magic=_CFG_PACK_MAGIC, version=CFG_PACK_VERSION)
+    if header_info is None:
+        raise IOError('{} is not a cfg pack compatible with this version of paramparse; '
+                      'it should be created again using paramparse pack'.format(pack_path))
+    header, data_start = header_info
+    cfg_data = _unpack_cfg_data(buf[data_start:], header)
+
+    return cfg_data[:-1] + ((pack_path,),)
+
+
+def save_cfg_cache(_cfg, nodes, file_args, file_args_offset, template_sections, imported_cfgs, cache_dir=''):
+    """
+    :param str _cfg:
+    :param SectionTree nodes:
+    :param list[str] file_args:
+    :param int file_args_offset:
+    :param list | None template_sections:
+    :param tuple imported_cfgs: all the cfg files that the cfg data was read from
+    :param str cache_dir:
+    """
+    cfg_cache_path = get_cfg_cache_path(_cfg, cache_dir)
+    try:
+        cfg_signatures = {os.path.abspath(imported_cfg): _file_signature(imported_cfg)
+                          for imported_cfg in imported_cfgs}
+        chunks = _cfg_cache_chunks(cfg_signatures, nodes, file_args, file_args_offset, template_sections,
+                                   imported_cfgs)
+        _write_cache(cfg_cache_path, *chunks, cache_dir=cache_dir, pickled=0)
+    except BaseException as e:
+        print(f'failed to write cfg data to cache {cfg_cache_path}: {e}')
+
+
+def _template_num_to_str(_num):
+    if isinstance(_num, str):
+        return _num
+    if _num < 0:
+        return 'n' + str(abs(_num))
+    return str(_num)
+
+
+def _is_lazy_template(_sec_name):
+    """
+    template sections with range() or irange() in their names can generate very large numbers of sections so only
+    the ones that are actually needed are generated;
+    names with double underscores might generate common or substitution sections that are always needed
+    while those with other kinds of lists or ranges are not matched lazily
+
+    :param str _sec_name:
+    :rtype: bool
+    """
+    if '__' in _sec_name:
+        return False
+    has_range = 0
+    for token in _sec_name.split('_'):
+        for _val in token.split('+'):
+            if _val.startswith('range(') or _val.startswith('irange('):
+                has_range = 1
+            elif any(k in _val for k in ('(', '{', '[', ':')):
+                return False
+    return bool(has_range)
+
+
+def _template_token_ids(token, name):
+    """
+    positions of a name among the values generated by one underscore-separated token of a template section name
+
+    :param str token:
+    :param str name:
+    :rtype: list[int]
+    """
+    ids = []
+    offset = 0
+    for _val in token.split('+'):
+        _range = str_to_range(_val)
+        if _range is None:
+            _names = [_template_num_to_str(_num) for _num in str_to_tuple(_val)]
+            ids += [offset + i for i, k in enumerate(_names) if k == name]
+            offset += len(_names)
+            continue
+        try:
+            _num = -int(name[1:]) if name.startswith('n') else int(name)
+        except ValueError:
+            pass
+        else:
+            if _num in _range and _template_num_to_str(_num) == name:
+                ids.append(offset + _range.index(_num))
+        offset += len(_range)
+    return ids
+
+
+def _match_template_sec_name(_sec_name, name):
+    """
+    match a section name against the names that would be generated by a template section name
+    without generating any of them
+
+    :param str _sec_name: template section name
+    :param str name:
+    :return: positions of all the matching template sections in the order of their generation
+    :rtype: list[tuple]
+    """
+    tokens = _sec_name.split('_')
+    sub_names = name.split('_')
+    if len(tokens) != len(sub_names):
+        return []
+    token_ids = []
+    for token, sub_name in zip(tokens, sub_names):
+        _ids = _template_token_ids(token, sub_name)
+        if not _ids:
+            return []
+        token_ids.append(_ids)
+    return list(itertools.product(*token_ids))
+
+
+def _get_requested_sec_names(_cfg_sec):
+    """
+    all the names that sections specified in a command might refer to including parent and child names
+    within full names
+
+    :param list[str] _cfg_sec:
+    :rtype: set
+    """
+    sec_names = set()
+    for _sec in _cfg_sec:
+        sec_names.add(_sec)
+        sec_names.update(_sec.split('-'))
+        _sec_full = _sec.replace('-', '')
+        for i in range(1, len(_sec_full)):
+            sec_names.add(_sec_full[:i])
+            sec_names.add(_sec_full[i:])
+    return sec_names
+
+
+def _is_section_pattern(_sec):
+    return _sec.startswith('~') or '*' in _sec or '?' in _sec
+
+
+def _glob_to_regex(_sec):
+    """
+    * and ? are the only wildcards since brackets can occur in template section names
+    """
+    return ''.join('[^\n]*' if c == '*' else '[^\n]' if c == '?' else re.escape(c) for c in _sec)
+
+
+def _select_sections(_cfg_sec, nodes, nodes_by_fullname, sections_by_name, _cfg):
+    """
+    replace the glob and regex patterns among the specified sections with the names of all the matching sections;
+    globs with - are matched against the full names of the sections like the specific sections that they select
+    while those without - and the regular expressions prefixed with ~ are matched against their names;
+    all the patterns of each kind are matched together in a single pass over the names
+
+    :param list[str] _cfg_sec:
+    :param SectionTree nodes:
+    :param dict nodes_by_fullname:
+    :param dict sections_by_name:
+    :param str _cfg:
+    :rtype: list[str]
+    """
+    name_patterns = RegexDict()
+    full_name_patterns = RegexDict()
+    out_cfg_sec = []
+    for _sec in _cfg_sec:
+        if not _is_section_pattern(_sec):
+            out_cfg_sec.append(_sec)
+        elif _sec.startswith('~'):
+            name_patterns[_sec[1:]] = _sec
+        elif '-' in _sec:
+            full_name_patterns[_glob_to_regex(_sec.replace('-', ''))] = _sec
+        else:
+            name_patterns[_glob_to_regex(_sec)] = _sec
+
+    matched_sec = defaultdict(list)
+    for name, _sec in name_patterns.match_all(sections_by_name):
+        matched_sec[_sec].append(name)
 
-        if member_type is None:
-            if default_val is None:
-                if verbose:
-                    print('No type found in docstring for param {} with default as None'.format(member))
-                continue
-            # print('Deduced type {} from docstring for param {} with default as None'.format(member_type, member))
-            else:
-                member_type = type(default_val)
+    for full_name, _sec in full_name_patterns.match_all(nodes_by_fullname):
+        for _sec_id in nodes_by_fullname[full_name]:
+            _node = nodes[_sec_id]
+            if not _node.parent.is_root:
+                matched_sec[_sec].append('{}-{}'.format(_node.parent.name, _node.name))
 
-        if member_type in (int, bool, float, str, tuple, list, dict, MultiCFG, MultiPath):
+    for _sec in itertools.chain(name_patterns.values(), full_name_patterns.values()):
+        if _sec not in matched_sec:
+            raise AssertionError(f'Section {_sec} not found in {_cfg}')
+        print('Selecting section(s) matching {}: {}'.format(_sec, ', '.join(matched_sec[_sec])))
+        out_cfg_sec += matched_sec[_sec]
 
-            if root_name:
-                member_param_name = '{:s}.{:s}'.format(root_name, member)
-            else:
-                member_param_name = '{:s}'.format(member)
+    return out_cfg_sec
 
-            member_to_type[member_param_name] = member_type
 
-            # if member_type in (MultiCFG, MultiPath):
-            #     print()
+def _get_template_sec_names(_sec_name):
+    """
+    names of all the sections generated by a template section name
 
-            if hasattr(obj, 'help') and member in obj.help:
-                _help = obj.help[member]
-                if not isinstance(_help, str):
-                    _help = pformat(_help)
-            else:
-                try:
-                    _help = obj_doc_dict[member]['help']
-                except KeyError:
-                    _help = ''
+    :param str _sec_name:
+    :return: empty if this is not a template section name
+    :rtype: list[str]
+    """
+    _templ_sec_names = []
+    list_tokens = ['(', '[', ':', 'range(', 'irange(']
+    """allow a list section name specifier to be prefixed by ordinary str separated by underscore"""
+    if any(__sec_name.startswith(list_token) for __sec_name in _sec_name.split('_')
+           for list_token in list_tokens):
+        range_tokens = _sec_name.split('_')
+        """in case there are multiple ranges or lists"""
+        range_tuples = tuple(map(str_to_tuple_multi, range_tokens))
+
+        def _get_sec_names(_sec_names, _tuples, _id, _nums):
+            for _num in _tuples[_id]:
+                __nums = _nums[:]
+                __nums.append(_template_num_to_str(_num))
+                if _id < len(_tuples) - 1:
+                    _get_sec_names(_sec_names, _tuples, _id + 1, __nums)
+                else:
+                    __sec_name = '_'.join(__nums)
+                    _sec_names.append(__sec_name)
 
-                # _help = help_from_docs(obj, member)
+        _get_sec_names(_templ_sec_names, range_tuples, 0, [])
+    elif ',' in _sec_name:
+        _templ_sec_names = _sec_name.split(',')
 
-            if member_type in (tuple, list):
-                parser.add_argument('--{:s}'.format(member_param_name), type=str_to_tuple,
-                                    default=default_val, help=_help, metavar='')
-            elif member_type is dict:
-                parser.add_argument('--{:s}'.format(member_param_name), type=json.loads, default=default_val,
-                                    help=_help, metavar='')
-            elif member_type in (MultiCFG, MultiPath):
-                parser.add_argument('--{:s}'.format(member_param_name), type=member_type.process, default=default_val,
-                                    help=_help, metavar='')
-            elif member_type is str:
-                parser.add_argument('--{:s}'.format(member_param_name), type=strip_quotes, default=default_val,
-                                    help=_help, metavar='')
-            elif member_type in (int, bool, float, str):
-                parser.add_argument('--{:s}'.format(member_param_name), type=str_to_basic_type, default=default_val,
-                                    help=_help, metavar='')
-            else:
-                raise AssertionError('Something weird going on with member_type: {}'.format(member_type))
+    return _templ_sec_names
+
+
+def _expand_template_sections(_sections, sec_names=None):
+    """
+    replicate each template section along with all of its descendants for each one of its names in a single
+    recursive walk over the heading tree;
+    template IDs are numbered by the nesting depth of their sections followed by the order of their occurrence
+    so that the result is identical to expanding the templates one nesting level at a time
+
+    :param list _sections: [name, line_id, end_id, level, template_id] for each heading
+    :param set | None sec_names: only generate the sections from lazy templates whose names are in this set
+    :rtype: list
+    """
+    """children of each section in the heading tree with None as the root"""
+    children = defaultdict(list)
+    _parent_ids = []
+    for _sec_id, _sec in enumerate(_sections):
+        while _parent_ids and _sections[_parent_ids[-1]][3] >= _sec[3]:
+            _parent_ids.pop()
+        children[_parent_ids[-1] if _parent_ids else None].append(_sec_id)
+        _parent_ids.append(_sec_id)
+
+    out_sections = []
+    template_depths = []
+
+    def _add_section(_sec, _sec_name, _template_id, _child_ids, _depth):
+        if sec_names is not None and _is_lazy_template(_sec_name):
+            _matches = sorted((_pos, name) for name in sec_names
+                              for _pos in _match_template_sec_name(_sec_name, name))
+            _templ_sec_names = [name for _, name in _matches]
+            if not _templ_sec_names:
+                return
         else:
-            # parameter is itself an instance of some other parameter class so its members must
-            # be processed recursively
-            _add_params_to_parser(parser, getattr(obj, member), member_to_type, doc_dict, root_name, member,
-                                  verbose=verbose)
+            _templ_sec_names = _get_template_sec_names(_sec_name)
+        if _templ_sec_names:
+            template_depths.append(_depth)
+            _template_id = len(template_depths)
+            for k in _templ_sec_names:
+                _add_section(_sec, k, _template_id, _child_ids, _depth + 1)
+            return
 
+        out_sections.append([_sec_name, _sec[1], _sec[2], _sec[3], _template_id])
+        for _child_id in _child_ids:
+            _child_sec = _sections[_child_id]
+            _add_section(_child_sec, _child_sec[0], 0, children[_child_id], _depth)
 
-def _assign_arg(obj, arg, _id, val, member_to_type, parent_name):
+    for _sec_id in children[None]:
+        _sec = _sections[_sec_id]
+        _add_section(_sec, _sec[0], _sec[4], children[_sec_id], 0)
+
+    if not template_depths:
+        return out_sections
+
+    template_ids = sorted(range(len(template_depths)), key=lambda k: (template_depths[k], k))
+    template_ids = {k + 1: _id + 1 for _id, k in enumerate(template_ids)}
+    for _sec in out_sections:
+        if _sec[4]:
+            _sec[4] = template_ids[_sec[4]]
+
+    return out_sections
+
+
+def _fn_identity(fn):
+    """
+    identity of a function that remains the same across processes so that changing the function registered for
+    a placeholder invalidates the cached arguments;
+    the name alone is not enough since lambdas all share the same one
+
+    :param fn:
+    :rtype: tuple | str
+    """
+    code = getattr(fn, '__code__', None)
+    if code is None:
+        """e.g. operator.attrgetter whose repr shows its arguments"""
+        return repr(fn)
+    consts = [_const for _const in code.co_consts if not isinstance(_const, types.CodeType)]
+    code_hash = hashlib.sha1(code.co_code + repr(consts).encode('utf-8')).hexdigest()
+    return getattr(fn, '__module__', None), getattr(fn, '__qualname__', None), code_hash
+
+
+def get_args_cache_path(obj, member_to_type, cfg_file_list, noncfg_cmd_args, cache_dir=''):
     """
+    path of the cache file for the final arguments generated from the given cfg files and sections together with
+    the command line arguments;
+    the parameter class and the placeholders are part of the key too since the arguments depend on them
 
     :param obj:
-    :param list arg:
-    :param int _id:
-    :param val:
     :param dict member_to_type:
-    :param str parent_name:
-    :return:
+    :param list cfg_file_list:
+    :param list noncfg_cmd_args:
+    :param str cache_dir:
+    :rtype: str
     """
-    if _id >= len(arg):
-        print('Invalid arg: {} with _id: {}'.format(arg, _id))
-        return
+    obj_type = type(obj)
+    cache_key = (
+        ARGS_CACHE_VERSION,
+        '{}.{}'.format(obj_type.__module__, obj_type.__qualname__),
+        sorted((name, getattr(_type, '__name__', str(_type))) for name, _type in member_to_type.items()),
+        [(os.path.abspath(_cfg) if _cfg else _cfg, _cfg_sec, _cfg_repeat, _exclude_common_secs)
+         for _cfg, _cfg_sec, _cfg_repeat, _exclude_common_secs in cfg_file_list],
+        noncfg_cmd_args,
+        sorted((ph, _fn_identity(fn)) for ph, fn in _placeholder_fns.items()),
+    )
+    cache_key = hashlib.sha1(repr(cache_key).encode('utf-8')).hexdigest()
+    return linux_path(get_cache_dir(cache_dir), 'args', cache_key + '.cache')
+
+
+def load_args_cache(args_cache_path, cache_dir=''):
+    """
+    :param str args_cache_path:
+    :param str cache_dir:
+    :return: cached arguments or None if these are missing or any of the cfg files they were read from has changed
+    :rtype: list[str] | None
+    """
+    if not os.path.isfile(args_cache_path):
+        return None
+    try:
+        with open(args_cache_path, 'rb') as f:
+            version, args_in, cfg_signatures = pickle.load(f)
+    except BaseException as e:
+        print(f'failed to load arguments from cache: {e}')
+        return None
 
-    _arg = arg[_id]
-    obj_attr = getattr(obj, _arg)
-    obj_attr_name = '{}.{}'.format(parent_name, _arg) if parent_name else _arg
-    if obj_attr is None:
-        # _key = '--{}'.format(obj_attr_name)
-        obj_attr_type = member_to_type[obj_attr_name]
+    if version != ARGS_CACHE_VERSION:
+        return None
+
+    new_signatures = {}
+    for _cfg, signature in cfg_signatures.items():
+        new_signatures[_cfg] = _current_signature(_cfg, signature)
+        if new_signatures[_cfg] is None:
+            return None
+
+    print('Loading arguments from {:s}'.format(args_cache_path))
+    if new_signatures == cfg_signatures:
+        _touch_cache(args_cache_path)
     else:
-        obj_attr_type = type(obj_attr)
+        try:
+            _write_cache(args_cache_path, (ARGS_CACHE_VERSION, args_in, new_signatures), cache_dir=cache_dir)
+        except BaseException as e:
+            print(f'failed to write arguments to cache {args_cache_path}: {e}')
+    return args_in
 
-    if obj_attr_type in _supported_types:
-        if val == '#' or val == '__n__':
-            if isinstance(obj_attr, str):
-                # empty string
-                val = ''
-            elif isinstance(obj_attr, tuple):
-                # empty tuple
-                val = ()
-            elif isinstance(obj_attr, list):
-                # empty list
-                val = []
-            elif isinstance(obj_attr, dict):
-                # empty dict
-                val = {}
-        setattr(obj, _arg, val)
+
+def save_args_cache(args_cache_path, args_in, cfg_files, cache_dir=''):
+    """
+    :param str args_cache_path:
+    :param list[str] args_in:
+    :param set cfg_files: all the cfg files that the arguments were read from
+    :param str cache_dir:
+    """
+    try:
+        cfg_signatures = {os.path.abspath(_cfg): _file_signature(_cfg) for _cfg in cfg_files}
+        _write_cache(args_cache_path, (ARGS_CACHE_VERSION, args_in, cfg_signatures), cache_dir=cache_dir)
+    except BaseException as e:
+        print(f'failed to write arguments to cache {args_cache_path}: {e}')
+
+
+def _build_section_tree(_sections, root_sec_name):
+    """
+    :param list _sections:
+    :param str root_sec_name:
+    :return: section tree, section IDs by full name and section IDs by name
+    """
+    nodes = SectionTree(_sections, root_sec_name)
+    nodes_by_fullname, sections_by_name = _index_section_tree(nodes)
+    return nodes, nodes_by_fullname, sections_by_name
+
+
+def _index_section_tree(nodes):
+    """
+    :param SectionTree nodes:
+    :return: section IDs by full name and section IDs by name
+    """
+    nodes_by_fullname = defaultdict(list)
+    for _sec_id, full_name in enumerate(nodes.full_names):
+        nodes_by_fullname[full_name].append(_sec_id)
+    nodes_by_fullname = dict(nodes_by_fullname)
+
+    """inverted index from each section name to the IDs of all the sections with that name in ascending order"""
+    sections_by_name = defaultdict(list)
+    for _sec_id, name in enumerate(nodes.names):
+        sections_by_name[name].append(_sec_id)
+    sections_by_name = dict(sections_by_name)
+
+    return nodes_by_fullname, sections_by_name
+
+
+def read_cfg(_cfg, enable_cache=1, cache_dir=''):
+    if not _cfg:
+        return
+
+    if _cfg.endswith('.ppk'):
+        return load_cfg_pack(_cfg)
+
+    if enable_cache:
+        cfg_cache = load_cfg_cache(_cfg, cache_dir)
+        _count_cache('cfg', cfg_cache is not None)
+        if cfg_cache is not None:
+            return cfg_cache
+
+    file_args_offset = 0
+
+    file_args, heading_ids, imported_cfgs = _recursive_read(_cfg, enable_cache=enable_cache, cache_dir=cache_dir)
+
+    if not file_args[0].startswith('##'):
+        file_args.insert(0, '##')
+        file_args_offset = 1
+        heading_ids = [0, ] + [i + 1 for i in heading_ids]
+    _sections = [[file_args[i].lstrip('#').strip(), i, file_args[i].count('#') - 1, 0] for i in heading_ids]
+
+    n_file_args = len(file_args)
+    n_sections = len(_sections)
+
+    """parent specific sections"""
+    # _parent_specific_section_ids = [k[1] for k in _sections if k[0].endswith(' __')]
+    # _sections = [(k[0].rstrip(' __'), k[1], k[2], k[3]) if k[1] in _parent_specific_section_ids else k
+    #              for k in _sections]
+
+    _sections = [k if k[0] else ['__common__', k[1], k[2], k[3]] for k in _sections]
+
+    """common sections"""
+    _sections = [k if k[0] else ['__common__', k[1], k[2], k[3]] for k in _sections]
+
+    """add section end IDs as the start IDs of the next section"""
+    _sections = [[k[0], k[1], _sections[i + 1][1] if i < n_sections - 1 else n_file_args, k[2], k[3]]
+                 for i, k in enumerate(_sections)]
+
+    # """default sections
+    # """
+    # _default_sections, _default_section_ids = zip(*[
+    #     (k[0].rstrip('__').strip(), i) for i, k in enumerate(_sections) if k[0].endswith('__')])
+    # for i, j in enumerate(_default_section_ids):
+    #     k = _sections[i]
+    #     _sections[j] = (_default_sections[i], k[1], k[2])
+
+    """template sections;
+    lazy ones are only expanded for the sections that are actually included so the unexpanded sections are 
+    retained to be expanded when these become known
+    """
+    template_sections = None
+    if any(_is_lazy_template(_sec[0]) for _sec in _sections):
+        template_sections = _sections
+        _sections = _expand_template_sections(_sections, sec_names=())
     else:
-        # parameter is itself an instance of some other parameter class so its members must
-        # be processed recursively
-        _assign_arg(obj_attr, arg, _id + 1, val, member_to_type, obj_attr_name)
+        _sections = _expand_template_sections(_sections)
+
+    time_stamp = datetime.now().strftime("%y%m%d_%H%M%S")
+    root_sec_name = "__root_{}__".format(time_stamp)
+    nodes, nodes_by_fullname, sections_by_name = _build_section_tree(_sections, root_sec_name)
+
+    if enable_cache:
+        save_cfg_cache(_cfg, nodes, file_args, file_args_offset, template_sections, imported_cfgs, cache_dir)
 
+    return (nodes, nodes_by_fullname, sections_by_name, _sections, file_args, file_args_offset, root_sec_name,
+            template_sections, imported_cfgs)
 
-def _process_args_from_parser(obj, args, member_to_type):
+
+def process_dict(params, *args, **kwargs):
     """
 
-    :param obj:
-    :param Namespace args:
-    :param dict member_to_type:
+    :param dict params:
+    :param args:
+    :param kwargs:
     :return:
     """
-    # arg_prefix = ''
-    # if hasattr(obj, 'arg_prefix'):
-    #     arg_prefix = obj.arg_prefix
 
-    # optionals = parser._optionals._option_string_actions
-    # positionals = parser._positionals._option_string_actions
+    class TempObject:
+        def __init__(self, entries):
+            self.help = {}
+            self.__dict__.update(entries)
 
-    # all_params = optionals.copy()
-    # all_params.update(positionals)
+    obj = TempObject(params)
+    process(obj, *args, **kwargs)
+    params.update(obj.__dict__)
 
-    members = vars(args)
-    for key in members.keys():
-        val = members[key]
-        key_parts = key.split('.')
-        _assign_arg(obj, key_parts, 0, val, member_to_type, '')
 
+def _build_parser(obj, prog, usage, verbose, with_help=1, cache_dir=''):
+    """
+    create an argparse.ArgumentParser containing all the parameters in obj and its nested members
 
-def recursive_read(cfg, imported_cfgs=(), level=0):
-    indent = '\t' * level
-    print(f'{indent}Reading parameters from {cfg:s}')
-    file_args = [k.strip() for k in open(cfg, 'r').readlines()]
+    :param obj:
+    :param str prog:
+    :param str | None usage:
+    :param int verbose:
+    :param int with_help: add the help strings and description from the docstrings and help dicts;
+    this needs full docstring parsing and is only required for printing help
+    :param str cache_dir: folder of the persistent docstring cache
+    :rtype: (argparse.ArgumentParser, dict)
+    """
+    arg_dict = {}
+    if prog:
+        arg_dict['prog'] = prog
+    if usage is None:
+        arg_dict['usage'] = argparse.SUPPRESS
+    elif usage:
+        arg_dict['usage'] = usage
+    if with_help and hasattr(obj, 'help') and '__desc__' in obj.help:
+        arg_dict['description'] = obj.help['__desc__']
+
+    arg_dict['formatter_class'] = argparse.RawTextHelpFormatter
+
+    parser = argparse.ArgumentParser(**arg_dict)
+    member_to_type = {}
+    doc_dict = {}
+    _add_params_to_parser(parser, obj, member_to_type, doc_dict, verbose=verbose, with_help=with_help,
+                          cache_dir=cache_dir)
+
+    _save_doc_cache(cache_dir)
+
+    if not with_help:
+        return parser, member_to_type
+
+    obj_type = type(obj)
+    obj_doc_dict = doc_dict[obj_type]
+
+    try:
+        short_description, long_description = obj_doc_dict['__description__']
+    except KeyError:
+        pass
+    else:
+        if short_description is not None:
+            parser.description = short_description
+            if long_description is not None:
+                parser.description += '\n' + long_description
+        elif long_description is not None:
+            parser.description = long_description
+
+    return parser, member_to_type
+
+
+class Parser:
+    """
+    argparse schema of a parameter class that is compiled only once and can then be used to parse
+    any number of argument lists into fresh instances of that class;
+    use get_parser to obtain a cached instance for a given class
+
+    :ivar obj_type: parameter class
+    :ivar parser: argparse.ArgumentParser without any help strings
+    :ivar member_to_type: type of each parameter indexed by its full dotted name
+    :ivar defaults: default value of each parameter indexed by its full dotted name
+    :ivar setters: precompiled setter of each parameter indexed by its full dotted name
+    """
+
+    def __init__(self, obj_type, prog='', usage='%(prog)s [options]', verbose=0, cache_dir=''):
+        """
+
+        :param type obj_type:
+        :param str prog:
+        :param str | None usage:
+        :param int verbose:
+        :param str cache_dir: folder of the persistent docstring cache
+        """
+        assert inspect.isclass(obj_type), "Parser can only be compiled for a parameter class"
+
+        self.obj_type = obj_type
+        self.prog = prog
+        self.usage = usage
+        self.verbose = verbose
+        self.cache_dir = cache_dir
+        self.parser, self.member_to_type = _build_parser(obj_type(), prog, usage, verbose, with_help=0,
+                                                         cache_dir=cache_dir)
+        self._help_parser = None
+        self.defaults = {action.dest: action.default for action in self.parser._actions}
+        self.setters = {name: _get_setter(name) for name in self.member_to_type}
+        self._direct_schema = None
+
+    def get_help_parser(self):
+        """
+        parser with help strings that is created only the first time help is requested
+
+        :rtype: argparse.ArgumentParser
+        """
+        if self._help_parser is None:
+            self._help_parser, _ = _build_parser(self.obj_type(), self.prog, self.usage, self.verbose,
+                                                 cache_dir=self.cache_dir)
+        return self._help_parser
+
+    def get_direct_schema(self):
+        """
+        converters and string default fixups used by the direct assignment engine
+
+        :rtype: (dict, dict)
+        """
+        if self._direct_schema is None:
+            self._direct_schema = _get_direct_schema(self.parser)
+        return self._direct_schema
+
+    def parse(self, args_in=None, **kwargs):
+        """
+        parse arguments into a new instance of the parameter class;
+        accepts the same keyword arguments as process
+
+        :param list | None args_in:
+        :return: new instance of obj_type
+        """
+        return process(self.obj_type, args_in=args_in, compiled=self, **kwargs)
+
+
+_compiled_parsers = {}
+
+
+def get_parser(obj_type, prog='', usage='%(prog)s [options]', verbose=0, cache_dir=''):
+    """
+    compiled Parser for obj_type that is created the first time this is called for obj_type and reused thereafter
 
-    cfg_dir = os.path.dirname(cfg)
+    :param type obj_type:
+    :param str prog:
+    :param str | None usage:
+    :param int verbose:
+    :param str cache_dir: folder of the persistent docstring cache
+    :rtype: Parser
+    """
+    key = (obj_type, prog, usage, cache_dir)
+    try:
+        compiled = _compiled_parsers[key]
+    except KeyError:
+        compiled = _compiled_parsers[key] = Parser(obj_type, prog=prog, usage=usage, verbose=verbose,
+                                                   cache_dir=cache_dir)
+    return compiled
 
-    out_file_args = []
-    out_imported_cfgs = [cfg, ]
 
-    for file_arg_id, file_arg in enumerate(file_args):
-        if file_arg.startswith('%import% '):
-            _, imported_cfg_name = file_arg.split(' ')
-            imported_cfg = linux_path(cfg_dir, imported_cfg_name)
-            prev_imported_cfgs = tuple(set(imported_cfgs + tuple(out_imported_cfgs)))
+def _args_from_cfgs(cfg_file_list, cfg_cache, cache_dir=''):
+    """
+    read the included sections of all the cfg files and convert their lines into arguments
 
-            assert imported_cfg not in prev_imported_cfgs, f"circular CFG import found in {cfg}: {imported_cfg}"
+    :param list cfg_file_list: (cfg file, sections, is repeated, exclude common sections) for each cfg
+    :param int cfg_cache:
+    :param str cache_dir:
+    :return: arguments and paths of all the cfg files read including the imported ones
+    :rtype: (list[str], set)
+    """
+    cfg_files = set()
+    args_in = []
+    prev_cfg_data = []
+    for _cfg, _cfg_sec, _cfg_repeat, _exclude_common_secs in cfg_file_list:
+        if not _cfg:
+            continue
 
-            out_imported_cfgs.append(imported_cfg)
-            imported_file_args, imported_cfgs = recursive_read(
-                imported_cfg, imported_cfgs=tuple(out_imported_cfgs), level=level + 1)
-            out_file_args += imported_file_args
-            out_imported_cfgs += imported_cfgs
+        if _cfg_repeat:
+            assert prev_cfg_data, "repeat cfg found without previous cfg data: {}".format(_cfg)
+            txt = 'Processing repeat parameters from {:s}'.format(_cfg)
+            if _exclude_common_secs:
+                txt = '{} without common sections'.format(txt)
+            print(txt)
         else:
-            out_file_args.append(file_arg)
+            prev_cfg_data = read_cfg(_cfg, enable_cache=cfg_cache, cache_dir=cache_dir)
+
+            # _sections = [(k, i) for k, i in _sections]
+
+        (nodes, nodes_by_fullname, sections_by_name, _sections, _file_args, file_args_offset, root_sec_name,
+         template_sections, imported_cfgs) = prev_cfg_data
+        cfg_files.update(imported_cfgs)
+
+        # _re_sections = RegexDict({
+        #     __sec[0]: (nodes[__sec_id], __sec) for __sec_id, __sec in enumerate(_sections) if '*' in __sec[0]
+        # })
+
+        n_file_args = len(_file_args)
+
+        """remove excluded sections"""
+        excluded_cfg_sec = [_sec.lstrip('!') for _sec in _cfg_sec if _sec.startswith('!')]
+
+        if excluded_cfg_sec:
+            print('Excluding section(s):\n{}'.format(pformat(excluded_cfg_sec)))
+            excluded_cfg_sec = set(excluded_cfg_sec)
+            _cfg_sec = [_sec for _sec in _cfg_sec if _sec not in excluded_cfg_sec]
+            assert _cfg_sec, 'No included sections found for {}'.format(_cfg)
+
+        has_sec_patterns = any(_is_section_pattern(_sec) for _sec in _cfg_sec)
+
+        if template_sections is not None:
+            """generate only the sections from lazy templates that might be included;
+            all of them might be matched by glob or regex patterns"""
+            _sections = _expand_template_sections(
+                template_sections, None if has_sec_patterns else _get_requested_sec_names(_cfg_sec))
+            nodes, nodes_by_fullname, sections_by_name = _build_section_tree(_sections, root_sec_name)
+
+        if has_sec_patterns:
+            _cfg_sec = _select_sections(_cfg_sec, nodes, nodes_by_fullname, sections_by_name, _cfg)
+
+        """excluded sections are only removed from the included ones so all sections are retained here 
+        and the index of each section is also its sequence ID"""
+        section_names = [_sec[0] for _sec in _sections]
+        section_line_ids = [_sec[1] for _sec in _sections]
+        section_end_ids = [_sec[2] for _sec in _sections]
+        section_template_ids = [_sec[4] for _sec in _sections]
+        section_seq_ids = range(len(_sections))
+
+        if not _exclude_common_secs:
+            """add common sections"""
+            common_section_names = set(s for s, _sec_ids in sections_by_name.items()
+                                       if any(nodes[_sec_id].is_common for _sec_id in _sec_ids))
+            _cfg_sec += common_section_names
+
+        """unique section names"""
+        _cfg_sec = list(set(_cfg_sec))
+
+        """specific sections from full names"""
+        invalid_sec = [(_id, _sec) for _id, _sec in enumerate(_cfg_sec) if _sec not in sections_by_name]
+        specific_sec = []
+        specific_sec_ids = {}
+
+        # _node_matches = {( _id, _sec) : nodes[k] for _id, _sec in invalid_sec for k in nodes
+        #                  if nodes[k].full_name == _sec}
+        for _id, _sec in invalid_sec:
+            _sec_full = _sec.replace('-', '')
+            try:
+                _node_matches = [nodes[k] for k in nodes_by_fullname[_sec_full]]  # type: list
+            except KeyError:
+                # raise AssertionError('Section {} not found in {}'.format(
+                #     _sec, _cfg))
+                try:
+                    _orig_sec, _subs_sec = _sec.split('-', maxsplit=1)
 
-    out_imported_cfgs = tuple(set(out_imported_cfgs))
+                    """optional leading and trailing double underscores for better visible 
+                    discrimination between substitution and ordinary sections in commands 
+                    stored in syntax-highlighted markdown files"""
+                    if _subs_sec.startswith('__') and _subs_sec.endswith('__'):
+                        _subs_sec = _subs_sec.strip('__')
+                    _orig_sec_full = f'__sub__{_orig_sec}'
+                    _node_matches = [nodes[k] for k in nodes_by_fullname[_orig_sec_full]]  # type: list
 
-    return out_file_args, out_imported_cfgs
+                    assert len(_node_matches) == 1, f"multiple substitution sections found for {_sec}"
 
+                    matched_node_ = _node_matches[0]
+                    seq_id = matched_node_.seq_id
 
-def get_cfg_cache_path(_cfg):
-    _cfg_dir = os.path.dirname(_cfg)
-    _cfg_name = os.path.basename(_cfg)
+                    matched_sec_ = _sections[seq_id]
 
-    _cfg_cache_dir = linux_path(_cfg_dir, '.cache')
-    os.makedirs(_cfg_cache_dir, exist_ok=True)
+                    assert matched_sec_[0] == matched_node_.name, "substitution section name mismatch"
+                    _orig_sec_name = matched_sec_[0]
+                    assert section_names[seq_id] == matched_node_.name, "substitution section name mismatch"
 
-    cfg_cache_path = linux_path(_cfg_cache_dir, _cfg_name + '.cache')
+                    matched_node_.name = matched_sec_[0] = section_names[seq_id] = _subs_sec
 
-    return cfg_cache_path
+                    """keep the name index consistent with the substituted name"""
+                    _orig_sec_ids = sections_by_name[_orig_sec_name]
+                    _orig_sec_ids.remove(seq_id)
+                    if not _orig_sec_ids:
+                        del sections_by_name[_orig_sec_name]
+                    bisect.insort(sections_by_name.setdefault(_subs_sec, []), seq_id)
 
+                    # _sections[_node_matches[0].seq_id] = tuple(matched_sec_)
 
-def load_cfg_cache(_cfg):
-    cfg_cache_path = get_cfg_cache_path(_cfg)
+                    # matched_node_, matched_sec_ = _re_sections[_sec_full]  # type: Node, list
+                    # new_node_ = matched_node_.copy(name=_child_sec, seq_id=len(_sections))
+                    # new_sec_ = list(matched_sec_).copy()
+                    # new_sec_[0] = _child_sec
+                    # _sections.append(tuple(new_sec_))
+                    # _node_matches = [new_node_, ]
+                    print()
+                except (KeyError, ValueError):
+                    raise AssertionError(f'Section {_sec} not found in {_cfg}')
 
-    if not os.path.exists(cfg_cache_path):
-        return None
+            # curr_specific_sec = []
+            for _node in _node_matches:  # type:Node
 
-    cfg_cache_mtime = os.path.getmtime(cfg_cache_path)
-    cfg_mtime = os.path.getmtime(_cfg)
+                parent = _node.parent
+                specific_sec.append((_node.seq_id, _node.name))
+                specific_sec_ids[_node.seq_id] = 0
 
-    if cfg_mtime > cfg_cache_mtime:
-        return None
+                if parent.seq_id is not None:
+                    specific_sec.append((parent.seq_id, parent.name))
+                    specific_sec_ids[parent.seq_id] = 1
 
-    try:
-        print('Loading cfg data from {:s}'.format(cfg_cache_path))
-        with open(cfg_cache_path, 'rb') as f:
-            cache_data = pickle.load(f)
-        nodes, nodes_by_fullname, _sections, file_args, file_args_offset, root_sec_name, imported_cfgs = cache_data
-    except BaseException as e:
-        print(f'failed to load cfg data from cache: {e}')
-        return None
-    else:
-        for imported_cfg in imported_cfgs:
-            imported_cfg_mtime = os.path.getmtime(imported_cfg)
-            if imported_cfg_mtime > cfg_cache_mtime:
-                return None
+                # if _node.parent.template_id:
+                #     shared_parents = template_nodes[_node.parent.template_id]
+                # else:
+                #     shared_parents = [_node.parent, ]
+                #
+                # for parent in shared_parents:
+                #     specific_sec.append((parent.seq_id, parent.name))
+                #     specific_sec_ids.append(parent.seq_id)
+
+                # _sec_matches = []
+                # _curr_sec_node = _node
+                # while _curr_sec_node.parent is not None:
+                #     _sec_matches.append((_curr_sec_node.seq_id, _curr_sec_node.name))
+                #     _curr_sec_node = _curr_sec_node.parent
+                # specific_sec += _sec_matches[::-1]
+            # specific_sec[_sec] = curr_specific_sec
+
+            _cfg_sec[_id] = ''
+
+        # valid_check = [_sec in sections for _sec in _cfg_sec]
+        # assert all(valid_check), \
+        #     'One or more sections: {} from:\n{}\nnot found in cfg file {} with sections:\n{}'.format(
+        #         [_sec for _sec in _cfg_sec if _sec not in sections],
+        #         pformat(_cfg_sec), _cfg, pformat(sections))
+
+        """all occurrences of each section
+        """
+        _cfg_sec_ids = [sections_by_name.get(_sec, ()) if _sec else () for _sec in _cfg_sec]
 
-        return nodes, nodes_by_fullname, _sections, file_args, file_args_offset, root_sec_name
+        # _cfg_sec_ids = [item for sublist in _cfg_sec_ids for item in sublist]
 
-    # cfg_cache_mtime_local = time.ctime(cfg_cache_mtime)
-    # cfg_mtime_local = time.ctime(cfg_mtime)
-    # print('cfg_cache_mtime_local: {}'.format(cfg_cache_mtime_local))
-    # print('cfg_mtime_local: {}'.format(cfg_mtime_local))
+        """flatten
+        """
+        __cfg_sec_ids = []
+        __cfg_sec = []
+        is_included = defaultdict(bool)
+        for _sec, _sec_ids in zip(_cfg_sec, _cfg_sec_ids):
+            for _sec_id in _sec_ids:
+                __cfg_sec.append(_sec)
+                __cfg_sec_ids.append(_sec_id)
+                is_included[section_seq_ids[_sec_id]] = True
 
+        _cfg_sec_disp = []
+        valid_cfg_sec = []
+        skipped_cfg_sec = []
+        skipped_parent_seq_ids = set()
+        _sec_args = []
+        valid_parent_names = [root_sec_name, ]
+        valid_parent_seq_ids = {None, }
+        _common_str = ''
 
-def read_cfg(_cfg, enable_cache=1):
-    if not _cfg:
-        return
+        for _sec_id, x in specific_sec:
+            __cfg_sec_ids.append(_sec_id)
+            is_included[section_seq_ids[_sec_id]] = True
+            __cfg_sec.append(x)
 
-    if enable_cache:
-        cfg_cache = load_cfg_cache(_cfg)
-        if cfg_cache is not None:
-            return cfg_cache
+        # n_sections = len(sections)
 
-    file_args_offset = 0
+        """sort by line and process each cfg section
+        """
+        __cfg_sec_sorted = sorted(zip(__cfg_sec_ids, __cfg_sec))
 
-    file_args, imported_cfgs = recursive_read(_cfg)
+        # __cfg_seq_ids = [section_seq_ids[k[0]] for k in __cfg_sec_sorted]
 
-    if not file_args[0].startswith('##'):
-        file_args.insert(0, '##')
-        file_args_offset = 1
-    _sections = [[k.lstrip('#').strip(), i, k.count('#') - 1, 0]
-                 for i, k in enumerate(file_args) if k.startswith('##')]
+        for _sec_id, x in __cfg_sec_sorted:
 
-    n_file_args = len(file_args)
-    n_sections = len(_sections)
+            _curr_sec_seq_id = section_seq_ids[_sec_id]
+            _curr_sec_node = nodes[_curr_sec_seq_id]  # type: Node
 
-    """parent specific sections"""
-    # _parent_specific_section_ids = [k[1] for k in _sections if k[0].endswith(' __')]
-    # _sections = [(k[0].rstrip(' __'), k[1], k[2], k[3]) if k[1] in _parent_specific_section_ids else k
-    #              for k in _sections]
+            _curr_sec_parent_name = _curr_sec_node.parent.name
+            _curr_sec_parent_seq_id = _curr_sec_node.parent.seq_id
 
-    _sections = [k if k[0] else ['__common__', k[1], k[2], k[3]] for k in _sections]
+            _curr_sec_seq_id = _curr_sec_node.seq_id
+            _curr_sec_name = section_names[_sec_id]
 
-    """common sections"""
-    _sections = [k if k[0] else ['__common__', k[1], k[2], k[3]] for k in _sections]
+            assert _curr_sec_name == _curr_sec_node.name, "curr_sec_node name mismatch"
 
-    """add section end IDs as the start IDs of the next section"""
-    _sections = [[k[0], k[1], _sections[i + 1][1] if i < n_sections - 1 else n_file_args, k[2], k[3]]
-                 for i, k in enumerate(_sections)]
+            if _curr_sec_parent_seq_id not in valid_parent_seq_ids:
+                # if _sec_id in specific_sec_ids and specific_sec_ids[_sec_id] == 0:
+                #     raise AssertionError('Specific section {} not found'.format(_curr_sec_ancestral_path))
+                # print('skipping section {}'.format(_curr_sec_ancestral_path))
+                if _curr_sec_parent_seq_id in skipped_parent_seq_ids:
+                    skipped_cfg_sec.append(x)
+                    skipped_parent_seq_ids.add(_curr_sec_seq_id)
+                continue
 
-    # """default sections
-    # """
-    # _default_sections, _default_section_ids = zip(*[
-    #     (k[0].rstrip('__').strip(), i) for i, k in enumerate(_sections) if k[0].endswith('__')])
-    # for i, j in enumerate(_default_section_ids):
-    #     k = _sections[i]
-    #     _sections[j] = (_default_sections[i], k[1], k[2])
+            if _curr_sec_name == '__exc__':
+                """exclusive sibling section"""
+                included_siblings = [(_node.seq_id, _node.name) for _node in _curr_sec_node.parent.children
+                                     if is_included[_node.seq_id] and _node.seq_id != _curr_sec_seq_id]
+                if included_siblings:
+                    assert len(included_siblings) == 1, \
+                        "multiple included siblings for " \
+                        "exclusive section with parent {},{} :: {}".format(
+                            _curr_sec_parent_seq_id, _curr_sec_parent_name, included_siblings)
+                    print('skipping exclusive section {} with parent {},{} due to included sibling: {}'.format(
+                        _curr_sec_seq_id, _curr_sec_parent_seq_id, _curr_sec_parent_name, included_siblings[0]
+                    ))
+                    skipped_cfg_sec.append(x)
+                    skipped_parent_seq_ids.add(_curr_sec_seq_id)
+                    continue
 
-    """template sections"""
-    _curr_template_id = 1
-    # _sec_id_orig = _sec_id_temp = 0
-    # for i, _sec in enumerate(_sections):
-    _all_temp_sections = {}
-    pass_id = 0
-    while True:
+            ancestors = _curr_sec_node.get_ancestors()
+            _curr_sec_ancestral_path = ':'.join([ancestor.name for ancestor in ancestors[::-1]
+                                                 if ancestor.name not in common_section_names] +
+                                                [_curr_sec_name, ])
 
-        n_sections = len(_sections)
-        curr_root = Node()
-        temp_nodes = {}  # :type dict(tuple, Node)
-        _find_children(temp_nodes, None, _sections, 0, 0, curr_root, n_sections)
-
-        _temp_sections = []
-        # _added_sections = {}
-        found_new_sections = 0
-        for i, _sec in enumerate(_sections):
-            # if _sec_id_temp >= len(_temp_sections):
-            #     if _sec_id_orig >= len(_sections):
-            #         break
-            #     else:
-            #         _sec = _sections[_sec_id_orig]
-            #         _sec_id_orig += 1
-            # else:
-            #     _sec = _temp_sections[_sec_id_temp]
-            #     _sec_id_temp += 1
+            assert x == _curr_sec_name, "mismatch between x: {} and _curr_sec_name: {}".format(x, _curr_sec_name)
 
-            # if (_sec[1], _sec[2]) in _added_sections:
-            #     """this section has already been added as a descendant of a previous template section
+            valid_parent_seq_ids.add(_curr_sec_seq_id)
+            valid_parent_names.append(x)
+            valid_cfg_sec.append(x)
+
+            _start_id = section_line_ids[_sec_id] + 1
+            _template_id = section_template_ids[_sec_id]
+
+            # if _template_id:
+            #     """template sections with the same ID all have same line IDs so look for the
+            #     first subsequent section with different ID that is not an ancestor;
             #     """
-            #     continue
-            # _added_sections[(_sec[1], _sec[2])] = 1
+            #     _end_id = n_file_args
+            #     _next_sec_id = None
+            #     # ancestors = _curr_sec_node.get_ancestors()
+            #     # ancestor_template_ids = [ancestor.template_id for ancestor in ancestors]
+            #     for i in range(_sec_id + 1, n_sections):
+            #         if section_template_ids[i] != _template_id and section_line_ids[i] > _start_id:
+            #             _next_node = nodes[section_seq_ids[i]]
+            #             _next_template_id = section_template_ids[i]
+            #             _end_id = section_line_ids[i]
+            #             _next_sec_id = i
+            #             break
+            # else:
+            #     _end_id = section_line_ids[_sec_id + 1] if _sec_id < n_sections - 1 else n_file_args
+
+            _end_id = section_end_ids[_sec_id]
+
+            # discard empty and comment lines from start of section
+            orig_start_id = _start_id
+            while _start_id < n_file_args:
+                if _file_args[_start_id] and not _file_args[_start_id].startswith('#'):
+                    # if _file_args[_start_id - 1]:
+                    break
+                _start_id += 1
+
+            # discard empty and comment lines from end of section
+            orig_end_id = _end_id
+            while _end_id >= 0:
+                if _file_args[_end_id - 1] and not _file_args[_end_id - 1].startswith('#'):
+                    # if _file_args[_end_id - 1]:
+                    break
+                _end_id -= 1
+
+            if _start_id >= _end_id:
+                if x not in common_section_names:
+                    # print('skipping empty section {} ({}, {})'.format(x, orig_start_id, orig_end_id))
+                    assert orig_start_id == orig_end_id, "invalid empty section {} ({}, {})".format(
+                        x, orig_start_id, orig_end_id)
+                continue
 
-            _sec_name = _sec[0]
+            _curr_sec_args = _file_args[_start_id:_end_id]
 
-            prelim_node = temp_nodes[i]
+            """placeholders can only occur in lines with either % or __"""
+            _sub_placeholder = _get_placeholder_sub(_curr_sec_node)
+            _curr_sec_args = [_placeholder_re.sub(_sub_placeholder, _arg) if '%' in _arg or '__' in _arg
+                              else _arg for _arg in _curr_sec_args]
 
-            if prelim_node.added:
-                """this section has already been added in this pass as a descendant of a 
-                previous template section
-                """
-                continue
+            _sec_args += _curr_sec_args
 
-            prelim_node.added = 1
+            start_line_num = _start_id + 1 - file_args_offset
+            end_line_num = _end_id - file_args_offset
 
-            """range based section names
-            """
-            _templ_sec_names = []
-            # any(map(_sec_name.startswith, ['(', '[', 'range(', 'irange(']))
-            list_tokens = ['(', '[', ':', 'range(', 'irange(']
-            """allow a list section name specifier to be prefixed by ordinary str separated by underscore"""
-            if any(__sec_name.startswith(list_token)  for __sec_name in _sec_name.split('_')
-                   for list_token in list_tokens):
-            # if any(list_token in _sec_name for list_token in list_tokens):
-                # assert ',' not in _sec_name, \
-                #     "Combining template and range sections is not supported currently"
-                """in case there are multiple ranges or lists"""
-                # in_range_sec_names = _sec_name.split('+')
-                # for in_range_sec_name in in_range_sec_names:
-                in_range_sec_name = _sec_name
-                range_tokens = in_range_sec_name.split('_')
-                """in case there are multiple ranges or lists"""
-                range_tuples = tuple(map(str_to_tuple_multi, range_tokens))
-
-                def _get_sec_names(_sec_names, _tuples, _id, _nums):
-                    for _num in _tuples[_id]:
-                        __nums = _nums[:]
-                        if isinstance(_num, str):
-                            __nums.append(_num)
-                        else:
-                            if _num < 0:
-                                __nums.append('n' + str(abs(_num)))
-                            else:
-                                __nums.append(str(_num))
-                        if _id < len(_tuples) - 1:
-                            _get_sec_names(_sec_names, _tuples, _id + 1, __nums)
-                        else:
-                            __sec_name = '_'.join(__nums)
-                            _sec_names.append(__sec_name)
+            if x not in common_section_names:
 
-                _out_range_sec_names = []
-                _get_sec_names(_out_range_sec_names, range_tuples, 0, [])
-                _templ_sec_names += _out_range_sec_names
-            elif ',' in _sec_name:
-                _templ_sec_names = _sec_name.split(',')
+                # if _sec_id in specific_sec_ids and not _curr_sec_node.parent.is_root:
+                #     _sec_disp_name = _curr_sec_full_name
+                # # elif not _curr_sec_node.parent.is_root:
+                # #     _sec_disp_name = '{}:{}'.format(_curr_sec_parent_name, _curr_sec_name)
+                # else:
+                #     _sec_disp_name = _curr_sec_ancestral_path
 
-            if not _templ_sec_names:
-                _temp_sections.append(_sec)
-                continue
+                _sec_disp_name = _curr_sec_ancestral_path
 
-            found_new_sections = 1
-            descendants = prelim_node.get_descendants()
-            if descendants:
-                # def is_template(__sec_name):
-                #     return __sec_name.startswith('(') or __sec_name.startswith(
-                #         '[') or ':' in __sec_name or \
-                #            __sec_name.startswith('range(') or __sec_name.startswith(
-                #         'irange(') or ',' in __sec_name
-
-                for k_id, k in enumerate(_templ_sec_names):
-                    _temp_sections.append([k, _sec[1], _sec[2], _sec[3], _curr_template_id])
-                    for descendant in descendants:  # type: Node
-                        _temp_sections.append(
-                            [descendant.name, descendant.line_id, descendant.end_id, descendant.curr_level, 0])
-                        descendant.added = 1
-                        # if k_id == 0:
-                        #     # assert not is_template(descendant.name), \
-                        #     #     f"template section: {descendant.name} used as a descendant of " \
-                        #     #         f"another: {_sec_name}"
-                        #     _added_sections[(descendant.line_id, descendant.curr_level)] = 1
+                _str = '{}: {}'.format(_sec_disp_name, start_line_num)
+                if end_line_num > start_line_num:
+                    _str = '{} -> {}'.format(_str, end_line_num)
+                _cfg_sec_disp.append(_str)
             else:
-                _temp_sections += [[k, _sec[1], _sec[2], _sec[3], _curr_template_id] for k in _templ_sec_names]
-            _curr_template_id += 1
+                _str = '{}'.format(start_line_num)
+                if end_line_num > start_line_num:
+                    _str = '{} -> {}'.format(_str, end_line_num)
+                _common_str = '{}, {}'.format(_common_str, _str) if _common_str else _str
 
-        if not found_new_sections:
-            break
+            # print(_str)
+            # pass
 
-        _sections = _temp_sections
-        _all_temp_sections[pass_id] = _temp_sections
-        pass_id += 1
+        _known_cfg_sec = set(valid_cfg_sec).union(skipped_cfg_sec)
+        invalid_cfg_sec = [k for k in __cfg_sec if k and k not in _known_cfg_sec]
+        if invalid_cfg_sec:
+            raise AssertionError('Invalid cfg sections provided for {}:\n {}'.format(_cfg, invalid_cfg_sec))
 
-    time_stamp = datetime.now().strftime("%y%m%d_%H%M%S")
-    root_sec_name = "__root_{}__".format(time_stamp)
-    curr_root = Node(root_sec_name)
-    n_sections = len(_sections)
-    nodes = {}  # :type dict(tuple, Node)
-    nodes_by_fullname = defaultdict(list)
-    _find_children(nodes, nodes_by_fullname, _sections, 0, 0, curr_root, n_sections)
+        if _common_str:
+            _common_str = 'common: {}'.format(_common_str)
+            _cfg_sec_disp.append(_common_str)
 
-    nodes_by_fullname = dict(nodes_by_fullname)
+        print('\t{}'.format(
+            '\n\t'.join(_cfg_sec_disp)
+            # pformat(_cfg_sec_disp)
+        ))
 
-    if enable_cache:
-        cfg_cache_path = get_cfg_cache_path(_cfg)
-        with open(cfg_cache_path, 'wb') as f:  # Python 3: open(..., 'wb')
-            pickle.dump([nodes, nodes_by_fullname, _sections,
-                         file_args, file_args_offset, root_sec_name, imported_cfgs], f)
+        file_args = [arg.strip() for arg in _sec_args if arg.strip()]
+        # lines starting with # in the cfg file are comments or section headings and thus ignored
+        file_args = ['--{:s}'.format(arg) for arg in file_args if not arg.startswith('#')]
+        args_in += file_args
 
-    return nodes, nodes_by_fullname, _sections, file_args, file_args_offset, root_sec_name
+        # reset prefix before next cfg file
+        args_in.append('@')
 
+    return args_in, cfg_files
 
-def process_dict(params, *args, **kwargs):
+
+def _normalize_args(args_in, member_to_type, allow_unknown):
     """
+    expand prefixes, incremental values and comma-separated names in the raw arguments
+    and discard the ones with empty values
 
-    :param dict params:
-    :param args:
-    :param kwargs:
-    :return:
+    :param list[str] args_in:
+    :param dict member_to_type:
+    :param int allow_unknown:
+    :rtype: list[str]
     """
+    help_mode = ''
+    args_in = [k if k.startswith('--') or k == '-h' else '--{}'.format(k) for k in args_in]
+
+    # pf: Prefix to be added to all subsequent arguments to avoid very long argument names
+    # for deeply nested module parameters:
+    # with pf=name1.name2
+    # @name: pf=name
+    # @@name: pf=name1.name2.name
+    # @@@name: pf=name1.name
+
+    _args_in = []
+    _args_dict = {}
+    pf = ''
+    for _id, _arg in enumerate(args_in):
+        if _arg in ('--h', '-h', '--help'):
+            help_mode = _arg
+            continue
 
-    class TempObject:
-        def __init__(self, entries):
-            self.help = {}
-            self.__dict__.update(entries)
+        _arg = _arg[2:]
+        suspend_pf = 0
+        if _arg.startswith('@'):
+            _name = _arg[1:].strip()
 
-    obj = TempObject(params)
-    process(obj, *args, **kwargs)
-    params.update(obj.__dict__)
+            if '=' in _name:
+                if _name.startswith('@@'):
+                    pf_id = '@@'
+                elif _name.startswith('@'):
+                    pf_id = '@'
+                else:
+                    pf_id = ''
+                _pf = _get_pf(pf_id, pf)
+                _name = _name.lstrip('@')
+                if _pf:
+                    _arg = '{}.{}'.format(_pf, _name)
+                else:
+                    _arg = _name
+                suspend_pf = 1
+            else:
+                pf = _get_pf(_name, pf)
+                continue
+
+        if '+=' in _arg:
+            try:
+                _name, _val = _arg.split('+=')
+            except ValueError as e:
+                raise ValueError('Invalid argument provided: {} :: {}'.format(_arg, e))
+            if pf and not suspend_pf:
+                _name = '{}.{}'.format(pf, _name)
+
+            if ',' in _name:
+                _names_recursive = []
+                _recursive_append(_name, _names_recursive)
+
+                # print('{} --> {}'.format(_name, _names_recursive))
+                # print('')
+            else:
+                _names_recursive = [_name, ]
+
+            for __name in _names_recursive:
+                __val = _val
+                try:
+                    arg_type = member_to_type[__name]
+                except KeyError:
+                    msg = 'Invalid param name {} in argument {}'.format(__name, _arg)
+                    if allow_unknown:
+                        print(msg)
+                    else:
+                        raise ValueError(msg)
+                else:
+                    assert arg_type in (tuple, list, MultiPath, MultiCFG), \
+                        "incremental value specification found for argument {} of invalid type: {}".format(
+                            __name, arg_type)
+                    try:
+                        old_val = _args_dict[__name]
+                    except KeyError:
+                        pass
+                        # print('Accumulative value provided for uninitialized arg: {} :: {}'.format(
+                        #     __name, _arg))
+                    else:
+                        if arg_type is MultiPath:
+                            sep = '_'
+                        elif arg_type is MultiCFG:
+                            sep = '::'
+                        else:
+                            sep = ','
+                        __val = '{}{}{}'.format(old_val, sep, _val)
+                _args_in.append('--{}={}'.format(__name, __val))
+                _args_dict[__name] = __val
+        else:
+            try:
+                _name, _val = _arg.split('=')
+            except ValueError as e:
+                raise ValueError('Invalid argument provided: {} :: {}'.format(_arg, e))
+            if pf:
+                _name = '{}.{}'.format(pf, _name)
+
+            if ',' in _name:
+                _names_recursive = []
+                _recursive_append(_name, _names_recursive)
+
+                # print('{} --> {}'.format(_name, _names_recursive))
+                # print('')
+            else:
+                _names_recursive = [_name, ]
+
+            _args_in += ['--{}={}'.format(__name, _val) for __name in _names_recursive]
+            _args_dict.update({__name: _val for __name in _names_recursive})
+
+    args_in = _args_in
+
+    _args_in = []
+    for _arg_str in args_in:
+        _name, _val = _arg_str.split('=')
+        if not _val or _val.startswith('#'):
+            continue
+        _args_in.append(_arg_str)
+
+    args_in = _args_in
+    if help_mode:
+        args_in.insert(0, help_mode)
+
+    return args_in
 
 
 def process(obj, args_in=None, cmd=True, cfg='', cfg_root='', cfg_ext='',
             cfg_prefix='', cfg_suffix='',
             prog='', usage='%(prog)s [options]', allow_unknown=0, cfg_cache=1,
-            cmd_args=None, verbose=0):
+            cmd_args=None, verbose=0, compiled=None, direct=0, args_cache=0, cache_dir=''):
     """
 
     :param obj:
@@ -1321,6 +4216,13 @@ def process(obj, args_in=None, cmd=True, cfg='', cfg_root='', cfg_ext='',
     :param str | None usage:
     :param int allow_unknown:
     :param int cfg_cache:
+    :param Parser | None compiled: precompiled parser for the type of obj to be used instead of creating a new one;
+    prog and usage are ignored if this is provided
+    :param int direct: convert and assign only the supplied arguments without parsing them through argparse;
+    argparse is still used in help mode or if any of the arguments cannot be handled directly
+    :param int args_cache: cache the final arguments generated from the cfg files and the command line so that
+    these can be reused as long as none of the cfg files, including the imported ones, change
+    :param str cache_dir: folder for the cfg and argument caches, defaults to the one returned by get_cache_dir
     :return:
     """
 
@@ -1329,37 +4231,16 @@ def process(obj, args_in=None, cmd=True, cfg='', cfg_root='', cfg_ext='',
         class_input = True
         obj = obj()
 
-    arg_dict = {}
-    if prog:
-        arg_dict['prog'] = prog
-    if usage is None:
-        arg_dict['usage'] = argparse.SUPPRESS
-    elif usage:
-        arg_dict['usage'] = usage
-    if hasattr(obj, 'help') and '__desc__' in obj.help:
-        arg_dict['description'] = obj.help['__desc__']
-
-    arg_dict['formatter_class'] = argparse.RawTextHelpFormatter
-
-    parser = argparse.ArgumentParser(**arg_dict)
-    member_to_type = {}
-    doc_dict = {}
-    _add_params_to_parser(parser, obj, member_to_type, doc_dict, verbose=verbose)
-
-    obj_type = type(obj)
-    obj_doc_dict = doc_dict[obj_type]
-
-    try:
-        short_description, long_description = obj_doc_dict['__description__']
-    except KeyError:
-        pass
+    if compiled is None:
+        parser, member_to_type = _build_parser(obj, prog, usage, verbose, with_help=0, cache_dir=cache_dir)
+        defaults = setters = None
     else:
-        if short_description is not None:
-            parser.description = short_description
-            if long_description is not None:
-                parser.description += '\n' + long_description
-        elif long_description is not None:
-            parser.description = long_description
+        assert type(obj) is compiled.obj_type, \
+            "compiled parser for {} cannot be used with {}".format(compiled.obj_type, type(obj))
+        parser, member_to_type, defaults, setters = (
+            compiled.parser, compiled.member_to_type, compiled.defaults, compiled.setters)
+
+    cfg_from_cmd = None
 
     if args_in is None:
         if cmd_args is None:
@@ -1371,7 +4252,6 @@ def process(obj, args_in=None, cmd=True, cfg='', cfg_root='', cfg_ext='',
                     cmd_args = cmd_args[1:]
 
         argv_id = 0
-        cfg_from_cmd = None
 
         if not cfg:
             # check for cfg files specified at command line
@@ -1416,29 +4296,42 @@ def process(obj, args_in=None, cmd=True, cfg='', cfg_root='', cfg_ext='',
             # _cfg = _cfg.replace('-', '')
 
             _cfg = _cfg.split(':')
+
+            if _cfg[0] == 'pack' and len(_cfg) > 1 and _cfg[1].endswith('.ppk'):
+                """explicit pack:<pack file> scheme that reads the common sections of the pack by default"""
+                _cfg = _cfg[1:2] + (_cfg[2:] or ['__common__', ])
+
             _cfg_sec = [k for k in list(_cfg[1:]) if k]
             _cfg = _cfg[0]
 
-            """optional leading and trailing underscores for better visible discrimination between
-             cfg files and sections in commands stored in syntax-highlighted markdown files"""
-            if _cfg.startswith('_') and _cfg.endswith('_'):
-                _cfg = _cfg.strip('_')
+            if _cfg.endswith('.ppk'):
+                """cfg packs created by paramparse pack are specified by their paths as they are"""
+                if not os.path.isfile(_cfg):
+                    raise IOError('cfg pack does not exist: {:s}'.format(linux_path(os.path.abspath(_cfg))))
+            else:
+                """optional leading and trailing underscores for better visible discrimination between
+                 cfg files and sections in commands stored in syntax-highlighted markdown files"""
+                if _cfg.startswith('_') and _cfg.endswith('_'):
+                    _cfg = _cfg.strip('_')
 
-            if cfg_prefix:
-                _cfg = f'{cfg_prefix}-{_cfg}'
+                if cfg_prefix:
+                    _cfg = f'{cfg_prefix}-{_cfg}'
 
-            if cfg_suffix:
-                _cfg = f'{_cfg}-{cfg_suffix}'
+                if cfg_suffix:
+                    _cfg = f'{_cfg}-{cfg_suffix}'
 
-            if cfg_ext:
-                _cfg = f'{_cfg}.{cfg_ext}'
+                if cfg_ext:
+                    _cfg = f'{_cfg}.{cfg_ext}'
 
-            if cfg_root:
-                _cfg = linux_path(cfg_root, _cfg)
+                if cfg_root:
+                    _cfg = linux_path(cfg_root, _cfg)
 
-            if not os.path.isfile(_cfg):
                 if _cfg:
-                    raise IOError('cfg file does not exist: {:s}'.format(linux_path(os.path.abspath(_cfg))))
+                    """gzip-compressed cfg files and those inside zip archives are also supported"""
+                    _cfg_path = _find_cfg(_cfg)
+                    if _cfg_path is None:
+                        raise IOError('cfg file does not exist: {:s}'.format(linux_path(os.path.abspath(_cfg))))
+                    _cfg = _cfg_path
             repeated_cfgs = []
 
             repeated_sec_ids = [__sec_id for __sec_id, __sec in enumerate(_cfg_sec) if '+' in __sec]
@@ -1481,527 +4374,54 @@ def process(obj, args_in=None, cmd=True, cfg='', cfg_root='', cfg_ext='',
             cfg_file_list.append((_cfg, _cfg_sec, 0, 0))
             cfg_file_list += repeated_cfgs
 
-        """process each cfg file and its sections"""
-        args_in = []
-        prev_cfg_data = []
-        for _cfg, _cfg_sec, _cfg_repeat, _exclude_common_secs in cfg_file_list:
-            if not _cfg:
-                continue
-
-            if _cfg_repeat:
-                assert prev_cfg_data, "repeat cfg found without previous cfg data: {}".format(_cfg)
-                txt = 'Processing repeat parameters from {:s}'.format(_cfg)
-                if _exclude_common_secs:
-                    txt = '{} without common sections'.format(txt)
-                print(txt)
-            else:
-                prev_cfg_data = read_cfg(_cfg, enable_cache=cfg_cache)
-
-                # _sections = [(k, i) for k, i in _sections]
-
-            nodes, nodes_by_fullname, _sections, _file_args, file_args_offset, root_sec_name = prev_cfg_data
-
-            # _re_sections = RegexDict({
-            #     __sec[0]: (nodes[__sec_id], __sec) for __sec_id, __sec in enumerate(_sections) if '*' in __sec[0]
-            # })
-
-            n_file_args = len(_file_args)
-
-            """remove excluded sections"""
-            excluded_cfg_sec = [_sec.lstrip('!') for _sec in _cfg_sec if _sec.startswith('!')]
-            section_names, section_line_ids, section_end_ids, section_seq_ids, section_template_ids = map(
-                list, zip(
-                    *[(_sec[0], _sec[1], _sec[2], i, _sec[4]) for i, _sec in enumerate(_sections)
-                      if _sec not in excluded_cfg_sec]))
-
-            if excluded_cfg_sec:
-                print('Excluding section(s):\n{}'.format(pformat(excluded_cfg_sec)))
-                _cfg_sec = [_sec for _sec in _cfg_sec if _sec not in excluded_cfg_sec]
-                assert _cfg_sec, 'No included sections found for {}'.format(_cfg)
-
-            if not _exclude_common_secs:
-                """add common sections"""
-                common_section_names = [s for __i, s in enumerate(section_names) if
-                                        nodes[section_seq_ids[__i]].is_common]
-                _cfg_sec += common_section_names
-
-            """unique section names"""
-            _cfg_sec = list(set(_cfg_sec))
-
-            """specific sections from full names"""
-            invalid_sec = [(_id, _sec) for _id, _sec in enumerate(_cfg_sec) if _sec not in section_names]
-            specific_sec = []
-            specific_sec_ids = {}
-
-            # _node_matches = {( _id, _sec) : nodes[k] for _id, _sec in invalid_sec for k in nodes
-            #                  if nodes[k].full_name == _sec}
-            for _id, _sec in invalid_sec:
-                _sec_full = _sec.replace('-', '')
-                try:
-                    _node_matches = nodes_by_fullname[_sec_full]  # type: list
-                except KeyError:
-                    # raise AssertionError('Section {} not found in {}'.format(
-                    #     _sec, _cfg))
-                    try:
-                        _orig_sec, _subs_sec = _sec.split('-', maxsplit=1)
-
-                        """optional leading and trailing double underscores for better visible 
-                        discrimination between substitution and ordinary sections in commands 
-                        stored in syntax-highlighted markdown files"""
-                        if _subs_sec.startswith('__') and _subs_sec.endswith('__'):
-                            _subs_sec = _subs_sec.strip('__')
-                        _orig_sec_full = f'__sub__{_orig_sec}'
-                        _node_matches = nodes_by_fullname[_orig_sec_full]  # type: list
-
-                        assert len(_node_matches) == 1, f"multiple substitution sections found for {_sec}"
-
-                        matched_node_ = _node_matches[0]
-                        seq_id = matched_node_.seq_id
-
-                        matched_sec_ = _sections[seq_id]
-
-                        assert matched_sec_[0] == matched_node_.name, "substitution section name mismatch"
-                        assert section_names[seq_id] == matched_node_.name, "substitution section name mismatch"
-
-                        matched_node_.name = matched_sec_[0] = section_names[seq_id] = _subs_sec
-
-                        # _sections[_node_matches[0].seq_id] = tuple(matched_sec_)
-
-                        # matched_node_, matched_sec_ = _re_sections[_sec_full]  # type: Node, list
-                        # new_node_ = matched_node_.copy(name=_child_sec, seq_id=len(_sections))
-                        # new_sec_ = list(matched_sec_).copy()
-                        # new_sec_[0] = _child_sec
-                        # _sections.append(tuple(new_sec_))
-                        # _node_matches = [new_node_, ]
-                        print()
-                    except KeyError:
-                        raise AssertionError(f'Section {_sec} not found in {_cfg}')
-
-                # curr_specific_sec = []
-                for _node in _node_matches:  # type:Node
-
-                    parent = _node.parent
-                    specific_sec.append((_node.seq_id, _node.name))
-                    specific_sec_ids[_node.seq_id] = 0
-
-                    if parent.seq_id is not None:
-                        specific_sec.append((parent.seq_id, parent.name))
-                        specific_sec_ids[parent.seq_id] = 1
-
-                    # if _node.parent.template_id:
-                    #     shared_parents = template_nodes[_node.parent.template_id]
-                    # else:
-                    #     shared_parents = [_node.parent, ]
-                    #
-                    # for parent in shared_parents:
-                    #     specific_sec.append((parent.seq_id, parent.name))
-                    #     specific_sec_ids.append(parent.seq_id)
-
-                    # _sec_matches = []
-                    # _curr_sec_node = _node
-                    # while _curr_sec_node.parent is not None:
-                    #     _sec_matches.append((_curr_sec_node.seq_id, _curr_sec_node.name))
-                    #     _curr_sec_node = _curr_sec_node.parent
-                    # specific_sec += _sec_matches[::-1]
-                # specific_sec[_sec] = curr_specific_sec
-
-                _cfg_sec[_id] = ''
-
-            # valid_check = [_sec in sections for _sec in _cfg_sec]
-            # assert all(valid_check), \
-            #     'One or more sections: {} from:\n{}\nnot found in cfg file {} with sections:\n{}'.format(
-            #         [_sec for _sec in _cfg_sec if _sec not in sections],
-            #         pformat(_cfg_sec), _cfg, pformat(sections))
-
-            """all occurrences of each section
-            """
-            _cfg_sec_ids = [[i for i, x in enumerate(section_names) if _sec and x == _sec] for _sec in _cfg_sec]
-
-            # _cfg_sec_ids = [item for sublist in _cfg_sec_ids for item in sublist]
-
-            """flatten
-            """
-            __cfg_sec_ids = []
-            __cfg_sec = []
-            is_included = defaultdict(bool)
-            for _sec, _sec_ids in zip(_cfg_sec, _cfg_sec_ids):
-                for _sec_id in _sec_ids:
-                    __cfg_sec.append(_sec)
-                    __cfg_sec_ids.append(_sec_id)
-                    is_included[section_seq_ids[_sec_id]] = True
-
-            _cfg_sec_disp = []
-            valid_cfg_sec = []
-            skipped_cfg_sec = []
-            skipped_parent_seq_ids = []
-            _sec_args = []
-            valid_parent_names = [root_sec_name, ]
-            valid_parent_seq_ids = [None, ]
-            _common_str = ''
-
-            for _sec_id, x in specific_sec:
-                __cfg_sec_ids.append(_sec_id)
-                is_included[section_seq_ids[_sec_id]] = True
-                __cfg_sec.append(x)
-
-            # n_sections = len(sections)
-
-            """sort by line and process each cfg section
-            """
-            __cfg_sec_sorted = sorted(zip(__cfg_sec_ids, __cfg_sec))
-
-            # __cfg_seq_ids = [section_seq_ids[k[0]] for k in __cfg_sec_sorted]
-
-            for _sec_id, x in __cfg_sec_sorted:
-
-                _curr_sec_seq_id = section_seq_ids[_sec_id]
-                _curr_sec_node = nodes[_curr_sec_seq_id]  # type: Node
-
-                _curr_sec_parent_name = _curr_sec_node.parent.name
-                _curr_sec_parent_seq_id = _curr_sec_node.parent.seq_id
-
-                _curr_sec_seq_id = _curr_sec_node.seq_id
-                _curr_sec_name = section_names[_sec_id]
-
-                assert _curr_sec_name == _curr_sec_node.name, "curr_sec_node name mismatch"
-
-                if _curr_sec_parent_seq_id not in valid_parent_seq_ids:
-                    # if _sec_id in specific_sec_ids and specific_sec_ids[_sec_id] == 0:
-                    #     raise AssertionError('Specific section {} not found'.format(_curr_sec_ancestral_path))
-                    # print('skipping section {}'.format(_curr_sec_ancestral_path))
-                    if _curr_sec_parent_seq_id in skipped_parent_seq_ids:
-                        skipped_cfg_sec.append(x)
-                        skipped_parent_seq_ids.append(_curr_sec_seq_id)
-                    continue
-
-                if _curr_sec_name == '__exc__':
-                    """exclusive sibling section"""
-                    included_siblings = [(_node.seq_id, _node.name) for _node in _curr_sec_node.parent.children
-                                         if is_included[_node.seq_id] and _node.seq_id != _curr_sec_seq_id]
-                    if included_siblings:
-                        assert len(included_siblings) == 1, \
-                            "multiple included siblings for " \
-                            "exclusive section with parent {},{} :: {}".format(
-                                _curr_sec_parent_seq_id, _curr_sec_parent_name, included_siblings)
-                        print('skipping exclusive section {} with parent {},{} due to included sibling: {}'.format(
-                            _curr_sec_seq_id, _curr_sec_parent_seq_id, _curr_sec_parent_name, included_siblings[0]
-                        ))
-                        skipped_cfg_sec.append(x)
-                        skipped_parent_seq_ids.append(_curr_sec_seq_id)
-                        continue
-
-                _curr_sec_full_name = _curr_sec_node.full_name
-                _curr_sec_parent_full_name = _curr_sec_node.parent.full_name
-
-                ancestors = _curr_sec_node.get_ancestors()
-                _curr_sec_ancestral_path = ':'.join([ancestor.name for ancestor in ancestors[::-1]
-                                                     if ancestor.name not in common_section_names] +
-                                                    [_curr_sec_name, ])
-                _curr_sec_root_name = ancestors[-1].name if ancestors else _curr_sec_name
-
-                assert x == _curr_sec_name, "mismatch between x: {} and _curr_sec_name: {}".format(x, _curr_sec_name)
-
-                valid_parent_seq_ids.append(_curr_sec_seq_id)
-                valid_parent_names.append(x)
-                valid_cfg_sec.append(x)
-
-                _start_id = section_line_ids[_sec_id] + 1
-                _template_id = section_template_ids[_sec_id]
-
-                # if _template_id:
-                #     """template sections with the same ID all have same line IDs so look for the
-                #     first subsequent section with different ID that is not an ancestor;
-                #     """
-                #     _end_id = n_file_args
-                #     _next_sec_id = None
-                #     # ancestors = _curr_sec_node.get_ancestors()
-                #     # ancestor_template_ids = [ancestor.template_id for ancestor in ancestors]
-                #     for i in range(_sec_id + 1, n_sections):
-                #         if section_template_ids[i] != _template_id and section_line_ids[i] > _start_id:
-                #             _next_node = nodes[section_seq_ids[i]]
-                #             _next_template_id = section_template_ids[i]
-                #             _end_id = section_line_ids[i]
-                #             _next_sec_id = i
-                #             break
-                # else:
-                #     _end_id = section_line_ids[_sec_id + 1] if _sec_id < n_sections - 1 else n_file_args
-
-                _end_id = section_end_ids[_sec_id]
-
-                # discard empty and comment lines from start of section
-                orig_start_id = _start_id
-                while _start_id < n_file_args:
-                    if _file_args[_start_id] and not _file_args[_start_id].startswith('#'):
-                        # if _file_args[_start_id - 1]:
-                        break
-                    _start_id += 1
-
-                # discard empty and comment lines from end of section
-                orig_end_id = _end_id
-                while _end_id >= 0:
-                    if _file_args[_end_id - 1] and not _file_args[_end_id - 1].startswith('#'):
-                        # if _file_args[_end_id - 1]:
-                        break
-                    _end_id -= 1
-
-                if _start_id >= _end_id:
-                    if x not in common_section_names:
-                        # print('skipping empty section {} ({}, {})'.format(x, orig_start_id, orig_end_id))
-                        assert orig_start_id == orig_end_id, "invalid empty section {} ({}, {})".format(
-                            x, orig_start_id, orig_end_id)
-                    continue
-
-                _curr_sec_args = _file_args[_start_id:_end_id]
-
-                phs_sub = {
-                    ('%N%', '__name__',): _curr_sec_name,
-                    ('%P%', '__parent__',): _curr_sec_parent_name,
-                    ('%R%', '__root__',): _curr_sec_root_name,
-                    ('%F%', '__full__',): _curr_sec_full_name,
-                    ('%PF%', '__parent_full__',): _curr_sec_parent_full_name,
-                }
-
-                _curr_sec_sub_names = _curr_sec_name.split('_')
-                if len(_curr_sec_sub_names) > 1:
-                    for sub_name_id, sub_name in enumerate(_curr_sec_sub_names):
-                        phs_sub[(f'%N{sub_name_id}%', f'__name{sub_name_id}__',)] = sub_name
-                        if sub_name_id > 0:
-                            phs_sub[(f'%N{sub_name_id}*%', f'__name{sub_name_id}*__',)] = '_'.join(
-                                _curr_sec_sub_names[sub_name_id:])
-
-                """
-                only replace these if the placeholder actually exists since the 
-                substitution might be invalid depending on the name and hierarchical position of the section
-                """
-                phs_sub_fn = {
-                    ('%GP%', '__g_parent__'): _curr_sec_node.gp,
-                    ('%GGP%', '__gg_parent__'): _curr_sec_node.ggp,
-
-                    ('%GF%', '__g_full__'): _curr_sec_node.gf,
-                    ('%GGF%', '__gg_full__'): _curr_sec_node.ggf,
-
-                    ('%RI%', '__ratio__'): _curr_sec_node.ri,
-                    ('%PRI%', '__parent_ratio__'): _curr_sec_node.pri,
-                    ('%GPRI%', '__g_parent_ratio__'): _curr_sec_node.gpri,
-                    ('%GGPRI%', '__gg_parent_ratio__'): _curr_sec_node.ggpri,
-
-                    ('%L%', '__list__'): _curr_sec_node.l_,
-                    ('%PL%', '__parent_list__'): _curr_sec_node.pl,
-                    ('%GPL%', '__g_parent_list__'): _curr_sec_node.gpl,
-                    ('%GGPL%', '__gg_parent_list__'): _curr_sec_node.ggpl,
-
-                    ('%LRI%', '__list_ratio__'): _curr_sec_node.lri,
-                    ('%PLRI%', '__parent_list_ratio__'): _curr_sec_node.plri,
-                    ('%GPLRI%', '__g_parent_list_ratio__'): _curr_sec_node.gplri,
-                    ('%GGPLRI%', '__gg_parent_list_ratio__'): _curr_sec_node.ggplri,
-
-                    ('%RA%', '__range__'): _curr_sec_node.ra,
-                    ('%PRA%', '__parent_range__'): _curr_sec_node.pra,
-                    ('%GPRA%', '__g_parent_range__'): _curr_sec_node.gpra,
-                    ('%GGPRA%', '__gg_parent_range__'): _curr_sec_node.ggpra,
-                }
-
-                for i, _curr_sec_arg in enumerate(_curr_sec_args):
-
-                    for phs, sub in phs_sub.items():
-                        for ph in phs:
-                            _curr_sec_args[i] = _curr_sec_args[i].replace(ph, sub)
-
-                    for phs, sub_fn in phs_sub_fn.items():
-                        for ph in phs:
-                            if ph not in _curr_sec_args[i]:
-                                continue
-                            _curr_sec_args[i] = _curr_sec_args[i].replace(ph, sub_fn())
-
-                _sec_args += _curr_sec_args
-
-                start_line_num = _start_id + 1 - file_args_offset
-                end_line_num = _end_id - file_args_offset
-
-                if x not in common_section_names:
-
-                    # if _sec_id in specific_sec_ids and not _curr_sec_node.parent.is_root:
-                    #     _sec_disp_name = _curr_sec_full_name
-                    # # elif not _curr_sec_node.parent.is_root:
-                    # #     _sec_disp_name = '{}:{}'.format(_curr_sec_parent_name, _curr_sec_name)
-                    # else:
-                    #     _sec_disp_name = _curr_sec_ancestral_path
-
-                    _sec_disp_name = _curr_sec_ancestral_path
-
-                    _str = '{}: {}'.format(_sec_disp_name, start_line_num)
-                    if end_line_num > start_line_num:
-                        _str = '{} -> {}'.format(_str, end_line_num)
-                    _cfg_sec_disp.append(_str)
-                else:
-                    _str = '{}'.format(start_line_num)
-                    if end_line_num > start_line_num:
-                        _str = '{} -> {}'.format(_str, end_line_num)
-                    _common_str = '{}, {}'.format(_common_str, _str) if _common_str else _str
-
-                # print(_str)
-                # pass
-
-            invalid_cfg_sec = [k for k in __cfg_sec if k and k not in valid_cfg_sec + skipped_cfg_sec]
-            if invalid_cfg_sec:
-                raise AssertionError('Invalid cfg sections provided for {}:\n {}'.format(_cfg, invalid_cfg_sec))
-
-            if _common_str:
-                _common_str = 'common: {}'.format(_common_str)
-                _cfg_sec_disp.append(_common_str)
-
-            print('\t{}'.format(
-                '\n\t'.join(_cfg_sec_disp)
-                # pformat(_cfg_sec_disp)
-            ))
-
-            file_args = [arg.strip() for arg in _sec_args if arg.strip()]
-            # lines starting with # in the cfg file are comments or section headings and thus ignored
-            file_args = ['--{:s}'.format(arg) for arg in file_args if not arg.startswith('#')]
-            args_in += file_args
-
-            # reset prefix before next cfg file
-            args_in.append('@')
-
-        help_mode = ''
-        # command line arguments override those in the cfg file
-        if cmd:
-            # reset prefix before command line args
-            args_in.append('@')
-            noncfg_cmd_args = list(cmd_args[argv_id:])
-            # if noncfg_cmd_args and noncfg_cmd_args[0] in ('--h', '-h', '--help'):
-            #     # args_in.insert(0, noncfg_cmd_args[0])
-            #     help_mode = noncfg_cmd_args[0]
-            #     noncfg_cmd_args = noncfg_cmd_args[1:]
-            args_in += noncfg_cmd_args
-
-        args_in = [k if k.startswith('--') or k == '-h' else '--{}'.format(k) for k in args_in]
-
-        # pf: Prefix to be added to all subsequent arguments to avoid very long argument names
-        # for deeply nested module parameters:
-        # with pf=name1.name2
-        # @name: pf=name
-        # @@name: pf=name1.name2.name
-        # @@@name: pf=name1.name
-
-        _args_in = []
-        _args_dict = {}
-        pf = ''
-        for _id, _arg in enumerate(args_in):
-            if _arg in ('--h', '-h', '--help'):
-                help_mode = _arg
-                continue
-
-            _arg = _arg[2:]
-            suspend_pf = 0
-            if _arg.startswith('@'):
-                _name = _arg[1:].strip()
-
-                if '=' in _name:
-                    if _name.startswith('@@'):
-                        pf_id = '@@'
-                    elif _name.startswith('@'):
-                        pf_id = '@'
-                    else:
-                        pf_id = ''
-                    _pf = _get_pf(pf_id, pf)
-                    _name = _name.lstrip('@')
-                    if _pf:
-                        _arg = '{}.{}'.format(_pf, _name)
-                    else:
-                        _arg = _name
-                    suspend_pf = 1
-                else:
-                    pf = _get_pf(_name, pf)
-                    continue
-
-            if '+=' in _arg:
-                try:
-                    _name, _val = _arg.split('+=')
-                except ValueError as e:
-                    raise ValueError('Invalid argument provided: {} :: {}'.format(_arg, e))
-                if pf and not suspend_pf:
-                    _name = '{}.{}'.format(pf, _name)
-
-                if ',' in _name:
-                    _names_recursive = []
-                    _recursive_append(_name, _names_recursive)
-
-                    # print('{} --> {}'.format(_name, _names_recursive))
-                    # print('')
-                else:
-                    _names_recursive = [_name, ]
-
-                for __name in _names_recursive:
-                    __val = _val
-                    try:
-                        arg_type = member_to_type[__name]
-                    except KeyError:
-                        msg = 'Invalid param name {} in argument {}'.format(__name, _arg)
-                        if allow_unknown:
-                            print(msg)
-                        else:
-                            raise ValueError(msg)
-                    else:
-                        assert arg_type in (tuple, list, MultiPath, MultiCFG), \
-                            "incremental value specification found for argument {} of invalid type: {}".format(
-                                __name, arg_type)
-                        try:
-                            old_val = _args_dict[__name]
-                        except KeyError:
-                            pass
-                            # print('Accumulative value provided for uninitialized arg: {} :: {}'.format(
-                            #     __name, _arg))
-                        else:
-                            if arg_type is MultiPath:
-                                sep = '_'
-                            elif arg_type is MultiCFG:
-                                sep = '::'
-                            else:
-                                sep = ','
-                            __val = '{}{}{}'.format(old_val, sep, _val)
-                    _args_in.append('--{}={}'.format(__name, __val))
-                    _args_dict[__name] = __val
-            else:
-                try:
-                    _name, _val = _arg.split('=')
-                except ValueError as e:
-                    raise ValueError('Invalid argument provided: {} :: {}'.format(_arg, e))
-                if pf:
-                    _name = '{}.{}'.format(pf, _name)
-
-                if ',' in _name:
-                    _names_recursive = []
-                    _recursive_append(_name, _names_recursive)
-
-                    # print('{} --> {}'.format(_name, _names_recursive))
-                    # print('')
-                else:
-                    _names_recursive = [_name, ]
-
-                _args_in += ['--{}={}'.format(__name, _val) for __name in _names_recursive]
-                _args_dict.update({__name: _val for __name in _names_recursive})
+        args_in = None
+        noncfg_cmd_args = list(cmd_args[argv_id:]) if cmd else []
+        if args_cache:
+            args_cache_path = get_args_cache_path(obj, member_to_type, cfg_file_list, noncfg_cmd_args, cache_dir)
+            args_in = load_args_cache(args_cache_path, cache_dir)
+            _count_cache('args', args_in is not None)
+
+        if args_in is None:
+            """process each cfg file and its sections"""
+            args_in, cfg_files = _args_from_cfgs(cfg_file_list, cfg_cache, cache_dir)
+
+            # command line arguments override those in the cfg file
+            if cmd:
+                # reset prefix before command line args
+                args_in.append('@')
+                args_in += noncfg_cmd_args
+
+            args_in = _normalize_args(args_in, member_to_type, allow_unknown)
+
+            if args_cache:
+                save_args_cache(args_cache_path, args_in, cfg_files, cache_dir)
+    if any(_is_help_arg(_arg) for _arg in args_in):
+        """docstrings are only parsed fully for the help strings when help is actually requested"""
+        if compiled is None:
+            parser, _ = _build_parser(obj, prog, usage, verbose, cache_dir=cache_dir)
+        else:
+            parser = compiled.get_help_parser()
+        direct = 0
 
-        args_in = _args_in
+    direct_vals = None
+    if direct:
+        if compiled is None:
+            converters, default_fixups = _get_direct_schema(parser)
+        else:
+            converters, default_fixups = compiled.get_direct_schema()
+        direct_vals = _parse_direct(args_in, converters)
 
-        _args_in = []
-        for _arg_str in args_in:
-            _name, _val = _arg_str.split('=')
-            if not _val or _val.startswith('#'):
-                continue
-            _args_in.append(_arg_str)
-
-        args_in = _args_in
-        if help_mode:
-            args_in.insert(0, help_mode)
-    if allow_unknown:
-        args, unknown = parser.parse_known_args(args_in)
-        if unknown:
-            print('Unknown arguments found:\n{}'.format(pformat(unknown)))
+    if direct_vals is not None:
+        _process_args_direct(obj, direct_vals, default_fixups, setters)
     else:
-        args = parser.parse_args(args_in)
+        if allow_unknown:
+            args, unknown = parser.parse_known_args(args_in)
+            if unknown:
+                print('Unknown arguments found:\n{}'.format(pformat(unknown)))
+        else:
+            args = parser.parse_args(args_in)
 
-    _process_args_from_parser(obj, args, member_to_type)
+        _process_args_from_parser(obj, args, member_to_type, defaults, setters)
 
     if cfg_from_cmd is not None and hasattr(obj, 'cfg'):
         obj.cfg = cfg_from_cmd
@@ -2508,7 +4928,64 @@ def from_function(fn, class_name='', start=0, only_kw=True,
               to_clipboard=to_clipboard, sort_by_name=sort_by_name)
 
 
-if __name__ == '__main__':
+def _cache_cmd(argv):
+    parser = argparse.ArgumentParser(prog='paramparse cache', description='manage the paramparse cache folder')
+    parser.add_argument('action', choices=('stats', 'prune', 'clear'))
+    parser.add_argument('--dir', default='', help='cache folder; defaults to the one returned by get_cache_dir')
+    parser.add_argument('--size', type=float, default=None,
+                        help='size limit in MB for prune; defaults to PARAMPARSE_CACHE_SIZE or 1024')
+    args = parser.parse_args(argv)
+
+    cache_dir = get_cache_dir(args.dir)
+    if args.action == 'stats':
+        cache_info = get_cache_info(cache_dir)
+        print('cache folder: {}'.format(cache_dir))
+        total_files = total_size = 0
+        for cache_type, (n_files, size) in sorted(cache_info.items()):
+            print('\t{}: {} files, {:.2f} MB'.format(cache_type, n_files, size / (1024 * 1024)))
+            total_files += n_files
+            total_size += size
+        print('total: {} files, {:.2f} MB of {:.2f} MB'.format(
+            total_files, total_size / (1024 * 1024), cache_size_limit if args.size is None else args.size))
+    elif args.action == 'prune':
+        n_removed, total_size = prune_cache(args.size, cache_dir)
+        print('removed {} files from {} leaving {:.2f} MB'.format(n_removed, cache_dir, total_size / (1024 * 1024)))
+    else:
+        n_removed = clear_cache(cache_dir)
+        print('removed {} files from {}'.format(n_removed, cache_dir))
+
+
+def _pack_cmd(argv):
+    parser = argparse.ArgumentParser(
+        prog='paramparse pack',
+        description='resolve a cfg file along with all its imports into a single pack file that can then be '
+                    'specified as <pack file>:<sections> in place of the cfg file')
+    parser.add_argument('cfg', help='path of the cfg file')
+    parser.add_argument('-o', '--out', default='',
+                        help='path of the pack file; defaults to the name of the cfg file with the extension .ppk')
+    args = parser.parse_args(argv)
+
+    pack_path = save_cfg_pack(args.cfg, args.out)
+    print('Saved cfg pack to {}'.format(pack_path))
+
+
+def main(argv=None):
+    """
+    paramparse cache stats|prune|clear [--dir DIR] [--size MB] to manage the cache folder;
+    paramparse pack CFG [-o PACK] to create a cfg pack;
+    without any arguments, a parameter class is generated from the dict in the clipboard
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv and argv[0] == 'cache':
+        _cache_cmd(argv[1:])
+        return
+
+    if argv and argv[0] == 'pack':
+        _pack_cmd(argv[1:])
+        return
+
     try:
         from Tkinter import Tk
     except ImportError:
@@ -2520,3 +4997,7 @@ if __name__ == '__main__':
     if not isinstance(_dict, dict):
         raise IOError('Clipboard contents do not form a valid dict:\n{}'.format(in_txt))
     from_dict(_dict)
+
+
+if __name__ == '__main__':
+    main()
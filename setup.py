@@ -17,6 +17,9 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     install_requires=[
     ],
+    entry_points={
+        'console_scripts': ['paramparse=paramparse:main'],
+    },
     python_requires='>3.5.2',
     classifiers=[
         "Programming Language :: Python",
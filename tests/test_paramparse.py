@@ -0,0 +1,1091 @@
+import collections
+import contextlib
+import dataclasses
+import gzip
+import inspect
+import io
+import mmap
+import os
+import re
+import typing
+import weakref
+import zipfile
+
+import pytest
+
+import paramparse
+
+MAIN_CFG = """\
+lr=0.2
+%import% sub/common.cfg
+## train
+flag=1
+name=%N%
+### fast,slow
+tag=%N%_%P%
+#### irange(1,3)
+inner.depth=%N%
+## test
+flag=2
+seq=range(3)
+## x,y
+inner.opt=%N%
+### z
+name=z_%P%
+##
+lr=0.3
+"""
+
+COMMON_CFG = """\
+inner.names=c,d
+"""
+
+SEC_CMDS = [
+    "train",
+    "train:fast",
+    "train:fast:2",
+    "train:slow-3",
+    "train:fast:1:++test",
+    "test",
+    "x:z",
+    "y",
+    "",
+]
+
+
+class Inner:
+    """
+    :ivar depth: depth of the inner params
+    :type depth: int
+
+    :ivar names: names
+    :type names: (str, )
+
+    :ivar opt: optional value
+    :type opt: str
+    """
+
+    def __init__(self):
+        self.depth = 3
+        self.names = ('a', 'b')
+        self.opt = None
+
+
+class Params:
+    """
+    :ivar lr: learning rate
+    :type lr: float
+
+    :param int flag: flag
+    """
+
+    def __init__(self):
+        self.cfg = ()
+        self.cfg_root = 'cfg'
+        self.cfg_ext = 'cfg'
+        self.lr = 0.1
+        self.flag = 0
+        self.seq = (0,)
+        self.name = 'default'
+        self.tag = ''
+        self.inner = Inner()
+
+
+@pytest.fixture
+def cfg_dir(tmp_path, monkeypatch):
+    """fresh cfg files and cache folder with all the in-process caches reset"""
+    cfg_root = tmp_path / 'cfg'
+    (cfg_root / 'sub').mkdir(parents=True)
+    (cfg_root / 'main.cfg').write_text(MAIN_CFG)
+    (cfg_root / 'sub' / 'common.cfg').write_text(COMMON_CFG)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PARAMPARSE_CACHE_DIR', str(tmp_path / 'cache'))
+    _new_process(monkeypatch)
+    return cfg_root
+
+
+def _new_process(monkeypatch):
+    """forget everything cached in memory so that only the caches on disk remain"""
+    monkeypatch.setattr(paramparse, '_doc_caches', {})
+    monkeypatch.setattr(paramparse, '_doc_cache_updates', {})
+    monkeypatch.setattr(paramparse, '_class_type_dicts', weakref.WeakKeyDictionary())
+    monkeypatch.setattr(paramparse, '_cache_sizes', {})
+    paramparse.reset_cache_stats()
+
+
+def _run(cmd_args, params_type=Params, **kwargs):
+    """
+    :return: parsed params as a dict without cfg and with the time stamped root section names normalized
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        params = paramparse.process(params_type, cmd_args=cmd_args, **kwargs)
+    params_dict = paramparse.to_dict(params)
+    params_dict.pop('cfg')
+    return eval(re.sub(r'__root_\d+_\d+__', '__root__', repr(params_dict)))
+
+
+def _cfg_arg(sec_cmd, cfg='main'):
+    return 'cfg={}:{}'.format(cfg, sec_cmd) if sec_cmd else 'cfg={}'.format(cfg)
+
+
+def _baseline(cfg='main'):
+    return [_run([_cfg_arg(sec_cmd, cfg)], cfg_cache=0) for sec_cmd in SEC_CMDS]
+
+
+def test_cfg_sections(cfg_dir):
+    params = _run(['cfg=main:train:fast:2'], cfg_cache=0)
+    assert params['lr'] == 0.3
+    assert params['flag'] == 1
+    assert params['name'] == 'train'
+    assert params['tag'] == 'fast_train'
+    assert params['inner']['depth'] == 2
+    assert params['inner']['names'] == ['c', 'd']
+
+    params = _run(['cfg=main:x:z'], cfg_cache=0)
+    assert params['inner']['opt'] == 'x'
+    assert params['name'] == 'z_x'
+
+    params = _run(['cfg=main:test'], cfg_cache=0)
+    assert params['seq'] == (0, 1, 2)
+
+
+def test_compiled_parser(cfg_dir):
+    args_in = ['--lr=0.5', '--inner.depth=4', '--inner.names=p,q,r', '--name=abc']
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = paramparse.to_dict(paramparse.process(Params, args_in=args_in, cfg_cache=0))
+        parser = paramparse.get_parser(Params)
+        assert paramparse.get_parser(Params) is parser
+        assert paramparse.Parser(Params) is not parser
+        compiled = parser.parse(args_in, cfg_cache=0)
+        default = parser.parse([], cfg_cache=0)
+
+    assert expected['lr'] == 0.5
+    assert expected['inner']['names'] == ['p', 'q', 'r']
+    assert paramparse.to_dict(compiled) == expected
+    assert paramparse.to_dict(default) == paramparse.to_dict(Params())
+
+    """each call returns a new instance that does not share any nested params with the previous ones"""
+    assert isinstance(compiled, Params)
+    assert compiled.inner is not default.inner
+
+    assert _run(['cfg=main:train:fast:2'], cfg_cache=0, compiled=parser) == \
+        _run(['cfg=main:train:fast:2'], cfg_cache=0)
+
+
+def test_direct_engine(cfg_dir):
+    args_in = ['--lr=0.5', '--inner.depth=4', '--inner.names=p,q,r', '--name=abc']
+    parser = paramparse.get_parser(Params)
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = paramparse.to_dict(parser.parse(args_in, cfg_cache=0))
+        direct = paramparse.to_dict(parser.parse(args_in, cfg_cache=0, direct=1))
+        direct_process = paramparse.to_dict(paramparse.process(Params, args_in=args_in, cfg_cache=0, direct=1))
+    assert direct == expected
+    assert direct_process == expected
+
+    for sec_cmd in SEC_CMDS:
+        assert _run([_cfg_arg(sec_cmd)], cfg_cache=0, direct=1) == _run([_cfg_arg(sec_cmd)], cfg_cache=0)
+
+
+def test_direct_engine_invalid_args(cfg_dir):
+    """invalid arguments are still reported by argparse"""
+    with pytest.raises(SystemExit):
+        _run(['bogus=1'], cfg_cache=0, direct=1)
+    with pytest.raises(SystemExit):
+        _run(['bogus=1'], cfg_cache=0, direct=0)
+
+
+def test_setters(cfg_dir):
+    parser = paramparse.get_parser(Params)
+    assert set(parser.setters) == set(parser.member_to_type)
+    assert 'inner.depth' in parser.setters
+
+    params = Params()
+    parser.setters['inner.depth'](params, 9)
+    parser.setters['lr'](params, 0.7)
+    assert params.inner.depth == 9
+    assert params.lr == 0.7
+
+    assert _run(['inner.depth=5', 'inner.opt=q'], cfg_cache=0)['inner'] == \
+        dict(depth=5, names=('a', 'b'), opt='q')
+
+    """'#' assigns an empty value of the same type as the existing one"""
+    parser.setters['inner.names'](params, '#')
+    assert params.inner.names == ()
+
+
+def test_member_schema():
+    class Base:
+        base_const = 1
+
+        def __init__(self):
+            self.a = 1
+            self._protected = 2
+            self.fn = len
+
+        @property
+        def prop(self):
+            return 3
+
+        def method(self):
+            pass
+
+    obj = Base()
+    assert paramparse.get_valid_members(obj) == ('a', 'base_const')
+    assert paramparse.get_valid_members(obj, include_protected=1) == ('_protected', 'a', 'base_const')
+    assert paramparse.get_member_schema(Base) is paramparse.get_member_schema(Base)
+
+
+def test_member_schema_class_attrs():
+    class Dynamic:
+        def __init__(self):
+            self.a = 1
+
+    obj = Dynamic()
+    assert paramparse.get_valid_members(obj) == ('a',)
+    Dynamic.b = 2
+    assert paramparse.get_valid_members(obj) == ('a', 'b')
+    obj.c = 3
+    assert paramparse.get_valid_members(obj) == ('a', 'b', 'c')
+
+
+def test_member_schema_candidates_bounded():
+    class Varying:
+        pass
+
+    for i in range(paramparse.MemberSchema.max_candidates * 2):
+        obj = Varying()
+        setattr(obj, 'a{}'.format(i), i)
+        assert paramparse.get_valid_members(obj) == ('a{}'.format(i),)
+    assert len(paramparse.get_member_schema(Varying)._candidates) <= paramparse.MemberSchema.max_candidates
+
+
+class Other:
+    """
+    :ivar count: number of things
+    :type count: int
+    """
+
+    def __init__(self):
+        self.count = 1
+
+
+def _print_help(params_type=Params):
+    with contextlib.redirect_stdout(io.StringIO()) as f:
+        paramparse.Parser(params_type).get_help_parser().print_help()
+    return f.getvalue()
+
+
+def _class_name(params_type):
+    return '{}.{}'.format(params_type.__module__, params_type.__qualname__)
+
+
+def test_doc_cache(cfg_dir, monkeypatch):
+    monkeypatch.setattr(paramparse, 'doc_cache_enabled', False)
+    help_str = _print_help()
+    assert 'learning rate' in help_str
+    assert not os.path.isfile(paramparse.get_doc_cache_path())
+
+    monkeypatch.setattr(paramparse, 'doc_cache_enabled', True)
+    _new_process(monkeypatch)
+    assert _print_help() == help_str
+    assert os.path.isfile(paramparse.get_doc_cache_path())
+    assert paramparse.get_cache_stats()['docs']['misses'] > 0
+
+    _new_process(monkeypatch)
+    assert _print_help() == help_str
+    stats = paramparse.get_cache_stats()['docs']
+    assert stats['hits'] > 0 and stats['misses'] == 0
+
+
+def test_doc_cache_concurrent_writes(cfg_dir, monkeypatch):
+    """entries written by another process after this one loaded the cache are kept when this one saves it"""
+    doc_cache, doc_cache_path = paramparse._load_doc_cache()
+
+    monkeypatch.setattr(paramparse, '_doc_caches', {})
+    _print_help(Other)
+    assert list(paramparse._read_doc_cache(doc_cache_path)) == [_class_name(Other)]
+
+    monkeypatch.setattr(paramparse, '_doc_caches', {doc_cache_path: doc_cache})
+    _print_help(Params)
+    assert set(paramparse._read_doc_cache(doc_cache_path)) == {
+        _class_name(Other), _class_name(Params), _class_name(Inner)}
+
+
+def test_doc_cache_type_only_path(cfg_dir, monkeypatch):
+    """a plain parse only records the types in the docstring cache and these are reused by the next process"""
+    monkeypatch.setattr(paramparse, 'doc_cache_enabled', False)
+    baseline = _run(['cfg=main:train:fast:2'], cfg_cache=0)
+    monkeypatch.setattr(paramparse, 'doc_cache_enabled', True)
+    _new_process(monkeypatch)
+    doc_cache_path = paramparse.get_doc_cache_path()
+
+    assert not os.path.isfile(doc_cache_path)
+    assert _run(['cfg=main:train:fast:2'], cfg_cache=0) == baseline
+    doc_cache = paramparse._read_doc_cache(doc_cache_path)
+    assert doc_cache[_class_name(Params)][1] == {'type': {'lr': 'float', 'flag': 'int'}}
+
+    _new_process(monkeypatch)
+    assert _run(['cfg=main:train:fast:2'], cfg_cache=0) == baseline
+    stats = paramparse.get_cache_stats()['docs']
+    assert stats['hits'] > 0 and stats['misses'] == 0
+
+    """the types recorded without any help strings are replaced by the full parse when help is needed"""
+    _new_process(monkeypatch)
+    assert 'learning rate' in _print_help()
+    doc_cache = paramparse._read_doc_cache(doc_cache_path)
+    assert all('help' in raw_dict for _, raw_dict in doc_cache.values())
+
+
+def test_type_strs_from_str():
+    doc = inspect.getdoc(Params) + '\n' + inspect.getdoc(Inner)
+    assert paramparse._type_strs_from_str(doc) == paramparse._raw_dict_from_str(doc)['type']
+
+    """a malformed chunk only loses its own entry"""
+    doc = ':ivar lr: learning rate\n:type lr: float\n:ivar bad\n:param int flag: flag\n'
+    assert paramparse._type_strs_from_str(doc) == {'lr': 'float', 'flag': 'int'}
+
+
+@pytest.mark.parametrize('type_str, expected', [
+    ('int', int),
+    (' float ', float),
+    ('str', str),
+    ('bool', bool),
+    ('(int, )', tuple),
+    ('(str, float)', tuple),
+    ('tuple(int)', tuple),
+    ('tuple[int]', tuple),
+    ('tuple[int, ...]', tuple),
+    ('Tuple[int]', tuple),
+    ('typing.Tuple[int, str]', tuple),
+    ('[int]', list),
+    ('list[int]', list),
+    ('List[str]', list),
+    ('Sequence[int]', list),
+    ('{str: str}', dict),
+    ('dict[str, int]', dict),
+    ('Dict[str, Tuple[int, int]]', dict),
+    ('Mapping[str, int]', dict),
+    ('int | None', int),
+    ('None | float', float),
+    ('tuple[int] | None', tuple),
+    ('Optional[int]', int),
+    ('typing.Optional[str]', str),
+    ('Optional[List[int]]', list),
+    ('Union[int, bool]', int),
+    ('Union[None, Dict[str, int]]', dict),
+    ('MultiPath', paramparse.MultiPath),
+    ('paramparse.MultiPath', paramparse.MultiPath),
+    ('collections.OrderedDict', collections.OrderedDict),
+    ('collections.OrderedDict[str, int]', collections.OrderedDict),
+    ('no_such_module.NoSuchType', None),
+    ('', None),
+    ('None', None),
+])
+def test_resolve_type(type_str, expected):
+    assert paramparse.resolve_type(type_str) is expected
+
+
+def test_resolve_union():
+    assert paramparse._resolve_union(['None', ' int']) is int
+    assert paramparse._resolve_union(['no_such_module.NoSuchType', 'float']) is float
+    assert paramparse._resolve_union(['None']) is None
+
+
+def test_docstring_types(cfg_dir):
+    class Typed:
+        """
+        :ivar count: count
+        :type count: Optional[int]
+
+        :param tuple[int] sizes: sizes
+
+        :ivar ratio: ratio
+        :type ratio: float | None
+        """
+
+        def __init__(self):
+            self.cfg = ()
+            self.count = None
+            self.sizes = ()
+            self.ratio = None
+
+    params = _run(['count=3', 'sizes=1,2', 'ratio=0.5'], Typed, cfg_cache=0)
+    assert params == dict(count=3, sizes=[1, 2], ratio=0.5)
+
+
+@dataclasses.dataclass
+class DataInner:
+    depth: int = 3
+    ratio: float = 0.5
+
+
+@dataclasses.dataclass
+class DataParams:
+    cfg: typing.Tuple[str, ...] = ()
+    lr: float = 0.1
+    count: typing.Optional[int] = None
+    names: typing.List[str] = dataclasses.field(default_factory=lambda: ['a', 'b'])
+    sizes: typing.Tuple[int, ...] = (1, 2)
+    mapping: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
+    flag: bool = False
+    inner: DataInner = dataclasses.field(default_factory=DataInner)
+
+
+def test_annotation_types():
+    assert paramparse.get_annotation_types(DataParams) == dict(
+        cfg=tuple, lr=float, count=int, names=list, sizes=tuple, mapping=dict, flag=bool, inner=DataInner)
+
+    class Annotated:
+        count: 'typing.Optional[int]' = None
+        ratio: typing.ClassVar[float] = 0.5
+        mode: typing.Literal['a', 'b'] = 'a'
+        untyped = 1
+
+    assert paramparse.get_annotation_types(Annotated) == dict(count=int, ratio=float, mode=str)
+
+
+def test_dataclass_defaults(cfg_dir):
+    params = _run([], DataParams, cfg_cache=0)
+    assert params == dict(lr=0.1, count={}, names=['a', 'b'], sizes=(1, 2), mapping={}, flag=False,
+                          inner=dict(depth=3, ratio=0.5))
+
+    params = _run(['count=3', 'names=x,y', 'sizes=4,5,6', 'inner.depth=7'], DataParams, cfg_cache=0)
+    assert params['count'] == 3
+    assert params['names'] == ['x', 'y']
+    assert list(params['sizes']) == [4, 5, 6]
+    assert params['inner'] == dict(depth=7, ratio=0.5)
+
+    """default factories still give each instance its own values"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        params_1 = paramparse.process(DataParams, cmd_args=[], cfg_cache=0)
+        params_2 = paramparse.process(DataParams, cmd_args=[], cfg_cache=0)
+    assert params_1.names is not params_2.names
+    assert params_1.inner is not params_2.inner
+
+
+def test_annotations_skip_docstrings(cfg_dir, monkeypatch):
+    """docstrings are not read at all when all the params are annotated"""
+    def _fail(*args, **kwargs):
+        raise AssertionError('docstring parsed')
+
+    monkeypatch.setattr(paramparse, 'types_from_docs', _fail)
+    assert _run(['lr=0.5'], DataParams, cfg_cache=0)['lr'] == 0.5
+
+
+def _read_cfg(cfg_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return paramparse.read_cfg(str(cfg_path), enable_cache=0)
+
+
+DUP_CFG = """\
+## a
+name=a
+### c
+tag=a_c
+## b
+name=b
+### c
+tag=b_c
+#### d
+flag=1
+## __common__
+lr=0.5
+"""
+
+
+def test_section_index(cfg_dir):
+    (cfg_dir / 'dup.cfg').write_text(DUP_CFG)
+    nodes, nodes_by_fullname, sections_by_name = _read_cfg(cfg_dir / 'dup.cfg')[:3]
+    assert sections_by_name['c'] == [1, 3]
+    assert [nodes[_id].name for _id in sections_by_name['c']] == ['c', 'c']
+    assert {name: len(_ids) for name, _ids in sections_by_name.items()} == {'a': 1, 'b': 1, 'c': 2, 'd': 1,
+                                                                             '__common__': 1}
+
+    assert _run(['cfg=dup:a:c'], cfg_cache=0)['tag'] == 'a_c'
+    params = _run(['cfg=dup:b:c:d'], cfg_cache=0)
+    assert (params['name'], params['tag'], params['flag'], params['lr']) == ('b', 'b_c', 1, 0.5)
+    assert _run(['cfg=dup:b-c'], cfg_cache=0)['tag'] == 'b_c'
+
+    with pytest.raises(BaseException):
+        _run(['cfg=dup:nope'], cfg_cache=0)
+
+
+NESTED_CFG = """\
+## p,q
+v=%N%
+### a,b
+w=%N%_%P%
+#### c_1,c_2
+u=%N%_%P%_%GP%
+"""
+
+
+class Nested:
+    """
+    :ivar v: name of the top level section
+    :ivar w: names of the second level section and its parent
+    :ivar u: names of the leaf section and its ancestors
+    """
+
+    def __init__(self):
+        self.cfg = ()
+        self.cfg_root = 'cfg'
+        self.cfg_ext = 'cfg'
+        self.v = ''
+        self.w = ''
+        self.u = ''
+
+
+def test_nested_template_sections(cfg_dir):
+    (cfg_dir / 'nested.cfg').write_text(NESTED_CFG)
+    nodes, _, sections_by_name = _read_cfg(cfg_dir / 'nested.cfg')[:3]
+    assert {name: len(_ids) for name, _ids in sections_by_name.items()} == \
+        {'p': 1, 'q': 1, 'a': 2, 'b': 2, 'c_1': 4, 'c_2': 4}
+
+    """each expanded section is nested within the expansion of its parent template"""
+    parents = []
+    for _id in sections_by_name['c_2']:
+        node = nodes[_id]
+        assert node.curr_level == 3
+        parents.append((node.parent.parent.name, node.parent.name))
+    assert sorted(parents) == [('p', 'a'), ('p', 'b'), ('q', 'a'), ('q', 'b')]
+
+    for cfg_cache in (0, 1, 1):
+        params = _run(['cfg=nested:q:b:c_2'], params_type=Nested, cfg_cache=cfg_cache)
+        assert (params['v'], params['w'], params['u']) == ('q', 'b_q', 'c_2_b_q')
+        params = _run(['cfg=nested:p:a'], params_type=Nested, cfg_cache=cfg_cache)
+        assert (params['v'], params['w'], params['u']) == ('p', 'a_p', '')
+
+
+def test_lazy_range_templates(cfg_dir):
+    (cfg_dir / 'big.cfg').write_text('## train\nflag=1\n### irange(1,1000000)\ninner.depth=%N%\n'
+                                     '#### irange(0,1000)\nname=%N%_%P%\n')
+    nodes, _, sections_by_name, _sections, _, _, _, template_sections = _read_cfg(cfg_dir / 'big.cfg')[:8]
+    """only the sections that are not generated from range templates are created up front"""
+    assert len(nodes) == 1
+    assert template_sections is not None
+
+    for cfg_cache in (0, 1, 1):
+        params = _run(['cfg=big:train:123456:999'], cfg_cache=cfg_cache)
+        assert params['inner']['depth'] == 123456
+        assert params['name'] == '999_123456'
+        assert params['flag'] == 1
+
+
+def test_section_tree(cfg_dir):
+    (cfg_dir / 'nested.cfg').write_text(NESTED_CFG)
+    nodes, nodes_by_fullname = _read_cfg(cfg_dir / 'nested.cfg')[:2]
+    assert isinstance(nodes, paramparse.SectionTree)
+
+    root = nodes[None]
+    assert root.is_root and root.parent is None and root.seq_id is None
+    assert [child.name for child in root.children] == ['p', 'q']
+
+    q = root.children[1]
+    assert q.curr_level == 1 and q.parent.is_root
+    assert [child.name for child in q.children] == ['a', 'b']
+    assert [node.name for node in q.get_descendants()] == ['a', 'c_1', 'c_2', 'b', 'c_1', 'c_2']
+
+    leaf = q.children[1].children[1]
+    assert leaf.name == 'c_2' and leaf.curr_level == 3
+    assert [node.name for node in leaf.get_ancestors()] == ['b', 'q']
+    assert nodes.is_descendant(leaf.id, q.id)
+    assert not nodes.is_descendant(q.id, leaf.id)
+    assert not nodes.is_descendant(leaf.id, root.children[0].id)
+    assert leaf.id in nodes_by_fullname[leaf.full_name]
+
+    with pytest.raises(KeyError):
+        nodes[len(nodes)]
+
+
+PLACEHOLDERS_CFG = """\
+## 10_20
+a=%N%
+b=%L%
+c=%LRI%
+d=%RA%
+### 50
+e=%N%_%P%
+f=%RI%
+g=%PL%
+h=%PRI%
+i=%F%
+#### x
+j=%GP%_%GPL%
+k=%GF%
+## irange(3,5)
+a=__name__
+"""
+
+
+class Placeholders:
+    def __init__(self):
+        self.cfg = ()
+        self.cfg_root = 'cfg'
+        self.cfg_ext = 'cfg'
+        for name in 'abcdefghijk':
+            setattr(self, name, '')
+
+
+def test_placeholders(cfg_dir):
+    """the values are the same as those from the placeholder substitution before it was compiled"""
+    (cfg_dir / 'ph.cfg').write_text(PLACEHOLDERS_CFG)
+    params = _run(['cfg=ph:10_20:50:x'], Placeholders, cfg_cache=0)
+    assert params == dict(cfg_root='cfg', cfg_ext='cfg', a='10_20', b='10,20', c='0.1,0.2', d='10:20', e='50_10_20',
+                          f='0.5', g='10,20', h='10.2', i='10_2050', j='10_20_10,20', k='x_50_10_20')
+    assert _run(['cfg=ph:4'], Placeholders, cfg_cache=0)['a'] == '4'
+
+
+@pytest.fixture
+def placeholders(monkeypatch):
+    """restore the placeholder registry after the test"""
+    monkeypatch.setattr(paramparse, '_section_placeholders', dict(paramparse._section_placeholders))
+    monkeypatch.setattr(paramparse, '_placeholder_fns', dict(paramparse._placeholder_fns))
+    monkeypatch.setattr(paramparse, '_placeholder_re', paramparse._placeholder_re)
+
+
+def test_register_placeholder(cfg_dir, placeholders):
+    paramparse.register_placeholder('%UP%', lambda node: node.name.upper(), '__up__')
+    assert paramparse.get_placeholders()[('%UP%', '__up__')] is paramparse._placeholder_fns['__up__']
+
+    (cfg_dir / 'up.cfg').write_text('## train\nname=%UP%\ntag=__up___%N%\n')
+    params = _run(['cfg=up:train'], cfg_cache=0)
+    assert (params['name'], params['tag']) == ('TRAIN', 'TRAIN_train')
+
+    with pytest.raises(AssertionError):
+        paramparse.register_placeholder('UP', lambda node: '')
+
+
+def test_placeholder_override(cfg_dir, placeholders):
+    paramparse.register_placeholder('%N%', lambda node: node.name.upper())
+    placeholders = paramparse.get_placeholders()
+    assert ('%N%', '__name__') not in placeholders
+    assert placeholders[('__name__',)] is paramparse._placeholder_fns['__name__']
+    assert placeholders[('%N%',)] is paramparse._placeholder_fns['%N%']
+    assert _run(['cfg=main:train'], cfg_cache=0)['name'] == 'TRAIN'
+
+
+def test_args_cache(cfg_dir, monkeypatch):
+    baseline = _baseline()
+
+    for run_id in range(2):
+        _new_process(monkeypatch)
+        results = [_run([_cfg_arg(sec_cmd)], cfg_cache=1, args_cache=1) for sec_cmd in SEC_CMDS]
+        assert results == baseline
+
+        stats = paramparse.get_cache_stats()['args']
+        if run_id == 0:
+            assert stats == dict(hits=0, misses=len(SEC_CMDS))
+        else:
+            assert stats == dict(hits=len(SEC_CMDS), misses=0)
+
+    """the command line arguments are part of the key"""
+    assert _run(['cfg=main:train', 'lr=0.9'], cfg_cache=1, args_cache=1)['lr'] == 0.9
+
+
+def test_args_cache_placeholder_functions(cfg_dir, placeholders):
+    """the cached arguments generated with a different function for the same placeholder are not reused"""
+    assert _run(['cfg=main:train'], cfg_cache=1, args_cache=1)['name'] == 'train'
+    paramparse.register_placeholder('%N%', lambda node: node.name.upper())
+    assert _run(['cfg=main:train'], cfg_cache=1, args_cache=1)['name'] == 'TRAIN'
+
+
+def _edit(path, old, new):
+    text = path.read_text()
+    assert old in text
+    path.write_text(text.replace(old, new))
+    """make sure that the change is visible even on file systems with coarse modification times"""
+    _touch(path)
+
+
+def _touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.mark.parametrize('cache_kwargs', [
+    dict(cfg_cache=1),
+    dict(cfg_cache=1, args_cache=1),
+])
+def test_touched_cfg_keeps_caches(cfg_dir, monkeypatch, cache_kwargs):
+    """caches remain valid when only the modification times change, e.g. after a git checkout"""
+    baseline = _baseline()
+    for sec_cmd in SEC_CMDS:
+        _run([_cfg_arg(sec_cmd)], **cache_kwargs)
+
+    _touch(cfg_dir / 'main.cfg')
+    _touch(cfg_dir / 'sub' / 'common.cfg')
+    _new_process(monkeypatch)
+    assert [_run([_cfg_arg(sec_cmd)], **cache_kwargs) for sec_cmd in SEC_CMDS] == baseline
+    cache_type = 'args' if cache_kwargs.get('args_cache') else 'cfg'
+    assert paramparse.get_cache_stats()[cache_type]['misses'] == 0
+
+
+
+def _count_hashes(monkeypatch):
+    n_hashes = [0]
+    file_signature = paramparse._file_signature
+
+    def _file_signature(path, with_hash=1):
+        n_hashes[0] += bool(with_hash)
+        return file_signature(path, with_hash)
+
+    monkeypatch.setattr(paramparse, '_file_signature', _file_signature)
+    return n_hashes
+
+
+@pytest.mark.parametrize('cache_kwargs', [
+    dict(cfg_cache=1),
+    dict(cfg_cache=1, args_cache=1),
+])
+def test_touched_cfg_refreshes_signatures(cfg_dir, monkeypatch, cache_kwargs):
+    """the content hash of a touched cfg file is only computed once since the new signature is stored"""
+    baseline = _run(['cfg=main:train:fast'], cfg_cache=0)
+    _run(['cfg=main:train:fast'], **cache_kwargs)
+    _touch(cfg_dir / 'main.cfg')
+    _touch(cfg_dir / 'sub' / 'common.cfg')
+
+    n_hashes = _count_hashes(monkeypatch)
+    for run_id in range(2):
+        _new_process(monkeypatch)
+        assert _run(['cfg=main:train:fast'], **cache_kwargs) == baseline
+        assert n_hashes[0] == 2
+    cache_type = 'args' if cache_kwargs.get('args_cache') else 'cfg'
+    assert paramparse.get_cache_stats()[cache_type] == dict(hits=1, misses=0)
+
+
+def test_touched_cfg_refreshes_lines_signature(cfg_dir, monkeypatch):
+    cfg_path = str(cfg_dir / 'sub' / 'common.cfg')
+    with contextlib.redirect_stdout(io.StringIO()):
+        cfg_lines = paramparse._load_cfg_lines(cfg_path)
+    _touch(cfg_dir / 'sub' / 'common.cfg')
+
+    n_hashes = _count_hashes(monkeypatch)
+    for run_id in range(2):
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert paramparse._load_cfg_lines(cfg_path) == cfg_lines
+        assert n_hashes[0] == 1
+
+
+@pytest.mark.parametrize('cache_kwargs', [
+    dict(cfg_cache=1),
+    dict(cfg_cache=1, args_cache=1),
+])
+def test_edited_cfg_invalidates_caches(cfg_dir, monkeypatch, cache_kwargs):
+    for sec_cmd in SEC_CMDS:
+        _run([_cfg_arg(sec_cmd)], **cache_kwargs)
+
+    _edit(cfg_dir / 'main.cfg', 'tag=%N%_%P%', 'tag=%P%_%N%')
+    baseline = _baseline()
+    _new_process(monkeypatch)
+    assert [_run([_cfg_arg(sec_cmd)], **cache_kwargs) for sec_cmd in SEC_CMDS] == baseline
+    assert _run(['cfg=main:train:fast'], **cache_kwargs)['tag'] == 'train_fast'
+
+    _edit(cfg_dir / 'sub' / 'common.cfg', 'c,d', 'e,f')
+    baseline = _baseline()
+    _new_process(monkeypatch)
+    assert [_run([_cfg_arg(sec_cmd)], **cache_kwargs) for sec_cmd in SEC_CMDS] == baseline
+    assert _run(['cfg=main:train'], **cache_kwargs)['inner']['names'] == ['e', 'f']
+
+
+def test_atomic_cache_writes(cfg_dir):
+    """no temporary files are left behind in the cache folder"""
+    for sec_cmd in SEC_CMDS:
+        _run([_cfg_arg(sec_cmd)], cfg_cache=1, args_cache=1)
+    for root, _, files in os.walk(paramparse.get_cache_dir()):
+        assert all(file.endswith('.cache') for file in files)
+
+
+def test_cache_dir(cfg_dir, tmp_path, monkeypatch):
+    assert paramparse.get_cache_dir() == str(tmp_path / 'cache')
+    assert paramparse.get_cache_dir(str(tmp_path / 'other')) == str(tmp_path / 'other')
+
+    monkeypatch.delenv('PARAMPARSE_CACHE_DIR')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    assert paramparse.get_cache_dir() == paramparse.linux_path(str(tmp_path / 'xdg'), 'paramparse')
+
+    """caches are not written next to the cfg files any more"""
+    other_dir = str(tmp_path / 'other')
+    _run(['cfg=main:train'], cfg_cache=1, args_cache=1, cache_dir=other_dir)
+    assert set(paramparse.get_cache_info(other_dir)) >= {'cfg', 'lines', 'args'}
+    assert not any(name.endswith('.cache') or name == '.cache' for name in os.listdir(cfg_dir))
+
+
+
+def test_doc_cache_dir(cfg_dir, tmp_path):
+    """the docstring cache is written to the cache folder passed to process instead of the default one"""
+    other_dir = str(tmp_path / 'other')
+    baseline = _run(['cfg=main:train'], cfg_cache=0, cache_dir=other_dir)
+    assert os.path.isfile(paramparse.get_doc_cache_path(other_dir))
+    assert not os.path.exists(paramparse.get_doc_cache_path())
+
+    parser = paramparse.get_parser(Params, cache_dir=other_dir)
+    assert parser is not paramparse.get_parser(Params)
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.get_help_parser().print_help()
+    assert all('help' in raw_dict for _, raw_dict in
+               paramparse._read_doc_cache(paramparse.get_doc_cache_path(other_dir)).values())
+    assert _run(['cfg=main:train'], cfg_cache=0, cache_dir=other_dir) == baseline
+
+
+def test_cache_size_limit(cfg_dir, monkeypatch):
+    monkeypatch.setattr(paramparse, 'cache_size_limit', 0.002)
+    for sec_cmd in SEC_CMDS:
+        _run([_cfg_arg(sec_cmd)], cfg_cache=1, args_cache=1)
+
+    total_size = sum(size for _, size, _ in paramparse._get_cache_files())
+    assert 0 < total_size <= paramparse.cache_size_limit * 1024 * 1024
+
+
+def test_prune_and_clear(cfg_dir):
+    for sec_cmd in SEC_CMDS:
+        _run([_cfg_arg(sec_cmd)], cfg_cache=1, args_cache=1)
+
+    cache_files = sorted(paramparse._get_cache_files())
+    total_size = sum(size for _, size, _ in cache_files)
+    n_removed, remaining_size = paramparse.prune_cache(max_size=(total_size - 1) / (1024 * 1024))
+    assert n_removed >= 1 and remaining_size < total_size
+    """the least recently used file goes first"""
+    assert not os.path.exists(cache_files[0][2])
+
+    assert paramparse.clear_cache() == len(cache_files) - n_removed
+    assert paramparse.get_cache_info() == {}
+
+
+def test_cache_cmd(cfg_dir):
+    _run(['cfg=main:train'], cfg_cache=1)
+    with contextlib.redirect_stdout(io.StringIO()) as f:
+        paramparse.main(['cache', 'stats'])
+    assert 'cfg: 1 files' in f.getvalue()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        paramparse.main(['cache', 'clear'])
+    assert paramparse.get_cache_info() == {}
+
+
+def test_cfg_cache(cfg_dir, monkeypatch):
+    baseline = _baseline()
+
+    for run_id in range(2):
+        _new_process(monkeypatch)
+        results = [_run([_cfg_arg(sec_cmd)], cfg_cache=1) for sec_cmd in SEC_CMDS]
+        assert results == baseline
+
+        stats = paramparse.get_cache_stats()['cfg']
+        if run_id == 0:
+            assert stats['misses'] > 0
+        else:
+            assert stats == dict(hits=len(SEC_CMDS), misses=0)
+
+
+def test_cfg_cache_round_trip(cfg_dir):
+    cfg_path = str(cfg_dir / 'main.cfg')
+    with contextlib.redirect_stdout(io.StringIO()):
+        cfg_data = paramparse.read_cfg(cfg_path, enable_cache=1)
+        cached_data = paramparse.load_cfg_cache(cfg_path)
+    assert cached_data is not None
+
+    nodes, cached_nodes = cfg_data[0], cached_data[0]
+    for name in paramparse.SectionTree.__slots__:
+        assert list(getattr(cached_nodes, name)) == list(getattr(nodes, name)) \
+            if name != 'root_name' else cached_nodes.root_name == nodes.root_name
+    assert cached_data[1:4] == cfg_data[1:4]
+    assert list(cached_data[4]) == list(cfg_data[4])
+    assert cached_data[5:] == cfg_data[5:]
+
+
+
+def test_cfg_cache_closed(cfg_dir, monkeypatch):
+    """the cache file is not kept mapped by the cfg data loaded from it so it can be replaced or removed"""
+    cfg_path = str(cfg_dir / 'main.cfg')
+    with contextlib.redirect_stdout(io.StringIO()):
+        cfg_data = paramparse.read_cfg(cfg_path, enable_cache=1)
+
+    mappings = []
+
+    class _Mmap(mmap.mmap):
+        def __init__(self, *args, **kwargs):
+            mappings.append(self)
+
+    monkeypatch.setattr(mmap, 'mmap', _Mmap)
+    with contextlib.redirect_stdout(io.StringIO()):
+        cached_data = paramparse.load_cfg_cache(cfg_path)
+    assert cached_data is not None
+    assert mappings and all(mapping.closed for mapping in mappings)
+
+    cfg_cache_path = paramparse.get_cfg_cache_path(cfg_path)
+    os.replace(cfg_cache_path, cfg_cache_path + '.old')
+    os.remove(cfg_cache_path + '.old')
+    assert list(cached_data[4]) == list(cfg_data[4])
+    assert cached_data[0].names == cfg_data[0].names
+
+
+def test_invalid_cfg_cache(cfg_dir, monkeypatch):
+    """caches that cannot be read are ignored and written again"""
+    baseline = _baseline()
+    _run(['cfg=main:train'], cfg_cache=1)
+    cfg_cache_path = paramparse.get_cfg_cache_path(str(cfg_dir / 'main.cfg'))
+    for corrupted in (b'', b'garbage', b'PPCFG' + b'\xff' * 16):
+        with open(cfg_cache_path, 'wb') as f:
+            f.write(corrupted)
+        _new_process(monkeypatch)
+        assert [_run([_cfg_arg(sec_cmd)], cfg_cache=1) for sec_cmd in SEC_CMDS] == baseline
+
+
+def test_lines_cache(cfg_dir, monkeypatch):
+    """only the edited cfg is read again while the lines of the one it imports come from their own cache"""
+    for sec_cmd in SEC_CMDS:
+        _run([_cfg_arg(sec_cmd)], cfg_cache=1)
+    assert paramparse.get_cache_stats()['lines'] == dict(hits=0, misses=2)
+
+    _edit(cfg_dir / 'main.cfg', 'tag=%N%_%P%', 'tag=%P%_%N%')
+    baseline = _baseline()
+    _new_process(monkeypatch)
+    assert [_run([_cfg_arg(sec_cmd)], cfg_cache=1) for sec_cmd in SEC_CMDS] == baseline
+    assert paramparse.get_cache_stats()['lines'] == dict(hits=1, misses=1)
+
+    """a cfg importing an edited one is read again along with it"""
+    _edit(cfg_dir / 'sub' / 'common.cfg', 'c,d', 'e,f')
+    baseline = _baseline()
+    _new_process(monkeypatch)
+    assert [_run([_cfg_arg(sec_cmd)], cfg_cache=1) for sec_cmd in SEC_CMDS] == baseline
+    assert paramparse.get_cache_stats()['lines'] == dict(hits=1, misses=1)
+
+
+def test_lazy_read(cfg_dir, monkeypatch):
+    baseline = _baseline()
+
+    monkeypatch.setattr(paramparse, 'lazy_read_size', 1)
+    file_args = _read_cfg(cfg_dir / 'main.cfg')[4]
+    assert isinstance(file_args, paramparse._CfgLines)
+
+    for cfg_cache in (0, 1, 1):
+        _new_process(monkeypatch)
+        assert [_run([_cfg_arg(sec_cmd)], cfg_cache=cfg_cache) for sec_cmd in SEC_CMDS] == baseline
+
+
+def test_lazy_read_line_endings(cfg_dir, monkeypatch):
+    """Windows line endings are read lazily too while old Mac ones fall back to reading the whole file"""
+    baseline = _baseline()
+
+    monkeypatch.setattr(paramparse, 'lazy_read_size', 1)
+    for line_ending in ('\r\n', '\r'):
+        (cfg_dir / 'main.cfg').write_bytes(MAIN_CFG.replace('\n', line_ending).encode())
+        assert [_run([_cfg_arg(sec_cmd)], cfg_cache=0) for sec_cmd in SEC_CMDS] == baseline
+
+
+@pytest.mark.parametrize('glob_cmd, sec_cmd', [
+    ('tr*', 'train'),
+    ('train:f*', 'train:fast'),
+    ('train:?low', 'train:slow'),
+    ('train:fast:~[0-9]', 'train:fast:1:2:3'),
+    ('train:fast:~[12]', 'train:fast:1:2'),
+    ('~t.*', 'train:test'),
+    ('train-f*', 'train-fast'),
+    ('train:fast-?', 'train:fast-1:fast-2:fast-3'),
+])
+def test_glob_selection(cfg_dir, glob_cmd, sec_cmd):
+    assert _run([_cfg_arg(glob_cmd)], cfg_cache=0) == _run([_cfg_arg(sec_cmd)], cfg_cache=0)
+
+
+def test_glob_without_matches(cfg_dir):
+    with pytest.raises(BaseException):
+        _run(['cfg=main:zz*'], cfg_cache=0)
+
+
+def test_regex_dict():
+    regex_dict = paramparse.RegexDict({'a.*': 1, 'b(c)?': 2, 'x': 3})
+    assert (regex_dict['abc'], regex_dict['bc'], regex_dict['x']) == (1, 2, 3)
+    with pytest.raises(KeyError):
+        regex_dict['q']
+    assert list(regex_dict.match_all(['ab', 'b', 'bcd', 'x', 'y'])) == [('ab', 1), ('b', 2), ('x', 3)]
+
+    regex_dict['y'] = 4
+    assert regex_dict['y'] == 4
+
+
+def _gzip(path):
+    with open(path, 'rb') as f_in, gzip.open(str(path) + '.gz', 'wb') as f_out:
+        f_out.write(f_in.read())
+    path.unlink()
+
+
+def test_gz_imports(cfg_dir, monkeypatch):
+    baseline = _baseline()
+
+    _gzip(cfg_dir / 'main.cfg')
+    _gzip(cfg_dir / 'sub' / 'common.cfg')
+    for cfg_cache in (0, 1, 1):
+        _new_process(monkeypatch)
+        assert [_run([_cfg_arg(sec_cmd)], cfg_cache=cfg_cache) for sec_cmd in SEC_CMDS] == baseline
+
+
+def test_zip_imports(cfg_dir, monkeypatch):
+    baseline = _baseline()
+
+    with zipfile.ZipFile(cfg_dir / 'bundle.zip', 'w') as zip_file:
+        zip_file.write(cfg_dir / 'main.cfg', 'main.cfg')
+        zip_file.write(cfg_dir / 'sub' / 'common.cfg', 'sub/common.cfg')
+    (cfg_dir / 'main.cfg').unlink()
+    (cfg_dir / 'sub' / 'common.cfg').unlink()
+
+    for cfg_cache in (0, 1, 1):
+        _new_process(monkeypatch)
+        results = [_run([_cfg_arg(sec_cmd)], cfg_cache=cfg_cache, cfg_root='cfg/bundle.zip') for sec_cmd in SEC_CMDS]
+        assert results == baseline
+
+    _new_process(monkeypatch)
+    assert _run(['cfg=bundle.zip/main:train:fast:2'], cfg_cache=1) == baseline[SEC_CMDS.index('train:fast:2')]
+
+
+def test_zip_invalidation(cfg_dir, monkeypatch):
+    """a cfg in an archive is read again when the archive changes"""
+    for names in (('c', 'd'), ('e', 'f')):
+        with zipfile.ZipFile(cfg_dir / 'bundle.zip', 'w') as zip_file:
+            zip_file.writestr('main.cfg', MAIN_CFG)
+            zip_file.writestr('sub/common.cfg', COMMON_CFG.replace('c,d', ','.join(names)))
+        _touch(cfg_dir / 'bundle.zip')
+        _new_process(monkeypatch)
+        params = _run(['cfg=main:train'], cfg_cache=1, args_cache=1, cfg_root='cfg/bundle.zip')
+        assert params['inner']['names'] == list(names)
+
+
+def test_pack_round_trip(cfg_dir, tmp_path):
+    baseline = _baseline()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pack_path = paramparse.save_cfg_pack(str(cfg_dir / 'main.cfg'), str(tmp_path / 'main.ppk'))
+    assert os.path.isfile(pack_path)
+
+    """packs do not need any of the cfg files they were created from"""
+    (cfg_dir / 'main.cfg').unlink()
+    (cfg_dir / 'sub' / 'common.cfg').unlink()
+
+    for cache_kwargs in (dict(cfg_cache=0), dict(cfg_cache=1), dict(cfg_cache=1, args_cache=1)):
+        results = [_run([_cfg_arg(sec_cmd, pack_path)], **cache_kwargs) for sec_cmd in SEC_CMDS]
+        assert results == baseline
+
+
+def test_pack_cmd(cfg_dir, tmp_path):
+    baseline = _baseline()
+    with contextlib.redirect_stdout(io.StringIO()):
+        paramparse.main(['pack', str(cfg_dir / 'main.cfg'), '-o', str(tmp_path / 'cmd.ppk')])
+    assert _baseline(str(tmp_path / 'cmd.ppk')) == baseline
+    assert _baseline('pack:' + str(tmp_path / 'cmd.ppk')) == baseline
+
+    with pytest.raises(IOError):
+        _run(['cfg=' + str(tmp_path / 'missing.ppk')], cfg_cache=0)
+
+
+def test_pack_extension(cfg_dir, tmp_path):
+    """packs are recognized by their extension so cfg files named pack are still read as cfg files"""
+    (cfg_dir / 'pack.cfg').write_text('## sec\nflag=3\n')
+    assert _run(['cfg=pack:sec'], cfg_cache=0)['flag'] == 3
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pack_path = paramparse.save_cfg_pack(str(cfg_dir / 'pack.cfg'), str(tmp_path / 'sec'))
+    assert pack_path == str(tmp_path / 'sec.ppk')
+    for cache_kwargs in (dict(cfg_cache=0), dict(cfg_cache=1)):
+        assert _run(['cfg={}:sec'.format(pack_path)], **cache_kwargs)['flag'] == 3
+        assert _run(['cfg=pack:sec'], **cache_kwargs)['flag'] == 3